@@ -0,0 +1,100 @@
+"""
+JSON Serialization Benchmark
+Compare the former response path (recursive datetime walk + stdlib json) with the orjson response class
+
+Run from the repository root:
+    PYTHONPATH=. python benchmarks/json_serialization.py [--trades N] [--bars N] [--repeat N]
+"""
+
+import argparse
+import datetime
+import json
+import time
+
+import numpy as np
+import pandas as pd
+
+from tradinghub.backend.shared.utils.json_response import dumps
+
+
+def legacy_serialize_datetime_fields(obj):
+    """The recursive walker API responses went through before the orjson response class"""
+    if 'pandas' in str(type(obj)) or (hasattr(obj, 'isoformat') and str(type(obj)).endswith("Timestamp'>")):
+        return obj.isoformat()
+    if isinstance(obj, list):
+        return [legacy_serialize_datetime_fields(x) for x in obj]
+    if isinstance(obj, dict):
+        return {k: legacy_serialize_datetime_fields(v) for k, v in obj.items()}
+    if isinstance(obj, datetime.datetime):
+        return obj.isoformat()
+    return obj
+
+
+def legacy_render(content) -> bytes:
+    """Walk the payload, then encode it the way Starlette's JSONResponse does"""
+    content = legacy_serialize_datetime_fields(content)
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def build_backtest_payload(trades: int, bars: int) -> dict:
+    """Synthetic /backtest response shaped like BacktestService.run_backtest output"""
+    rng = np.random.default_rng(0)
+    index = pd.date_range('2024-01-02 09:30', periods=bars, freq='5min')
+    close = 100 + rng.standard_normal(bars).cumsum()
+
+    stock_data = [{
+        'date': ts.strftime('%Y-%m-%d %H:%M:%S'),
+        'open': float(price), 'high': float(price + 0.5), 'low': float(price - 0.5), 'close': float(price),
+        'volume': int(volume),
+    } for ts, price, volume in zip(index, close, rng.integers(1_000, 100_000, bars))]
+
+    entries = rng.choice(bars - 20, size=min(trades, bars - 20), replace=False)
+    trade_rows = [{
+        'entry_date': index[i], 'exit_date': index[i + 10],
+        'entry_price': float(close[i]), 'exit_price': float(close[i + 10]),
+        'pnl': float(close[i + 10] - close[i]), 'pnl_pct': float((close[i + 10] - close[i]) / close[i] * 100),
+        'periods_held': 10, 'exit_reason': 'take_profit',
+    } for i in sorted(entries)]
+
+    portfolio_history = [{'date': ts, 'value': float(10_000 + v)} for ts, v in zip(index, close)]
+
+    return {
+        'symbol': 'BENCH',
+        'stock_data': stock_data,
+        'trades': trade_rows,
+        'portfolio_history': portfolio_history,
+        'metrics': {'total_trades': len(trade_rows), 'win_rate': 0.5, 'total_return': 1.2},
+    }
+
+
+def best_of(fn, payload, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(payload)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument('--trades', type=int, default=2_000)
+    parser.add_argument('--bars', type=int, default=20_000)
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    payload = build_backtest_payload(args.trades, args.bars)
+    legacy_body = legacy_render(payload)
+    fast_body = dumps(payload)
+    assert json.loads(legacy_body) == json.loads(fast_body), 'encoders disagree'
+
+    legacy = best_of(legacy_render, payload, args.repeat)
+    fast = best_of(dumps, payload, args.repeat)
+    print(f"payload: {args.bars} bars, {len(payload['trades'])} trades, {len(fast_body) / 1e6:.1f} MB")
+    print(f"legacy walk + json.dumps: {legacy * 1000:8.1f} ms")
+    print(f"orjson dumps:             {fast * 1000:8.1f} ms")
+    print(f"speedup:                  {legacy / fast:8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,12 +1,18 @@
-from fastapi import FastAPI, Request, HTTPException
-from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse
+from fastapi import FastAPI, Request, HTTPException, Query, WebSocket, WebSocketDisconnect
+from fastapi.responses import HTMLResponse, RedirectResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from pathlib import Path
+from typing import Optional
 import os
+from tradinghub.backend.shared.utils.json_response import FastJSONResponse, dumps
 
 # Create FastAPI app
-app = FastAPI(title="TradingHub", description="Advanced Pattern Detection for Smart Trading")
+app = FastAPI(
+    title="TradingHub",
+    description="Advanced Pattern Detection for Smart Trading",
+    default_response_class=FastJSONResponse,
+)
 
 # Get the base directory
 BASE_DIR = Path(__file__).parent
@@ -29,7 +35,12 @@ if isinstance(loader, FileSystemLoader):
     loader.searchpath.insert(0, str(BASE_DIR / "tradinghub/frontend/three_candle/templates"))
 
 # Import services and controllers
+from tradinghub.backend.shared.config import Config
 from tradinghub.backend.shared.services.stock_service import StockService
+from tradinghub.backend.shared.services.backtest_service import BacktestService
+from tradinghub.backend.shared.services.task_executor import get_task_executor
+from tradinghub.backend.shared.utils.blocking_pool import BlockingPool, PoolSaturatedError
+from tradinghub.backend.shared.utils.job_queue import JobQueue, JobLimitError
 from tradinghub.backend.shared.models.dto.pattern_params import PatternParams, AnalysisRequest
 from tradinghub.backend.shared.controllers.backtest_controller import BacktestController
 from tradinghub.backend.shared.controllers.analyze_controller import AnalyzeController
@@ -37,14 +48,41 @@ from tradinghub.backend.shared.pattern_config.pattern_registry import PatternReg
 from tradinghub.backend.shared.models.api_schemas import (
     AnalyzeRequestModel,
     AnalysisResponseModel,
+    MultiAnalyzeRequestModel,
+    MultiAnalysisResponseModel,
+    ScanRequestModel,
     BacktestRequestModel,
     BacktestResponseModel,
+    BacktestSweepRequestModel,
+    BacktestSweepResponseModel,
 )
 
-# Initialize services and controllers
+# Initialize services and controllers (one StockService, so all routes share its caches)
 stock_service = StockService()
-backtest_controller = BacktestController()
-analyze_controller = AnalyzeController()
+backtest_controller = BacktestController(BacktestService(stock_service))
+analyze_controller = AnalyzeController(stock_service)
+
+# Label of the timezone pattern dates are shown in (see Config.DISPLAY_TIMEZONE)
+templates.env.globals['display_timezone_label'] = Config.DISPLAY_TIMEZONE_LABEL
+
+# Blocking handlers (downloads, detection, backtests) run here instead of on the event loop
+blocking_pool = BlockingPool(Config.BLOCKING_POOL_WORKERS, Config.BLOCKING_POOL_MAX_QUEUED)
+
+# Backtests too long for one request run here as background jobs
+job_queue = JobQueue(Config.JOB_WORKERS, Config.JOB_MAX_ACTIVE_PER_CLIENT, Config.JOB_RESULT_TTL)
+
+def get_client_id(request: Request) -> str:
+    """Identity per-client job limits are counted against (X-Client-Id header, else the client address)"""
+    return request.headers.get("x-client-id") or (request.client.host if request.client else "unknown")
+
+# Clients opt into columnar (parallel array) responses with this Accept type or ?format=columnar
+COLUMNAR_MEDIA_TYPE = "application/vnd.tradinghub.columnar+json"
+
+def get_response_format(request: Request, format_param: Optional[str]) -> str:
+    """Negotiate the response format of /analyze and /backtest"""
+    if format_param == "columnar" or COLUMNAR_MEDIA_TYPE in request.headers.get("accept", ""):
+        return "columnar"
+    return "rows"
 
 # Auto-register patterns early so routes reflect all configs
 try:
@@ -57,6 +95,11 @@ async def root():
     """Redirect to landing page"""
     return RedirectResponse(url="/landing", status_code=302)
 
+@app.get("/health")
+async def health():
+    """Liveness check; answered on the event loop even while handlers are busy"""
+    return {"status": "ok"}
+
 @app.get("/landing", response_class=HTMLResponse)
 async def landing(request: Request):
     """Landing page route"""
@@ -102,50 +145,183 @@ def register_pattern_routes():
 register_pattern_routes()
 
 @app.post("/analyze", response_model=AnalysisResponseModel)
-async def analyze(request_data: AnalyzeRequestModel):
+async def analyze(request_data: AnalyzeRequestModel, request: Request, format: Optional[str] = Query(default=None)):
     """Analyze patterns endpoint"""
     try:
-        result = analyze_controller.analyze(request_data.model_dump())
+        data = request_data.model_dump()
+        data['response_format'] = get_response_format(request, format)
+        result = await blocking_pool.run(analyze_controller.analyze, data)
         if isinstance(result, tuple) and len(result) == 2:
             body, status = result
-            return JSONResponse(content=body, status_code=status)
+            return FastJSONResponse(content=body, status_code=status)
         if isinstance(result, dict):
-            return JSONResponse(content=result, status_code=200)
-        return JSONResponse(content={"error": "Unexpected analyze response type"}, status_code=500)
+            return FastJSONResponse(content=result, status_code=200)
+        return FastJSONResponse(content={"error": "Unexpected analyze response type"}, status_code=500)
+    except PoolSaturatedError as e:
+        return FastJSONResponse(content={"error": str(e)}, status_code=503, headers={"Retry-After": "1"})
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/analyze/stream")
+async def analyze_stream(request_data: AnalyzeRequestModel, request: Request, format: Optional[str] = Query(default=None)):
+    """Analyze patterns, streaming one NDJSON line of hits per partition of the data as it is detected"""
+    try:
+        data = request_data.model_dump()
+        data['response_format'] = get_response_format(request, format)
+        body, status = analyze_controller.analyze_stream(data, run_blocking=blocking_pool.run)
+        if status != 200:
+            return FastJSONResponse(content=body, status_code=status)
+
+        async def ndjson_lines():
+            async for item in body:
+                yield dumps(item) + b"\n"
+
+        return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/analyze/multi", response_model=MultiAnalysisResponseModel)
+async def analyze_multi(request_data: MultiAnalyzeRequestModel):
+    """Analyze several patterns over one data download and feature pass"""
+    try:
+        result = await blocking_pool.run(analyze_controller.analyze_multi, request_data.model_dump())
+        if isinstance(result, tuple) and len(result) == 2:
+            body, status = result
+            return FastJSONResponse(content=body, status_code=status)
+        if isinstance(result, dict):
+            return FastJSONResponse(content=result, status_code=200)
+        return FastJSONResponse(content={"error": "Unexpected analyze response type"}, status_code=500)
+    except PoolSaturatedError as e:
+        return FastJSONResponse(content={"error": str(e)}, status_code=503, headers={"Retry-After": "1"})
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/scan")
+async def scan(request_data: ScanRequestModel):
+    """Scan a watchlist for a pattern, streaming one NDJSON line per symbol as it completes"""
+    try:
+        body, status = analyze_controller.scan(request_data.model_dump(), run_blocking=blocking_pool.run)
+        if status != 200:
+            return FastJSONResponse(content=body, status_code=status)
+
+        async def ndjson_lines():
+            async for item in body:
+                yield dumps(item) + b"\n"
+
+        return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.websocket("/ws/live")
+async def live_detection(websocket: WebSocket):
+    """Live pattern detection: the first message subscribes to a symbol, interval and
+    pattern list; every pattern completed by a new bar of the feed is pushed back"""
+    await websocket.accept()
+    try:
+        try:
+            subscription = await websocket.receive_json()
+        except ValueError:
+            subscription = None
+        if isinstance(subscription, dict):
+            body, status = analyze_controller.live(subscription, run_blocking=blocking_pool.run)
+        else:
+            body, status = {"error": "Subscription must be a JSON object"}, 400
+        if status != 200:
+            await websocket.send_text(dumps({"type": "error", **body}).decode())
+            await websocket.close(code=1008)
+            return
+        try:
+            async for message in body:
+                await websocket.send_text(dumps(message).decode())
+        finally:
+            await body.aclose()
+        await websocket.close()
+    except WebSocketDisconnect:
+        pass
+
 @app.post("/backtest", response_model=BacktestResponseModel)
-async def backtest(request_data: BacktestRequestModel):
+async def backtest(request_data: BacktestRequestModel, request: Request, format: Optional[str] = Query(default=None)):
     """Run backtest for pattern strategy (supports both long and short positions)"""
     try:
-        result = backtest_controller.run_backtest(request_data.model_dump())
+        data = request_data.model_dump()
+        data['response_format'] = get_response_format(request, format)
+        result = await blocking_pool.run(backtest_controller.run_backtest, data)
+        if isinstance(result, tuple) and len(result) == 2:
+            body, status = result
+            return FastJSONResponse(content=body, status_code=status)
+        if isinstance(result, dict):
+            return FastJSONResponse(content=result, status_code=200)
+        return FastJSONResponse(content={"error": "Unexpected backtest response type"}, status_code=500)
+    except PoolSaturatedError as e:
+        return FastJSONResponse(content={"error": str(e)}, status_code=503, headers={"Retry-After": "1"})
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/backtest/sweep", response_model=BacktestSweepResponseModel)
+async def backtest_sweep(request_data: BacktestSweepRequestModel):
+    """Backtest a grid of pattern and exit parameters over one data download"""
+    try:
+        result = await blocking_pool.run(backtest_controller.run_sweep, request_data.model_dump())
         if isinstance(result, tuple) and len(result) == 2:
             body, status = result
-            return JSONResponse(content=body, status_code=status)
+            return FastJSONResponse(content=body, status_code=status)
         if isinstance(result, dict):
-            return JSONResponse(content=result, status_code=200)
-        return JSONResponse(content={"error": "Unexpected backtest response type"}, status_code=500)
+            return FastJSONResponse(content=result, status_code=200)
+        return FastJSONResponse(content={"error": "Unexpected backtest response type"}, status_code=500)
+    except PoolSaturatedError as e:
+        return FastJSONResponse(content={"error": str(e)}, status_code=503, headers={"Retry-After": "1"})
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/backtest-short", response_model=BacktestResponseModel)
-async def backtest_short(request_data: BacktestRequestModel):
+async def backtest_short(request_data: BacktestRequestModel, request: Request, format: Optional[str] = Query(default=None)):
     """Run SHORT position backtest for pattern strategy (legacy endpoint)"""
     try:
         # Add position_type to the data for short backtests
         data = request_data.model_dump()
         data['position_type'] = 'short'
-        result = backtest_controller.run_backtest(data)
+        data['response_format'] = get_response_format(request, format)
+        result = await blocking_pool.run(backtest_controller.run_backtest, data)
         if isinstance(result, tuple) and len(result) == 2:
             body, status = result
-            return JSONResponse(content=body, status_code=status)
+            return FastJSONResponse(content=body, status_code=status)
         if isinstance(result, dict):
-            return JSONResponse(content=result, status_code=200)
-        return JSONResponse(content={"error": "Unexpected backtest response type"}, status_code=500)
+            return FastJSONResponse(content=result, status_code=200)
+        return FastJSONResponse(content={"error": "Unexpected backtest response type"}, status_code=500)
+    except PoolSaturatedError as e:
+        return FastJSONResponse(content={"error": str(e)}, status_code=503, headers={"Retry-After": "1"})
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/jobs/backtest", status_code=202)
+async def submit_backtest_job(request_data: BacktestRequestModel, request: Request, format: Optional[str] = Query(default=None)):
+    """Queue a backtest as a background job; poll GET /jobs/{job_id} for progress and the result"""
+    try:
+        data = request_data.model_dump()
+        data['response_format'] = get_response_format(request, format)
+        job = job_queue.submit('backtest', get_client_id(request), backtest_controller.run_backtest_job, data)
+        return FastJSONResponse(content={**job.to_dict(), "status_url": f"/jobs/{job.job_id}"}, status_code=202)
+    except JobLimitError as e:
+        return FastJSONResponse(content={"error": str(e)}, status_code=429)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Get the status and progress of a job, and its result once it succeeded"""
+    job = job_queue.get(job_id)
+    if job is None:
+        return FastJSONResponse(content={"error": "Job not found or expired"}, status_code=404)
+    return FastJSONResponse(content=job.to_dict(), status_code=200)
+
+@app.delete("/jobs/{job_id}")
+async def cancel_job(job_id: str):
+    """Cancel a queued or running job"""
+    job = job_queue.cancel(job_id)
+    if job is None:
+        return FastJSONResponse(content={"error": "Job not found or expired"}, status_code=404)
+    return FastJSONResponse(content=job.to_dict(), status_code=200)
+
 @app.get("/patterns")
 async def get_patterns():
     """Get list of available patterns"""
@@ -186,6 +362,39 @@ async def debug_clear_cache():
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/debug/cache-stats")
+async def debug_cache_stats():
+    """Debug endpoint with cache size and hit/miss/eviction counters"""
+    try:
+        return {
+            'status': 'success',
+            'cache': stock_service.cache_stats()
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/debug/executor-stats")
+async def debug_executor_stats():
+    """Debug endpoint with concurrency and queue-depth counters of the blocking pool and job queue"""
+    try:
+        return {
+            'status': 'success',
+            'blocking_pool': blocking_pool.stats(),
+            'job_queue': job_queue.stats()
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.on_event("shutdown")
+async def shutdown_executors():
+    job_queue.shutdown()
+    blocking_pool.shutdown()
+    # Stop the worker processes of TASK_EXECUTOR=process (the inline executor has none)
+    shutdown_task_executor = getattr(get_task_executor(), 'shutdown', None)
+    if shutdown_task_executor is not None:
+        shutdown_task_executor()
+    await stock_service.close()
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=5001, reload=True)
@@ -0,0 +1,100 @@
+"""
+Test Fakes
+In-memory stand-ins for the Yahoo fetchers that count how often they are called
+"""
+
+import asyncio
+import threading
+import time
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+EXCHANGE_TIMEZONE = 'America/New_York'
+
+
+def make_history(symbol: str, start: str, end: str, interval: str = '1d') -> pd.DataFrame:
+    """
+    Deterministic bars between two dates, shaped like ``yf.Ticker.history``
+
+    Each bar's prices depend only on the symbol and its timestamp, so bars of
+    overlapping or adjacent ranges agree wherever they meet.
+
+    Args:
+        symbol (str): Stock symbol (shifts the prices)
+        start (str): First day, YYYY-MM-DD (inclusive)
+        end (str): Last day, YYYY-MM-DD (exclusive)
+        interval (str): Only the bar spacing matters: '1d' or a pandas-style minute interval like '5m'
+
+    Returns:
+        pd.DataFrame: OHLCV bars indexed in the exchange timezone
+    """
+    freq = '1D' if interval.endswith('d') else interval.replace('m', 'min')
+    index = pd.date_range(pd.Timestamp(start, tz=EXCHANGE_TIMEZONE), pd.Timestamp(end, tz=EXCHANGE_TIMEZONE),
+                          freq=freq, inclusive='left')
+    minutes = index.as_unit('s').asi8 / 60.0 + sum(map(ord, symbol))
+
+    def noise(seed: float) -> np.ndarray:
+        # Hash-like values in [-1, 1) from the timestamp
+        return (np.sin(minutes * seed) * 43758.5453) % 2.0 - 1.0
+
+    close = 100 + 10 * np.sin(minutes / 7919.0) + 2 * noise(12.9898)
+    open_price = close + 1.5 * noise(78.233)
+    return pd.DataFrame({
+        'Open': open_price,
+        'High': np.maximum(open_price, close) + 0.5 * (1 + noise(37.719)),
+        'Low': np.minimum(open_price, close) - 0.5 * (1 + noise(93.989)),
+        'Close': close,
+        'Volume': np.round(5_000 + 4_000 * noise(4.1414)),
+        'Dividends': 0.0,
+        'Stock Splits': 0.0,
+    }, index=index)
+
+
+class CountingFetcher:
+    """
+    DataFetcher that builds bars in memory and records every call
+
+    Args:
+        delay (float): Seconds each fetch sleeps, to keep concurrent callers overlapping
+        error (Exception): Raised by every fetch instead of returning bars
+    """
+
+    def __init__(self, delay: float = 0.0, error: Optional[Exception] = None):
+        self.delay = delay
+        self.error = error
+        self.requests: List[Tuple[str, str, str, str]] = []
+        self._lock = threading.Lock()
+
+    @property
+    def calls(self) -> int:
+        return len(self.requests)
+
+    def fetch(self, symbol: str, start: str, end: str, interval: str) -> pd.DataFrame:
+        with self._lock:
+            self.requests.append((symbol, start, end, interval))
+        time.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return make_history(symbol, start, end, interval)
+
+
+class AsyncCountingFetcher:
+    """AsyncDataFetcher counterpart of CountingFetcher"""
+
+    def __init__(self, delay: float = 0.0, error: Optional[Exception] = None):
+        self.delay = delay
+        self.error = error
+        self.requests: List[Tuple[str, str, str, str]] = []
+
+    @property
+    def calls(self) -> int:
+        return len(self.requests)
+
+    async def fetch(self, symbol: str, start: str, end: str, interval: str) -> pd.DataFrame:
+        self.requests.append((symbol, start, end, interval))
+        await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return make_history(symbol, start, end, interval)
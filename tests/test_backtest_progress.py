@@ -0,0 +1,89 @@
+"""
+Backtest Progress
+Long simulations report progress as they go, and a cancelled job stops inside the simulation
+"""
+
+import pytest
+
+from tradinghub.backend.shared.backtest.base_backtest import BaseBacktest
+from tradinghub.backend.shared.controllers.backtest_controller import BacktestController
+from tradinghub.backend.shared.models.dto.backtest_params import BacktestParams
+from tradinghub.backend.shared.pattern_config.pattern_registry import PatternRegistry
+from tradinghub.backend.shared.services.backtest_service import BacktestService
+from tradinghub.backend.shared.services.stock_service import StockService
+from tradinghub.backend.shared.utils.job_queue import CANCELLED, SUCCEEDED, JobQueue
+from tradinghub.backend.two_candle.patterns.engulfing_pattern import EngulfingPattern
+from fakes import AsyncCountingFetcher, CountingFetcher
+from test_simulation_parity import make_bars
+
+
+@pytest.fixture
+def bars():
+    return make_bars(n=2000, signal_rate=0.3)
+
+
+@pytest.mark.parametrize('simulation_mode', ['vectorized', 'bar'])
+def test_simulation_reports_increasing_progress(bars, simulation_mode, monkeypatch):
+    monkeypatch.setattr(BaseBacktest, 'PROGRESS_EVERY_ENTRIES', 10)
+    monkeypatch.setattr(BaseBacktest, 'PROGRESS_EVERY_BARS', 100)
+    fractions = []
+
+    BaseBacktest(EngulfingPattern()).simulate(
+        bars, {}, BacktestParams(max_holding_periods=3, simulation_mode=simulation_mode), fractions.append)
+
+    assert len(fractions) > 5
+    assert fractions == sorted(fractions)
+    assert 0 < fractions[0] and fractions[-1] < 1
+
+
+@pytest.mark.parametrize('simulation_mode', ['vectorized', 'bar'])
+def test_cancelled_job_stops_inside_the_simulation(bars, simulation_mode, monkeypatch):
+    monkeypatch.setattr(BaseBacktest, 'PROGRESS_EVERY_ENTRIES', 10)
+    monkeypatch.setattr(BaseBacktest, 'PROGRESS_EVERY_BARS', 100)
+    queue = JobQueue(max_workers=1, max_active_per_client=1, ttl=60)
+    reports = []
+
+    def backtest_job(job):
+        def progress(fraction):
+            reports.append(fraction)
+            queue.cancel(job.job_id)  # DELETE /jobs/{id} arrives mid-simulation
+            job.report(fraction, 'Simulating trades')
+
+        executor = BaseBacktest(EngulfingPattern()).simulate(
+            bars, {}, BacktestParams(max_holding_periods=3, simulation_mode=simulation_mode), progress)
+        return {'trades': len(executor.get_trades())}, 200
+
+    job = queue.submit('backtest', 'client', backtest_job)
+    job.future.result(timeout=30)
+    queue.shutdown()
+
+    assert job.status == CANCELLED
+    assert len(reports) == 1
+
+
+def test_backtest_job_progress_covers_the_simulation(monkeypatch):
+    monkeypatch.setattr(BaseBacktest, 'PROGRESS_EVERY_ENTRIES', 5)
+    PatternRegistry.auto_register_patterns()
+    stock_service = StockService(fetcher=CountingFetcher(), async_fetcher=AsyncCountingFetcher())
+    controller = BacktestController(BacktestService(stock_service))
+    queue = JobQueue(max_workers=1, max_active_per_client=1, ttl=60)
+    reports = []
+
+    def backtest_job(job, data):
+        def progress(fraction, stage):
+            reports.append((fraction, stage))
+            job.report(fraction, stage)
+        return controller.run_backtest(data, progress=progress)
+
+    job = queue.submit('backtest', 'client', backtest_job, {
+        'symbol': 'AAPL', 'days': 20, 'interval': '15m', 'pattern_type': 'engulfing', 'require_trend': False,
+        'pattern_source': 'server', 'max_holding_periods': 2,
+    })
+    job.future.result(timeout=30)
+    queue.shutdown()
+
+    assert job.status == SUCCEEDED, job.error
+    simulating = [fraction for fraction, stage in reports if stage == 'Simulating trades']
+    assert len(simulating) > 2
+    assert simulating == sorted(simulating)
+    assert 0.4 <= simulating[0] and simulating[-1] <= 0.9
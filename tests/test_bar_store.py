@@ -0,0 +1,76 @@
+"""
+Bar Store
+Coverage bookkeeping and adjustment-basis handling of the on-disk bar store
+"""
+
+import time
+
+import pandas as pd
+import pytest
+
+from tradinghub.backend.shared.services.bar_store import BarStore, StoredFetcher
+from fakes import EXCHANGE_TIMEZONE, CountingFetcher, make_history
+
+
+@pytest.fixture
+def store(tmp_path) -> BarStore:
+    return BarStore(str(tmp_path))
+
+
+def test_covered_range_is_served_from_store(store):
+    fetcher = CountingFetcher()
+    stored_fetcher = StoredFetcher(store, fetcher)
+
+    first = stored_fetcher.fetch('AAPL', '2024-01-01', '2024-02-01', '1d')
+    second = stored_fetcher.fetch('AAPL', '2024-01-10', '2024-01-20', '1d')
+
+    assert fetcher.calls == 1
+    pd.testing.assert_frame_equal(second, first.loc['2024-01-10':'2024-01-19'], check_freq=False)
+
+
+def test_dividend_in_new_bars_drops_stored_bars(store):
+    head = make_history('AAPL', '2024-01-01', '2024-02-01')
+    store.write('AAPL', '2024-01-01', '2024-02-01', '1d', head)
+
+    # Downloaded after an ex-dividend day: every earlier price is re-adjusted
+    tail = make_history('AAPL', '2024-02-01', '2024-03-01') * 0.99
+    tail.loc['2024-02-15', 'Dividends'] = 0.25
+    store.write('AAPL', '2024-02-01', '2024-03-01', '1d', tail)
+
+    assert store.read('AAPL', '2024-01-01', '2024-02-01', '1d') is None
+    stored_tail = store.read('AAPL', '2024-02-01', '2024-03-01', '1d')
+    pd.testing.assert_frame_equal(stored_tail, tail, check_freq=False)
+
+
+def test_split_before_stored_bars_keeps_them(store):
+    tail = make_history('AAPL', '2024-02-01', '2024-03-01')
+    store.write('AAPL', '2024-02-01', '2024-03-01', '1d', tail)
+
+    # Older history with an old split does not change the basis of later bars
+    head = make_history('AAPL', '2024-01-01', '2024-02-01')
+    head.loc['2024-01-15', 'Stock Splits'] = 2.0
+    store.write('AAPL', '2024-01-01', '2024-02-01', '1d', head)
+
+    stored = store.read('AAPL', '2024-01-01', '2024-03-01', '1d')
+    pd.testing.assert_frame_equal(stored, pd.concat([head, tail]), check_freq=False)
+
+
+def test_today_is_taken_in_the_exchange_timezone(store, monkeypatch):
+    # Run as a host whose local date differs from the exchange's right now (UTC+14 or UTC-12)
+    exchange_date = pd.Timestamp.now(tz=EXCHANGE_TIMEZONE).date()
+    host_timezone = next(zone for zone in ('Pacific/Kiritimati', 'Etc/GMT+12')
+                         if pd.Timestamp.now(tz=zone).date() != exchange_date)
+    monkeypatch.setenv('TZ', host_timezone)
+    time.tzset()
+    try:
+        exchange_today = pd.Timestamp.now(tz=EXCHANGE_TIMEZONE).normalize().tz_localize(None)
+        start = (exchange_today - pd.Timedelta(days=10)).strftime('%Y-%m-%d')
+        end = (exchange_today + pd.Timedelta(days=2)).strftime('%Y-%m-%d')
+        store.write('AAPL', start, end, '1d', make_history('AAPL', start, end))
+    finally:
+        monkeypatch.undo()
+        time.tzset()
+
+    assert store.read('AAPL', start, exchange_today.strftime('%Y-%m-%d'), '1d') is not None
+    next_day = (exchange_today + pd.Timedelta(days=1)).strftime('%Y-%m-%d')
+    assert store.read('AAPL', start, next_day, '1d') is None
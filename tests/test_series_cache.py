@@ -0,0 +1,84 @@
+"""
+Bar Series Cache
+Extending a cached series downloads only the missing range, unless prices were re-adjusted since
+"""
+
+import asyncio
+
+import pandas as pd
+import pytest
+
+from tradinghub.backend.shared.services.stock_service import StockService
+from fakes import AsyncCountingFetcher, CountingFetcher, make_history
+
+EX_DIVIDEND_DAY = '2024-03-05'
+
+
+class DividendFetcher(CountingFetcher):
+    """Bars with a dividend on EX_DIVIDEND_DAY; prices before it are adjusted down once it is in the range"""
+
+    def fetch(self, symbol: str, start: str, end: str, interval: str) -> pd.DataFrame:
+        df = super().fetch(symbol, start, end, interval)
+        return with_dividend(df, end)
+
+
+class AsyncDividendFetcher(AsyncCountingFetcher):
+    async def fetch(self, symbol: str, start: str, end: str, interval: str) -> pd.DataFrame:
+        df = await super().fetch(symbol, start, end, interval)
+        return with_dividend(df, end)
+
+
+def with_dividend(df: pd.DataFrame, end: str) -> pd.DataFrame:
+    if end <= EX_DIVIDEND_DAY:
+        return df
+    df = df.copy()
+    before = df.index < pd.Timestamp(EX_DIVIDEND_DAY, tz=df.index.tz)
+    df.loc[before, ['Open', 'High', 'Low', 'Close']] *= 0.99
+    df.loc[df.index.normalize() == pd.Timestamp(EX_DIVIDEND_DAY, tz=df.index.tz), 'Dividends'] = 1.0
+    return df
+
+
+def service_with_window(fetcher, async_fetcher, window):
+    service = StockService(fetcher=fetcher, async_fetcher=async_fetcher)
+    service._get_date_range = lambda days: window['range']
+    return service
+
+
+def expected_window(start: str, end: str) -> pd.DataFrame:
+    return with_dividend(make_history('AAPL', start, end), end)
+
+
+@pytest.mark.parametrize('use_async', [False, True])
+def test_tail_without_events_extends_cache(use_async):
+    fetcher, async_fetcher = CountingFetcher(), AsyncCountingFetcher()
+    window = {'range': ('2024-01-01', '2024-02-01')}
+    service = service_with_window(fetcher, async_fetcher, window)
+    download = (lambda: asyncio.run(service.download_stock_data_async('AAPL', 0, '1d'))) if use_async \
+        else (lambda: service.download_stock_data('AAPL', 0, '1d'))
+
+    download()
+    window['range'] = ('2024-01-05', '2024-02-10')
+    bars = download()
+
+    requests = (async_fetcher if use_async else fetcher).requests
+    assert [(start, end) for _, start, end, _ in requests] == [('2024-01-01', '2024-02-01'), ('2024-02-01', '2024-02-10')]
+    pd.testing.assert_frame_equal(bars, make_history('AAPL', '2024-01-05', '2024-02-10'), check_freq=False)
+
+
+@pytest.mark.parametrize('use_async', [False, True])
+def test_readjusted_tail_downloads_whole_window(use_async):
+    fetcher, async_fetcher = DividendFetcher(), AsyncDividendFetcher()
+    window = {'range': ('2024-02-01', '2024-03-01')}
+    service = service_with_window(fetcher, async_fetcher, window)
+    download = (lambda: asyncio.run(service.download_stock_data_async('AAPL', 0, '1d'))) if use_async \
+        else (lambda: service.download_stock_data('AAPL', 0, '1d'))
+
+    download()
+    window['range'] = ('2024-02-05', '2024-03-10')
+    bars = download()
+
+    requests = (async_fetcher if use_async else fetcher).requests
+    assert [(start, end) for _, start, end, _ in requests] == [
+        ('2024-02-01', '2024-03-01'), ('2024-03-01', '2024-03-10'), ('2024-02-05', '2024-03-10')]
+    # One price basis across the former seam
+    pd.testing.assert_frame_equal(bars, expected_window('2024-02-05', '2024-03-10'), check_freq=False)
@@ -0,0 +1,63 @@
+"""
+Shared Bar Downloads
+/analyze and /backtest on the same dataset must download its bars once through the shared StockService
+"""
+
+import pytest
+
+from tradinghub.backend.shared.controllers.analyze_controller import AnalyzeController
+from tradinghub.backend.shared.controllers.backtest_controller import BacktestController
+from tradinghub.backend.shared.pattern_config.pattern_registry import PatternRegistry
+from tradinghub.backend.shared.services.backtest_service import BacktestService
+from tradinghub.backend.shared.services.stock_service import StockService
+from fakes import AsyncCountingFetcher, CountingFetcher
+
+DATASET = {'symbol': 'AAPL', 'days': 20, 'interval': '15m'}
+PATTERN = {'pattern_type': 'engulfing', 'require_trend': False}
+
+
+@pytest.fixture(scope='module', autouse=True)
+def registered_patterns():
+    PatternRegistry.auto_register_patterns()
+
+
+@pytest.fixture
+def wiring():
+    """Controllers wired like main_fastapi: one StockService shared by analyze and backtest"""
+    fetcher = CountingFetcher()
+    stock_service = StockService(fetcher=fetcher, async_fetcher=AsyncCountingFetcher())
+    analyze_controller = AnalyzeController(stock_service)
+    backtest_controller = BacktestController(BacktestService(stock_service))
+    return fetcher, stock_service, analyze_controller, backtest_controller
+
+
+def analyze_then_backtest(analyze_controller, backtest_controller, **backtest_fields):
+    analysis, status = analyze_controller.analyze({**DATASET, **PATTERN})
+    assert status == 200, analysis
+    assert analysis['count'] > 0
+
+    results, status = backtest_controller.run_backtest(
+        {**DATASET, **PATTERN, 'patterns': analysis['patterns'], **backtest_fields})
+    assert status == 200, results
+    assert results['stock_data']
+    return analysis, results
+
+
+@pytest.mark.parametrize('pattern_source', ['client', 'server'])
+def test_analyze_then_backtest_downloads_once(wiring, pattern_source):
+    fetcher, _, analyze_controller, backtest_controller = wiring
+
+    analyze_then_backtest(analyze_controller, backtest_controller, pattern_source=pattern_source)
+
+    assert fetcher.calls == 1
+
+
+def test_clear_cache_downloads_again_once(wiring):
+    fetcher, stock_service, analyze_controller, backtest_controller = wiring
+    analyze_then_backtest(analyze_controller, backtest_controller)
+    assert fetcher.calls == 1
+
+    stock_service.clear_cache()
+    analyze_then_backtest(analyze_controller, backtest_controller)
+
+    assert fetcher.calls == 2
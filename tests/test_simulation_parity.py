@@ -0,0 +1,100 @@
+"""
+Trade Simulation Parity
+BaseBacktest.simulate must give the same trades and portfolio history in 'vectorized' and 'bar' mode
+"""
+
+import itertools
+from dataclasses import replace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tradinghub.backend.shared.backtest.base_backtest import BaseBacktest
+from tradinghub.backend.shared.models.dto.backtest_params import BacktestParams
+from tradinghub.backend.two_candle.patterns.engulfing_pattern import EngulfingPattern
+
+PATTERN_COLUMN = EngulfingPattern().get_pattern_column_name()
+
+POSITION_TYPES = ['long', 'short']
+ENTRY_DELAYS = [0, 1, 2, 3]
+MAX_HOLDING_PERIODS = [-1, 0, 1, 5, 40]
+STOP_TAKE = [(0.0, 0.0), (0.0, 0.03), (0.02, 0.0), (0.01, 0.02)]
+
+
+def make_bars(n: int = 300, seed: int = 11, signal_rate: float = 0.15) -> pd.DataFrame:
+    """
+    Random-walk bars with precomputed pattern signals
+
+    Some lows are NaN, some bars have zero range, and signals cluster so that
+    many of them arrive while a position is already open.
+    """
+    rng = np.random.default_rng(seed)
+    close = 100 + rng.standard_normal(n).cumsum()
+    open_price = close + rng.standard_normal(n) * 0.5
+    high = np.maximum(open_price, close) + rng.exponential(0.8, n)
+    low = np.minimum(open_price, close) - rng.exponential(0.8, n)
+
+    flat = rng.random(n) < 0.05
+    high[flat] = low[flat] = open_price[flat] = close[flat]
+    low[rng.random(n) < 0.05] = np.nan
+
+    signals = rng.random(n) < signal_rate
+    signals[-4:] = True  # Entries near the end leave positions open at the last bar
+
+    index = pd.date_range('2024-03-01 09:30', periods=n, freq='15min', tz='America/New_York')
+    return pd.DataFrame({
+        'Open': open_price, 'High': high, 'Low': low, 'Close': close,
+        'Volume': rng.integers(1_000, 10_000, n).astype(float),
+        PATTERN_COLUMN: signals,
+    }, index=index)
+
+
+def run(df: pd.DataFrame, position_type: str, params: BacktestParams):
+    backtest = BaseBacktest(EngulfingPattern(), position_type=position_type)
+    return backtest.simulate(df.copy(), {}, params)
+
+
+@pytest.fixture(scope='module')
+def bars() -> pd.DataFrame:
+    return make_bars()
+
+
+@pytest.mark.parametrize('position_type', POSITION_TYPES)
+@pytest.mark.parametrize('entry_delay', ENTRY_DELAYS)
+def test_vectorized_matches_bar_loop(bars, position_type, entry_delay):
+    trade_count = 0
+    for max_holding_periods, (stop_loss_pct, take_profit_pct) in itertools.product(MAX_HOLDING_PERIODS, STOP_TAKE):
+        params = BacktestParams(
+            stop_loss_pct=stop_loss_pct,
+            take_profit_pct=take_profit_pct,
+            entry_delay=entry_delay,
+            max_holding_periods=max_holding_periods,
+        )
+        label = f'{position_type} {params}'
+
+        expected = run(bars, position_type, replace(params, simulation_mode='bar'))
+        actual = run(bars, position_type, replace(params, simulation_mode='vectorized'))
+
+        assert actual.get_trades() == expected.get_trades(), label
+        assert actual.get_portfolio_history() == expected.get_portfolio_history(), label
+        assert actual.get_total_commission() == expected.get_total_commission(), label
+        assert actual.get_total_slippage() == expected.get_total_slippage(), label
+        # Bar counts must stay plain ints so the trades serialize like the bar loop's
+        assert all(type(trade.periods_held) is int for trade in actual.get_trades()), label
+        trade_count += len(expected.get_trades())
+
+    assert trade_count > 0
+
+
+@pytest.mark.parametrize('simulation_mode', ['bar', 'vectorized'])
+def test_modes_agree_without_signals(bars, simulation_mode):
+    quiet = bars.assign(**{PATTERN_COLUMN: False})
+    executor = run(quiet, 'long', BacktestParams(simulation_mode=simulation_mode))
+    assert executor.get_trades() == []
+    assert executor.get_portfolio_history() == [{'date': quiet.index[0], 'value': 10000.0}]
+
+
+def test_unknown_simulation_mode(bars):
+    with pytest.raises(ValueError):
+        run(bars, 'long', BacktestParams(simulation_mode='tick'))
@@ -0,0 +1,138 @@
+"""
+Download Coalescing
+Concurrent identical downloads must reach the fetcher once and share its result or error
+"""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+
+from tradinghub.backend.shared.services.stock_service import StockService
+from tradinghub.backend.shared.utils.single_flight import AsyncSingleFlight, SingleFlight
+from fakes import AsyncCountingFetcher, CountingFetcher
+
+CALLERS = 16
+
+
+def make_service(fetcher=None, async_fetcher=None) -> StockService:
+    return StockService(fetcher=fetcher or CountingFetcher(), async_fetcher=async_fetcher or AsyncCountingFetcher())
+
+
+def stampede(fn, callers: int = CALLERS):
+    """Call fn from many threads released at the same moment; return each call's result or exception"""
+    barrier = threading.Barrier(callers)
+
+    def call():
+        barrier.wait()
+        try:
+            return fn()
+        except Exception as e:
+            return e
+
+    with ThreadPoolExecutor(max_workers=callers) as pool:
+        return [future.result() for future in [pool.submit(call) for _ in range(callers)]]
+
+
+def test_concurrent_downloads_fetch_once():
+    fetcher = CountingFetcher(delay=0.3)
+    service = make_service(fetcher=fetcher)
+
+    frames = stampede(lambda: service.download_stock_data('AAPL', 30, '1d'))
+
+    assert fetcher.calls == 1
+    assert service.cache_stats()['in_flight_downloads'] == 0
+    assert all(isinstance(frame, pd.DataFrame) for frame in frames)
+    assert not frames[0].empty
+    for frame in frames[1:]:
+        pd.testing.assert_frame_equal(frame, frames[0])
+
+
+def test_fetch_error_reaches_every_waiter():
+    error = ConnectionError('Yahoo is down')
+    fetcher = CountingFetcher(delay=0.3, error=error)
+    service = make_service(fetcher=fetcher)
+
+    outcomes = stampede(lambda: service.download_stock_data('AAPL', 30, '1d'))
+
+    assert fetcher.calls == 1
+    assert all(outcome is error for outcome in outcomes)
+    # The failed call is not remembered: the next download tries again
+    with pytest.raises(ConnectionError):
+        service.download_stock_data('AAPL', 30, '1d')
+    assert fetcher.calls == 2
+
+
+def test_different_keys_are_not_coalesced():
+    flight = SingleFlight()
+    barrier = threading.Barrier(2)
+    results = []
+
+    def work(key):
+        barrier.wait()
+        return key
+
+    threads = [threading.Thread(target=lambda key=key: results.append(flight.do(key, work, key))) for key in 'ab']
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(results) == ['a', 'b']
+    assert flight.in_flight() == 0
+
+
+def test_concurrent_async_downloads_fetch_once():
+    async_fetcher = AsyncCountingFetcher(delay=0.3)
+    service = make_service(async_fetcher=async_fetcher)
+
+    async def run():
+        return await asyncio.gather(*[service.download_stock_data_async('AAPL', 30, '1d') for _ in range(CALLERS)])
+
+    frames = asyncio.run(run())
+
+    assert async_fetcher.calls == 1
+    assert not frames[0].empty
+    for frame in frames[1:]:
+        pd.testing.assert_frame_equal(frame, frames[0])
+
+
+def test_async_fetch_error_reaches_every_waiter():
+    error = ConnectionError('Yahoo is down')
+    async_fetcher = AsyncCountingFetcher(delay=0.3, error=error)
+    service = make_service(async_fetcher=async_fetcher)
+
+    async def run():
+        return await asyncio.gather(
+            *[service.download_stock_data_async('AAPL', 30, '1d') for _ in range(CALLERS)], return_exceptions=True)
+
+    outcomes = asyncio.run(run())
+
+    assert async_fetcher.calls == 1
+    assert all(outcome is error for outcome in outcomes)
+
+
+def test_cancelled_async_waiter_does_not_cancel_shared_call():
+    flight = AsyncSingleFlight()
+    calls = []
+
+    async def slow():
+        calls.append(1)
+        await asyncio.sleep(0.2)
+        return 'bars'
+
+    async def run():
+        first = asyncio.ensure_future(flight.do('key', slow))
+        second = asyncio.ensure_future(flight.do('key', slow))
+        await asyncio.sleep(0.05)
+        first.cancel()
+        return await second, first.cancelled()
+
+    result, first_cancelled = asyncio.run(run())
+
+    assert result == 'bars'
+    assert first_cancelled
+    assert len(calls) == 1
+    assert flight.in_flight() == 0
@@ -0,0 +1,150 @@
+"""
+Two-Candle Detector Parity
+The vectorized two-candle detectors must flag exactly the bars the original df.iloc loops flagged
+"""
+
+import itertools
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tradinghub.backend.two_candle.patterns.counter_attack_pattern import CounterAttackPattern
+from tradinghub.backend.two_candle.patterns.dark_cloud_cover_pattern import DarkCloudCoverPattern
+from tradinghub.backend.two_candle.patterns.engulfing_pattern import EngulfingPattern
+from tradinghub.backend.two_candle.patterns.harami_pattern import HaramiPattern
+from tradinghub.backend.two_candle.patterns.kicker_pattern import KickerPattern
+from tradinghub.backend.two_candle.patterns.piercing_line_pattern import PiercingLinePattern
+from tradinghub.backend.two_candle.patterns.tweezer_bottom_pattern import TweezerBottomPattern
+from tradinghub.backend.two_candle.patterns.tweezer_top_pattern import TweezerTopPattern
+from two_candle_reference import (
+    LoopCounterAttackPattern, LoopDarkCloudCoverPattern, LoopEngulfingPattern, LoopHaramiPattern,
+    LoopKickerPattern, LoopPiercingLinePattern, LoopTweezerBottomPattern, LoopTweezerTopPattern,
+)
+
+# (vectorized detector, loop reference, pattern-specific parameter grid)
+DETECTORS = {
+    'counter_attack': (CounterAttackPattern, LoopCounterAttackPattern, {
+        'counter_attack_type': ['bullish', 'bearish', 'both'],
+        'close_tolerance': [0.0, 0.02],
+    }),
+    'dark_cloud_cover': (DarkCloudCoverPattern, LoopDarkCloudCoverPattern, {
+        'body_size_ratio': [0.3, 0.6],
+        'max_shadow_ratio': [0.3, 1.0],
+        'penetration_ratio': [0.0, 0.5],
+    }),
+    'engulfing': (EngulfingPattern, LoopEngulfingPattern, {
+        'engulfing_type': ['bullish', 'bearish', 'both'],
+        'body_size_ratio': [0.0, 0.3],
+    }),
+    'harami': (HaramiPattern, LoopHaramiPattern, {
+        'harami_type': ['bullish', 'bearish', 'both'],
+        'body_size_ratio': [0.0, 0.3],
+    }),
+    'kicker': (KickerPattern, LoopKickerPattern, {
+        'kicker_type': ['bullish', 'bearish', 'both'],
+        'gap_size_ratio': [0.0, 0.5],
+    }),
+    'piercing_line': (PiercingLinePattern, LoopPiercingLinePattern, {
+        'body_size_ratio': [0.0, 0.3],
+        'piercing_ratio': [0.0, 0.5],
+    }),
+    'tweezer_bottom': (TweezerBottomPattern, LoopTweezerBottomPattern, {
+        'low_tolerance': [0.0, 0.2],
+    }),
+    'tweezer_top': (TweezerTopPattern, LoopTweezerTopPattern, {
+        'high_tolerance': [0.0, 0.2],
+    }),
+}
+
+TREND_OPTIONS = [
+    # (require_trend, add an 'ma_20' column for the detectors that read it)
+    (False, False),
+    (True, False),
+    (True, True),
+]
+
+
+def make_bars(n: int = 400, seed: int = 7) -> pd.DataFrame:
+    """
+    Synthetic OHLCV bars on a coarse price grid
+
+    The grid makes ties common (equal opens/closes, equal highs and lows,
+    closes equal to the previous close); every 13th bar has zero range and
+    every 7th bar opens with a gap large enough for the gap patterns.
+    """
+    rng = np.random.default_rng(seed)
+    tick = 0.25
+    opens, highs, lows, closes = [], [], [], []
+    close = 100.0
+    for i in range(n):
+        gap = rng.choice([-2, -1, 0, 0, 0, 1, 2]) * tick
+        if i % 7 == 0:
+            gap = rng.choice([-8, 8]) * tick
+        open_price = close + gap
+        if i % 13 == 0:
+            close = high = low = open_price
+        else:
+            close = open_price + rng.choice([-6, -4, -2, -1, 0, 1, 2, 4, 6]) * tick
+            high = max(open_price, close) + rng.choice([0, 0, 1, 2]) * tick
+            low = min(open_price, close) - rng.choice([0, 0, 1, 2]) * tick
+        opens.append(open_price)
+        highs.append(high)
+        lows.append(low)
+        closes.append(close)
+    index = pd.date_range('2024-01-02 09:30', periods=n, freq='5min', tz='America/New_York')
+    return pd.DataFrame({
+        'Open': opens, 'High': highs, 'Low': lows, 'Close': closes,
+        'Volume': rng.integers(1_000, 10_000, n).astype(float),
+    }, index=index)
+
+
+def parameter_grid(grid):
+    names = list(grid)
+    for values in itertools.product(*(grid[name] for name in names)):
+        for require_trend, with_ma_20 in TREND_OPTIONS:
+            params = dict(zip(names, values), require_trend=require_trend, ma_period=20)
+            yield params, with_ma_20
+
+
+@pytest.fixture(scope='module')
+def bars() -> pd.DataFrame:
+    return make_bars()
+
+
+def test_synthetic_bars_cover_edge_cases(bars):
+    total_range = bars['High'] - bars['Low']
+    assert (total_range == 0).any()
+    assert (bars['Close'] == bars['Open']).any()
+    assert (bars['High'] == bars['High'].shift(1)).any()
+    assert (bars['Low'] == bars['Low'].shift(1)).any()
+    assert (bars['Close'] == bars['Close'].shift(1)).any()
+
+
+@pytest.mark.parametrize('name', sorted(DETECTORS))
+def test_vectorized_matches_loop(bars, name):
+    detector_class, reference_class, grid = DETECTORS[name]
+    detector, reference = detector_class(), reference_class()
+    column = detector.get_pattern_column_name()
+    type_column = f'{name}_type'
+    hits = 0
+
+    for params, with_ma_20 in parameter_grid(grid):
+        data = bars.copy()
+        if with_ma_20:
+            data['ma_20'] = data['Close'].rolling(window=20).mean()
+
+        expected = reference.detect(data.copy(), dict(params))
+        actual = detector.detect(data.copy(), dict(params))
+
+        pd.testing.assert_series_equal(
+            actual[column].astype(bool), expected[column].astype(bool), obj=f'{column} {params} ma_20={with_ma_20}')
+        if type_column in expected.columns or type_column in actual.columns:
+            assert type_column in expected.columns and type_column in actual.columns, f'{type_column} {params}'
+            pd.testing.assert_series_equal(
+                actual[type_column].fillna('').astype(str), expected[type_column].fillna('').astype(str),
+                obj=f'{type_column} {params} ma_20={with_ma_20}')
+        hits += int(expected[column].astype(bool).sum())
+
+    # The fixture must actually produce the pattern somewhere in the grid
+    assert hits > 0
@@ -0,0 +1,743 @@
+"""
+Reference Two-Candle Detectors
+The row-by-row df.iloc loops the two-candle detectors used before vectorization, kept to check parity
+"""
+
+import pandas as pd
+from typing import Dict, Any
+from tradinghub.backend.two_candle.patterns.counter_attack_pattern import CounterAttackPattern
+from tradinghub.backend.two_candle.patterns.dark_cloud_cover_pattern import DarkCloudCoverPattern
+from tradinghub.backend.two_candle.patterns.engulfing_pattern import EngulfingPattern
+from tradinghub.backend.two_candle.patterns.harami_pattern import HaramiPattern
+from tradinghub.backend.two_candle.patterns.kicker_pattern import KickerPattern
+from tradinghub.backend.two_candle.patterns.piercing_line_pattern import PiercingLinePattern
+from tradinghub.backend.two_candle.patterns.tweezer_bottom_pattern import TweezerBottomPattern
+from tradinghub.backend.two_candle.patterns.tweezer_top_pattern import TweezerTopPattern
+
+
+class LoopCounterAttackPattern(CounterAttackPattern):
+    """Counter Attack detector with the original per-row loop"""
+
+    def _detect_counter_attack_conditions(self, df: pd.DataFrame, params: Dict[str, Any]) -> pd.DataFrame:
+        """Apply Counter Attack pattern conditions"""
+
+        # Counter Attack pattern conditions:
+        # Bullish Counter Attack:
+        # 1. Appears after a downtrend
+        # 2. First candle: Bearish (red) with significant body
+        # 3. Second candle: Bullish (green) that opens with gap down (open₂ < close₁)
+        # 4. Second candle closes almost at same level as previous close (|close₂ − close₁| ≤ tolerance)
+
+        # Bearish Counter Attack:
+        # 1. Appears after an uptrend
+        # 2. First candle: Bullish (green) with significant body
+        # 3. Second candle: Bearish (red) that opens with gap up (open₂ > close₁)
+        # 4. Second candle closes almost at same level as previous close (|close₂ − close₁| ≤ tolerance)
+
+        # Get parameters
+        body_size_ratio = float(params.get('body_size_ratio', 0.3))
+        close_tolerance = float(params.get('close_tolerance', 0.02))  # 2% tolerance for close levels
+        counter_attack_type = params.get('counter_attack_type', 'both')  # 'bullish', 'bearish', or 'both'
+        require_trend = params.get('require_trend', True)
+
+        # Initialize pattern column
+        df['is_counter_attack'] = False
+
+        # Check for counter attack patterns (need at least 2 candles)
+        for i in range(1, len(df)):
+            current_candle = df.iloc[i]
+            previous_candle = df.iloc[i-1]
+
+            # Calculate body sizes and ranges
+            current_body_size = abs(current_candle['Close'] - current_candle['Open'])
+            previous_body_size = abs(previous_candle['Close'] - previous_candle['Open'])
+
+            current_range = current_candle['High'] - current_candle['Low']
+            previous_range = previous_candle['High'] - previous_candle['Low']
+
+            if current_range == 0 or previous_range == 0:  # Avoid division by zero
+                continue
+
+            current_body_ratio = current_body_size / current_range
+            previous_body_ratio = previous_body_size / previous_range
+
+            # Check if first candle has significant body
+            if previous_body_ratio < body_size_ratio:
+                continue
+
+            # Calculate close level tolerance
+            close_diff = abs(float(current_candle['Close']) - float(previous_candle['Close']))
+            close_tolerance_value = float(previous_candle['Close']) * close_tolerance
+
+            # Bullish Counter Attack conditions:
+            # 1. First candle is bearish (red)
+            # 2. Second candle is bullish (green)
+            # 3. Second candle opens with gap down (open₂ < close₁)
+            # 4. Second candle closes almost at same level as previous close
+            bullish_counter_attack = (
+                # First candle is bearish (red)
+                (float(previous_candle['Close']) < float(previous_candle['Open'])) &
+                # Second candle is bullish (green)
+                (float(current_candle['Close']) > float(current_candle['Open'])) &
+                # Second candle opens with gap down
+                (float(current_candle['Open']) < float(previous_candle['Close'])) &
+                # Second candle closes almost at same level as previous close
+                (close_diff <= close_tolerance_value)
+            )
+
+            # Bearish Counter Attack conditions:
+            # 1. First candle is bullish (green)
+            # 2. Second candle is bearish (red)
+            # 3. Second candle opens with gap up (open₂ > close₁)
+            # 4. Second candle closes almost at same level as previous close
+            bearish_counter_attack = (
+                # First candle is bullish (green)
+                (float(previous_candle['Close']) > float(previous_candle['Open'])) &
+                # Second candle is bearish (red)
+                (float(current_candle['Close']) < float(current_candle['Open'])) &
+                # Second candle opens with gap up
+                (float(current_candle['Open']) > float(previous_candle['Close'])) &
+                # Second candle closes almost at same level as previous close
+                (close_diff <= close_tolerance_value)
+            )
+
+            # Apply counter attack type filter
+            if counter_attack_type == 'bullish':
+                counter_attack_condition = bullish_counter_attack
+            elif counter_attack_type == 'bearish':
+                counter_attack_condition = bearish_counter_attack
+            else:  # 'both'
+                counter_attack_condition = bullish_counter_attack | bearish_counter_attack
+
+            # Add trend context if required
+            if require_trend and 'trend' in df.columns:
+                if pd.isna(current_candle['trend']):
+                    continue
+                # For bullish counter attack, we want to be in a downtrend (price below MA)
+                # For bearish counter attack, we want to be in an uptrend (price above MA)
+                if counter_attack_type == 'bullish':
+                    if current_candle['trend'] != 'downtrend':
+                        continue
+                elif counter_attack_type == 'bearish':
+                    if current_candle['trend'] != 'uptrend':
+                        continue
+                else:  # 'both'
+                    if not ((bullish_counter_attack and current_candle['trend'] == 'downtrend') or
+                           (bearish_counter_attack and current_candle['trend'] == 'uptrend')):
+                        continue
+
+            # Set the pattern flag
+            df.iloc[i, df.columns.get_loc('is_counter_attack')] = counter_attack_condition
+
+        return df
+
+
+class LoopDarkCloudCoverPattern(DarkCloudCoverPattern):
+    """Dark Cloud Cover detector with the original per-row loop"""
+
+    def _detect_dark_cloud_cover_conditions(self, df: pd.DataFrame, params: Dict[str, Any]) -> pd.DataFrame:
+        """Apply Dark Cloud Cover pattern conditions"""
+
+        # Dark Cloud Cover pattern conditions:
+        # 1. First candle: Bullish (green) with substantial body
+        # 2. Second candle: Bearish (red) that opens above first candle's high (gap up)
+        # 3. Second candle closes below midpoint of first candle's body
+        # 4. Both candles have reasonable shadow ratios
+
+        # Get parameters
+        body_size_ratio = params.get('body_size_ratio', 0.6)
+        max_shadow_ratio = params.get('max_shadow_ratio', 0.3)
+        penetration_ratio = params.get('penetration_ratio', 0.5)
+        require_trend = params.get('require_trend', True)
+
+        # Initialize pattern column
+        df['is_dark_cloud_cover'] = False
+
+        # Check for Dark Cloud Cover patterns (need at least 2 candles)
+        for i in range(1, len(df)):
+            current_candle = df.iloc[i]
+            previous_candle = df.iloc[i-1]
+
+            # First candle must be bullish (green)
+            if previous_candle['Close'] <= previous_candle['Open']:
+                continue
+
+            # Second candle must be bearish (red)
+            if current_candle['Close'] >= current_candle['Open']:
+                continue
+
+            # Calculate first candle properties
+            first_body_size = previous_candle['Close'] - previous_candle['Open']
+            first_total_range = previous_candle['High'] - previous_candle['Low']
+
+            if first_total_range == 0:
+                continue
+
+            first_body_ratio = first_body_size / first_total_range
+            first_upper_shadow = previous_candle['High'] - previous_candle['Close']
+            first_lower_shadow = previous_candle['Open'] - previous_candle['Low']
+            first_upper_shadow_ratio = first_upper_shadow / first_total_range
+            first_lower_shadow_ratio = first_lower_shadow / first_total_range
+
+            # First candle should have substantial body and reasonable shadows
+            if (first_body_ratio < body_size_ratio or
+                first_upper_shadow_ratio > max_shadow_ratio or
+                first_lower_shadow_ratio > max_shadow_ratio):
+                continue
+
+            # Calculate second candle properties
+            second_body_size = current_candle['Open'] - current_candle['Close']
+            second_total_range = current_candle['High'] - current_candle['Low']
+
+            if second_total_range == 0:
+                continue
+
+            second_body_ratio = second_body_size / second_total_range
+            second_upper_shadow = current_candle['High'] - current_candle['Open']
+            second_lower_shadow = current_candle['Close'] - current_candle['Low']
+            second_upper_shadow_ratio = second_upper_shadow / second_total_range
+            second_lower_shadow_ratio = second_lower_shadow / second_total_range
+
+            # Second candle should have reasonable body and shadows
+            if (second_body_ratio < 0.3 or
+                second_upper_shadow_ratio > max_shadow_ratio or
+                second_lower_shadow_ratio > max_shadow_ratio):
+                continue
+
+            # Gap up: Second candle opens above first candle's high
+            if current_candle['Open'] <= previous_candle['High']:
+                continue
+
+            # Penetration check: Second candle must close below midpoint of first candle's body
+            first_body_midpoint = (previous_candle['Open'] + previous_candle['Close']) / 2
+
+            if current_candle['Close'] >= first_body_midpoint:
+                continue
+
+            # Calculate penetration depth
+            penetration_depth = (first_body_midpoint - current_candle['Close']) / first_body_size
+
+            # Check if penetration meets minimum requirement
+            if penetration_depth < penetration_ratio:
+                continue
+
+            # Add trend context if required
+            if require_trend and 'ma_20' in df.columns:
+                # For Dark Cloud Cover, we want to be in an uptrend (price above MA)
+                trend_condition = current_candle['Close'] > current_candle['ma_20']
+                if not trend_condition:
+                    continue
+
+            # Set the pattern flag
+            df.iloc[i, df.columns.get_loc('is_dark_cloud_cover')] = True
+
+        return df
+
+
+class LoopEngulfingPattern(EngulfingPattern):
+    """Engulfing detector with the original per-row loop"""
+
+    def _detect_engulfing_conditions(self, df: pd.DataFrame, params: Dict[str, Any]) -> pd.DataFrame:
+        """Apply Engulfing pattern conditions"""
+
+        # Engulfing pattern conditions:
+        # 1. Second candle completely engulfs the first candle's body
+        # 2. Opposite colors (first candle opposite to second candle)
+        # 3. Second candle has significant body size
+
+        # Get parameters
+        body_size_ratio = params.get('body_size_ratio', 0.3)
+        engulfing_type = params.get('engulfing_type', 'both')  # 'bullish', 'bearish', or 'both'
+        require_trend = params.get('require_trend', True)
+
+        # Initialize pattern column
+        df['is_engulfing'] = False
+
+        # Check for engulfing patterns (need at least 2 candles)
+        for i in range(1, len(df)):
+            current_candle = df.iloc[i]
+            previous_candle = df.iloc[i-1]
+
+            # Calculate body sizes
+            current_body_size = abs(current_candle['Close'] - current_candle['Open'])
+            previous_body_size = abs(previous_candle['Close'] - previous_candle['Open'])
+
+            # Check if current candle has significant body
+            current_range = current_candle['High'] - current_candle['Low']
+            if current_range == 0:  # Avoid division by zero
+                continue
+
+            current_body_ratio = current_body_size / current_range
+            if current_body_ratio < body_size_ratio:
+                continue
+
+            # Check engulfing conditions
+            bullish_engulfing = (
+                # Previous candle is bearish (red)
+                (previous_candle['Close'] < previous_candle['Open']) &
+                # Current candle is bullish (green)
+                (current_candle['Close'] > current_candle['Open']) &
+                # Current candle's body completely engulfs previous candle's body
+                (current_candle['Open'] < previous_candle['Close']) &  # Current opens below previous close
+                (current_candle['Close'] > previous_candle['Open'])     # Current closes above previous open
+            )
+
+            bearish_engulfing = (
+                # Previous candle is bullish (green)
+                (previous_candle['Close'] > previous_candle['Open']) &
+                # Current candle is bearish (red)
+                (current_candle['Close'] < current_candle['Open']) &
+                # Current candle's body completely engulfs previous candle's body
+                (current_candle['Open'] > previous_candle['Close']) &  # Current opens above previous close
+                (current_candle['Close'] < previous_candle['Open'])     # Current closes below previous open
+            )
+
+            # Apply engulfing type filter
+            if engulfing_type == 'bullish':
+                engulfing_condition = bullish_engulfing
+            elif engulfing_type == 'bearish':
+                engulfing_condition = bearish_engulfing
+            else:  # 'both'
+                engulfing_condition = bullish_engulfing | bearish_engulfing
+
+            # Add trend context if required
+            if require_trend and 'ma_20' in df.columns:
+                # For bullish engulfing, we want to be in a downtrend (price below MA)
+                # For bearish engulfing, we want to be in an uptrend (price above MA)
+                if engulfing_type == 'bullish':
+                    trend_condition = current_candle['Close'] < current_candle['ma_20']
+                elif engulfing_type == 'bearish':
+                    trend_condition = current_candle['Close'] > current_candle['ma_20']
+                else:  # 'both'
+                    trend_condition = (
+                        (bullish_engulfing & (current_candle['Close'] < current_candle['ma_20'])) |
+                        (bearish_engulfing & (current_candle['Close'] > current_candle['ma_20']))
+                    )
+                engulfing_condition = engulfing_condition & trend_condition
+
+            # Set the pattern flag
+            df.iloc[i, df.columns.get_loc('is_engulfing')] = engulfing_condition
+
+        return df
+
+
+class LoopHaramiPattern(HaramiPattern):
+    """Harami detector with the original per-row loop"""
+
+    def _detect_harami_conditions(self, df: pd.DataFrame, params: Dict[str, Any]) -> pd.DataFrame:
+        """Apply Harami pattern conditions"""
+
+        # Harami pattern conditions:
+        # 1. First candle has a large body (significant size)
+        # 2. Second candle has a small body (contained within first candle's body)
+        # 3. Second candle's body is completely inside first candle's body
+        # 4. Opposite colors (first candle opposite to second candle)
+
+        # Get parameters
+        body_size_ratio = params.get('body_size_ratio', 0.3)
+        harami_type = params.get('harami_type', 'both')  # 'bullish', 'bearish', or 'both'
+        require_trend = params.get('require_trend', True)
+
+        # Initialize pattern column
+        df['is_harami'] = False
+
+        # Check for Harami patterns (need at least 2 candles)
+        for i in range(1, len(df)):
+            current_candle = df.iloc[i]
+            previous_candle = df.iloc[i-1]
+
+            # Skip if any required data is missing
+            if pd.isna(current_candle['body_size']) or pd.isna(previous_candle['body_size']):
+                continue
+
+            # Check if previous candle has significant body size
+            if previous_candle['body_size'] < body_size_ratio * previous_candle['total_range']:
+                continue
+
+            # Check if current candle's body is completely contained within previous candle's body
+            if not self._is_body_contained(current_candle, previous_candle):
+                continue
+
+            # Check color conditions based on harami type
+            if not self._check_color_conditions(current_candle, previous_candle, harami_type):
+                continue
+
+            # Check trend condition if required
+            if require_trend and 'trend' in df.columns:
+                if pd.isna(current_candle['trend']):
+                    continue
+                # For bullish harami, we want downtrend before reversal
+                # For bearish harami, we want uptrend before reversal
+                if harami_type in ['bullish', 'both'] and current_candle['trend'] != 'downtrend':
+                    continue
+                if harami_type in ['bearish', 'both'] and current_candle['trend'] != 'uptrend':
+                    continue
+
+            # Mark as Harami pattern (use .loc with the actual index)
+            df.loc[df.index[i], 'is_harami'] = True
+
+            # Add pattern type classification
+            if current_candle['is_green'] and not previous_candle['is_green']:
+                df.loc[df.index[i], 'harami_type'] = 'bullish_harami'
+            elif not current_candle['is_green'] and previous_candle['is_green']:
+                df.loc[df.index[i], 'harami_type'] = 'bearish_harami'
+            else:
+                df.loc[df.index[i], 'harami_type'] = 'neutral_harami'
+
+        return df
+
+    def _is_body_contained(self, current_candle: pd.Series, previous_candle: pd.Series) -> bool:
+        """Check if current candle's body is completely contained within previous candle's body"""
+
+        # Get body ranges
+        current_body_top = max(current_candle['Open'], current_candle['Close'])
+        current_body_bottom = min(current_candle['Open'], current_candle['Close'])
+        previous_body_top = max(previous_candle['Open'], previous_candle['Close'])
+        previous_body_bottom = min(previous_candle['Open'], previous_candle['Close'])
+
+        # Check if current body is completely within previous body
+        return (current_body_top <= previous_body_top and
+                current_body_bottom >= previous_body_bottom)
+
+    def _check_color_conditions(self, current_candle: pd.Series, previous_candle: pd.Series, harami_type: str) -> bool:
+        """Check if color conditions are met for the specified harami type"""
+
+        if harami_type == 'bullish':
+            # Bullish harami: first candle red, second candle green
+            return not previous_candle['is_green'] and current_candle['is_green']
+        elif harami_type == 'bearish':
+            # Bearish harami: first candle green, second candle red
+            return previous_candle['is_green'] and not current_candle['is_green']
+        else:  # 'both'
+            # Either bullish or bearish harami
+            return (not previous_candle['is_green'] and current_candle['is_green']) or \
+                   (previous_candle['is_green'] and not current_candle['is_green'])
+
+
+class LoopKickerPattern(KickerPattern):
+    """Kicker detector with the original per-row loop"""
+
+    def _detect_kicker_conditions(self, df: pd.DataFrame, params: Dict[str, Any]) -> pd.DataFrame:
+        """Apply Kicker pattern conditions"""
+
+        # Kicker pattern conditions:
+        # 1. Two consecutive candles with a significant gap
+        # 2. No overlap between the candles' bodies
+        # 3. Strong directional move in the second candle
+        # 4. Gap must be significant relative to price
+
+        # Get parameters
+        body_size_ratio = params.get('body_size_ratio', 0.3)
+        gap_size_ratio = params.get('gap_size_ratio', 0.5)  # 0.5% minimum gap
+        require_trend = params.get('require_trend', True)
+        kicker_type = params.get('kicker_type', 'both')  # 'bullish', 'bearish', or 'both'
+
+        # Initialize pattern column
+        df['is_kicker'] = False
+
+        # Check for Kicker patterns (need at least 2 candles)
+        for i in range(1, len(df)):
+            current_candle = df.iloc[i]
+            previous_candle = df.iloc[i-1]
+
+            # Calculate body sizes for both candles
+            first_body_size = abs(previous_candle['Close'] - previous_candle['Open'])
+            second_body_size = abs(current_candle['Close'] - current_candle['Open'])
+
+            # Calculate total ranges
+            first_range = previous_candle['High'] - previous_candle['Low']
+            second_range = current_candle['High'] - current_candle['Low']
+
+            if first_range == 0 or second_range == 0:  # Avoid division by zero
+                continue
+
+            # Check body size ratios
+            first_body_ratio = first_body_size / first_range
+            second_body_ratio = second_body_size / second_range
+
+            if first_body_ratio < body_size_ratio or second_body_ratio < body_size_ratio:
+                continue
+
+            # Check for gap and no overlap
+            gap_size = 0
+            is_bullish_kicker = False
+            is_bearish_kicker = False
+
+            # Check for Bullish Kicker (gap up)
+            if (current_candle['Open'] > previous_candle['Open'] and
+                current_candle['Open'] > previous_candle['Close'] and
+                current_candle['Close'] > current_candle['Open']):
+
+                # Calculate gap size
+                gap_size = current_candle['Open'] - previous_candle['Close']
+                gap_percentage = (gap_size / previous_candle['Close']) * 100
+
+                if gap_percentage >= gap_size_ratio:
+                    is_bullish_kicker = True
+
+            # Check for Bearish Kicker (gap down)
+            elif (current_candle['Open'] < previous_candle['Open'] and
+                  current_candle['Open'] < previous_candle['Close'] and
+                  current_candle['Close'] < current_candle['Open']):
+
+                # Calculate gap size
+                gap_size = previous_candle['Close'] - current_candle['Open']
+                gap_percentage = (gap_size / previous_candle['Close']) * 100
+
+                if gap_percentage >= gap_size_ratio:
+                    is_bearish_kicker = True
+
+            # Check if pattern matches the requested type
+            if kicker_type == 'bullish' and not is_bullish_kicker:
+                continue
+            elif kicker_type == 'bearish' and not is_bearish_kicker:
+                continue
+            elif kicker_type == 'both' and not (is_bullish_kicker or is_bearish_kicker):
+                continue
+
+            # Add trend context if required
+            if require_trend and 'ma_20' in df.columns:
+                if is_bullish_kicker:
+                    # For bullish kicker, we want to be in a downtrend (price below MA)
+                    trend_condition = previous_candle['Close'] < previous_candle['ma_20']
+                elif is_bearish_kicker:
+                    # For bearish kicker, we want to be in an uptrend (price above MA)
+                    trend_condition = previous_candle['Close'] > previous_candle['ma_20']
+                else:
+                    continue
+
+                if not trend_condition:
+                    continue
+
+            # Set the pattern flag
+            df.iloc[i, df.columns.get_loc('is_kicker')] = True
+
+        return df
+
+
+class LoopPiercingLinePattern(PiercingLinePattern):
+    """Piercing Line detector with the original per-row loop"""
+
+    def _detect_piercing_line_conditions(self, df: pd.DataFrame, params: Dict[str, Any]) -> pd.DataFrame:
+        """Apply Piercing Line pattern conditions"""
+
+        # Piercing Line pattern conditions:
+        # 1. First candle is bearish (red) with significant body
+        # 2. Second candle opens below the first candle's low
+        # 3. Second candle closes above the midpoint of the first candle's body
+        # 4. Second candle is bullish (green)
+
+        # Get parameters
+        body_size_ratio = params.get('body_size_ratio', 0.3)
+        piercing_ratio = params.get('piercing_ratio', 0.5)
+        require_trend = params.get('require_trend', True)
+
+        # Initialize pattern column
+        df['is_piercing_line'] = False
+
+        # Check for piercing line patterns (need at least 2 candles)
+        for i in range(1, len(df)):
+            current_candle = df.iloc[i]
+            previous_candle = df.iloc[i-1]
+
+            # Calculate body sizes
+            current_body_size = abs(current_candle['Close'] - current_candle['Open'])
+            previous_body_size = abs(previous_candle['Close'] - previous_candle['Open'])
+
+            # Check if both candles have significant bodies
+            current_range = current_candle['High'] - current_candle['Low']
+            previous_range = previous_candle['High'] - previous_candle['Low']
+
+            if current_range == 0 or previous_range == 0:  # Avoid division by zero
+                continue
+
+            current_body_ratio = current_body_size / current_range
+            previous_body_ratio = previous_body_size / previous_range
+
+            if current_body_ratio < body_size_ratio or previous_body_ratio < body_size_ratio:
+                continue
+
+            # Check piercing line conditions (bullish only)
+            piercing_line_condition = (
+                # First candle is bearish (red)
+                (previous_candle['Close'] < previous_candle['Open']) &
+                # Second candle is bullish (green)
+                (current_candle['Close'] > current_candle['Open']) &
+                # Second candle opens below the first candle's low
+                (current_candle['Open'] < previous_candle['Low']) &
+                # Second candle closes above the midpoint of the first candle's body
+                (current_candle['Close'] > (previous_candle['Open'] + previous_candle['Close']) / 2)
+            )
+
+            # Check piercing ratio (how much of the first candle's body is pierced)
+            if piercing_line_condition:
+                first_candle_body_midpoint = (previous_candle['Open'] + previous_candle['Close']) / 2
+                piercing_amount = current_candle['Close'] - first_candle_body_midpoint
+                first_candle_body_size = previous_candle['Open'] - previous_candle['Close']  # Bearish body size
+
+                if first_candle_body_size > 0:  # Avoid division by zero
+                    actual_piercing_ratio = piercing_amount / first_candle_body_size
+                    piercing_line_condition = piercing_line_condition & (actual_piercing_ratio >= piercing_ratio)
+
+            # Add trend context if required
+            if require_trend and 'ma_20' in df.columns:
+                # For piercing line, we want to be in a downtrend (price below MA)
+                trend_condition = current_candle['Close'] < current_candle['ma_20']
+                piercing_line_condition = piercing_line_condition & trend_condition
+
+            # Set the pattern flag
+            df.iloc[i, df.columns.get_loc('is_piercing_line')] = piercing_line_condition
+
+        return df
+
+
+class LoopTweezerBottomPattern(TweezerBottomPattern):
+    """Tweezer Bottom detector with the original per-row loop"""
+
+    def _detect_tweezer_bottom_conditions(self, df: pd.DataFrame, params: Dict[str, Any]) -> pd.DataFrame:
+        """Apply Tweezer Bottom pattern conditions"""
+
+        # Tweezer Bottom pattern conditions:
+        # 1. Two consecutive candles with nearly identical lows
+        # 2. First candle: Bearish (red) - continues downtrend
+        # 3. Second candle: Bullish (green) - shows buying pressure
+        # 4. Both candles should have reasonable body sizes
+        # 5. Lows should be within tolerance range
+
+        # Get parameters
+        body_size_ratio = params.get('body_size_ratio', 0.3)
+        low_tolerance = params.get('low_tolerance', 0.2)  # 0.2% tolerance by default
+        require_trend = params.get('require_trend', True)
+
+        # Initialize pattern column
+        df['is_tweezer_bottom'] = False
+
+        # Check for Tweezer Bottom patterns (need at least 2 candles)
+        for i in range(1, len(df)):
+            current_candle = df.iloc[i]
+            previous_candle = df.iloc[i-1]
+
+            # First candle must be bearish (red)
+            if previous_candle['Close'] >= previous_candle['Open']:
+                continue
+
+            # Second candle must be bullish (green)
+            if current_candle['Close'] <= current_candle['Open']:
+                continue
+
+            # Calculate body sizes for both candles
+            first_body_size = abs(previous_candle['Open'] - previous_candle['Close'])
+            second_body_size = abs(current_candle['Close'] - current_candle['Open'])
+
+            # Calculate total ranges
+            first_range = previous_candle['High'] - previous_candle['Low']
+            second_range = current_candle['High'] - current_candle['Low']
+
+            if first_range == 0 or second_range == 0:  # Avoid division by zero
+                continue
+
+            # Check body size ratios
+            first_body_ratio = first_body_size / first_range
+            second_body_ratio = second_body_size / second_range
+
+            if first_body_ratio < body_size_ratio or second_body_ratio < body_size_ratio:
+                continue
+
+            # Check if lows are nearly identical (within tolerance)
+            low_difference = abs(previous_candle['Low'] - current_candle['Low'])
+            average_low = (previous_candle['Low'] + current_candle['Low']) / 2
+            low_tolerance_pct = low_tolerance / 100  # Convert percentage to decimal
+
+            # Calculate tolerance in price terms
+            price_tolerance = average_low * low_tolerance_pct
+
+            if low_difference > price_tolerance:
+                continue
+
+            # Add trend context if required
+            if require_trend and 'ma_20' in df.columns:
+                # For Tweezer Bottom, we want to be in a downtrend (price below MA)
+                trend_condition = current_candle['Close'] < current_candle['ma_20']
+                if not trend_condition:
+                    continue
+
+            # Set the pattern flag
+            df.iloc[i, df.columns.get_loc('is_tweezer_bottom')] = True
+
+        return df
+
+
+class LoopTweezerTopPattern(TweezerTopPattern):
+    """Tweezer Top detector with the original per-row loop"""
+
+    def _detect_tweezer_top_conditions(self, df: pd.DataFrame, params: Dict[str, Any]) -> pd.DataFrame:
+        """Apply Tweezer Top pattern conditions"""
+
+        # Tweezer Top pattern conditions:
+        # 1. Two consecutive candles with nearly identical highs
+        # 2. First candle: Bullish (green) - continues uptrend
+        # 3. Second candle: Bearish (red) - shows selling pressure
+        # 4. Both candles should have reasonable body sizes
+        # 5. Highs should be within tolerance range
+
+        # Get parameters
+        body_size_ratio = params.get('body_size_ratio', 0.3)
+        high_tolerance = params.get('high_tolerance', 0.2)  # 0.2% tolerance by default
+        require_trend = params.get('require_trend', True)
+
+        # Initialize pattern column
+        df['is_tweezer_top'] = False
+
+        # Check for Tweezer Top patterns (need at least 2 candles)
+        for i in range(1, len(df)):
+            current_candle = df.iloc[i]
+            previous_candle = df.iloc[i-1]
+
+            # First candle must be bullish (green)
+            if previous_candle['Close'] <= previous_candle['Open']:
+                continue
+
+            # Second candle must be bearish (red)
+            if current_candle['Close'] >= current_candle['Open']:
+                continue
+
+            # Calculate body sizes for both candles
+            first_body_size = abs(previous_candle['Close'] - previous_candle['Open'])
+            second_body_size = abs(current_candle['Open'] - current_candle['Close'])
+
+            # Calculate total ranges
+            first_range = previous_candle['High'] - previous_candle['Low']
+            second_range = current_candle['High'] - current_candle['Low']
+
+            if first_range == 0 or second_range == 0:  # Avoid division by zero
+                continue
+
+            # Check body size ratios
+            first_body_ratio = first_body_size / first_range
+            second_body_ratio = second_body_size / second_range
+
+            if first_body_ratio < body_size_ratio or second_body_ratio < body_size_ratio:
+                continue
+
+            # Check if highs are nearly identical (within tolerance)
+            high_difference = abs(previous_candle['High'] - current_candle['High'])
+            average_high = (previous_candle['High'] + current_candle['High']) / 2
+            high_tolerance_pct = high_tolerance / 100  # Convert percentage to decimal
+
+            # Calculate tolerance in price terms
+            price_tolerance = average_high * high_tolerance_pct
+
+            if high_difference > price_tolerance:
+                continue
+
+            # Add trend context if required
+            if require_trend and 'ma_20' in df.columns:
+                # For Tweezer Top, we want to be in an uptrend (price above MA)
+                trend_condition = current_candle['Close'] > current_candle['ma_20']
+                if not trend_condition:
+                    continue
+
+            # Set the pattern flag
+            df.iloc[i, df.columns.get_loc('is_tweezer_top')] = True
+
+        return df
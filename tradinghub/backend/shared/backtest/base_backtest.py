@@ -1,4 +1,4 @@
-from typing import Dict, Any
+from typing import Dict, Any, Callable, Optional
 import pandas as pd
 import numpy as np
 from ..patterns.base_pattern import BasePattern
@@ -10,6 +10,10 @@ from tradinghub.backend.shared.models.dto.trade_params import TradeParams
 class BaseBacktest:
     """Base class for all pattern backtesters"""
     
+    # How often the simulation reports progress (and may be stopped by the callback)
+    PROGRESS_EVERY_ENTRIES = 100  # trades opened, in 'vectorized' mode
+    PROGRESS_EVERY_BARS = 5000  # bars stepped, in 'bar' mode
+    
     def __init__(self, pattern_detector: BasePattern, position_type: str = 'long'):
         """
         Initialize the backtester
@@ -22,7 +26,8 @@ class BaseBacktest:
         self.position_type = position_type
         self.performance_analyzer = PerformanceAnalyzer()
     
-    def run_backtest(self, df: pd.DataFrame, pattern_params: Dict[str, Any], backtest_params: BacktestParams) -> Dict[str, Any]:
+    def run_backtest(self, df: pd.DataFrame, pattern_params: Dict[str, Any], backtest_params: BacktestParams,
+                     progress: Optional[Callable[[float], None]] = None) -> Dict[str, Any]:
         """
         Run backtest on historical data
         
@@ -30,10 +35,45 @@ class BaseBacktest:
             df: DataFrame with OHLC data
             pattern_params: Parameters for pattern detection
             backtest_params: Parameters for backtesting
+            progress: Optional callback(fraction of the simulation done), see simulate
             
         Returns:
             Dictionary containing backtest results
         """
+        trade_executor = self.simulate(df, pattern_params, backtest_params, progress)
+        portfolio_value = trade_executor.get_portfolio_history()[-1]['value']
+        
+        # Calculate performance metrics using PerformanceAnalyzer
+        results = self.performance_analyzer.calculate_performance_metrics(trade_executor.get_trades())
+        
+        # Add portfolio tracking information
+        results['initial_portfolio_value'] = backtest_params.initial_portfolio_size
+        results['final_portfolio_value'] = portfolio_value
+        results['portfolio_history'] = trade_executor.get_portfolio_history()
+        results['total_commission'] = trade_executor.get_total_commission()
+        results['total_slippage'] = trade_executor.get_total_slippage()
+        
+        # Add position type indicator
+        results['position_type'] = self.position_type
+        
+        return results 
+    
+    def simulate(self, df: pd.DataFrame, pattern_params: Dict[str, Any], backtest_params: BacktestParams,
+                 progress: Optional[Callable[[float], None]] = None) -> TradeExecutor:
+        """
+        Simulate trades on historical data
+        
+        Args:
+            df: DataFrame with OHLC data
+            pattern_params: Parameters for pattern detection
+            backtest_params: Parameters for backtesting
+            progress: Optional callback(fraction of the bars simulated), called
+                every PROGRESS_EVERY_ENTRIES trades or PROGRESS_EVERY_BARS bars;
+                an exception it raises (e.g. a cancelled job) stops the simulation
+            
+        Returns:
+            TradeExecutor: Executor holding the trades, portfolio history and cost totals
+        """
         # Detect patterns if not already detected
         pattern_column = self.pattern_detector.get_pattern_column_name()
         if pattern_column not in df.columns:
@@ -55,6 +95,34 @@ class BaseBacktest:
             df.index[0]
         )
         
+        # Simulate trades
+        progress = progress or (lambda fraction: None)
+        if backtest_params.simulation_mode == 'vectorized':
+            self._simulate_vectorized(df, pattern_column, backtest_params, trade_executor, portfolio_value, progress)
+        elif backtest_params.simulation_mode == 'bar':
+            self._simulate_bars(df, pattern_column, backtest_params, trade_executor, portfolio_value, progress)
+        else:
+            raise ValueError(f"Unknown simulation mode: {backtest_params.simulation_mode}")
+        
+        return trade_executor
+    
+    def _simulate_bars(self, df: pd.DataFrame, pattern_column: str, backtest_params: BacktestParams,
+                       trade_executor: TradeExecutor, portfolio_value: float,
+                       progress: Callable[[float], None]) -> float:
+        """
+        Simulate trades bar by bar through the trade executor
+        
+        Args:
+            df: DataFrame with OHLC data and the pattern column
+            pattern_column: Name of the pattern signal column
+            backtest_params: Parameters for backtesting
+            trade_executor: Executor holding trades and portfolio history
+            portfolio_value: Starting portfolio value
+            progress: Callback(fraction of the bars simulated)
+            
+        Returns:
+            float: Portfolio value after the last closed trade
+        """
         # Pre-compute arrays for faster access (vectorization optimization)
         pattern_signals = df[pattern_column].values
         dates = df.index.values
@@ -63,6 +131,9 @@ class BaseBacktest:
         
         # Iterate through data with optimized access
         for i in range(max_iterations):
+            if i and i % self.PROGRESS_EVERY_BARS == 0:
+                progress(i / max_iterations)
+            
             # Check if this is a pattern and we don't have an open position
             if pattern_signals[i]:
                 # Enter position after entry_delay
@@ -82,17 +153,57 @@ class BaseBacktest:
                 if position_closed:
                     portfolio_value = trade_executor.get_portfolio_history()[-1]['value']
         
-        # Calculate performance metrics using PerformanceAnalyzer
-        results = self.performance_analyzer.calculate_performance_metrics(trade_executor.get_trades())
+        return portfolio_value
+    
+    def _simulate_vectorized(self, df: pd.DataFrame, pattern_column: str, backtest_params: BacktestParams,
+                             trade_executor: TradeExecutor, portfolio_value: float,
+                             progress: Callable[[float], None]) -> float:
+        """
+        Simulate trades with one array search per trade instead of one step per bar
         
-        # Add portfolio tracking information
-        results['initial_portfolio_value'] = backtest_params.initial_portfolio_size
-        results['final_portfolio_value'] = portfolio_value
-        results['portfolio_history'] = trade_executor.get_portfolio_history()
-        results['total_commission'] = trade_executor.get_total_commission()
-        results['total_slippage'] = trade_executor.get_total_slippage()
+        Produces the same trades and portfolio history as _simulate_bars: signals
+        are taken only while no position is open, and each position's exit bar is
+        found by scanning its forward window of High/Low/Close arrays.
         
-        # Add position type indicator
-        results['position_type'] = self.position_type
+        Args:
+            df: DataFrame with OHLC data and the pattern column
+            pattern_column: Name of the pattern signal column
+            backtest_params: Parameters for backtesting
+            trade_executor: Executor holding trades and portfolio history
+            portfolio_value: Starting portfolio value
+            progress: Callback(fraction of the bars simulated)
+            
+        Returns:
+            float: Portfolio value after the last closed trade
+        """
+        pattern_signals = df[pattern_column].values
+        dates = df.index.values
+        open_prices = df['Open'].values
+        high_prices = df['High'].values
+        low_prices = df['Low'].values
+        close_prices = df['Close'].values
+        max_iterations = max(len(df) - backtest_params.entry_delay, 0)
+        
+        entry_indices = np.flatnonzero(pattern_signals[:max_iterations]) + backtest_params.entry_delay
+        next_entry_idx = 0  # First bar where a new position may be opened
+        entries = 0
+        for entry_idx in entry_indices.tolist():
+            if entry_idx < next_entry_idx:
+                continue
+            
+            if entries and entries % self.PROGRESS_EVERY_ENTRIES == 0:
+                progress(entry_idx / len(df))
+            entries += 1
+            
+            trade_executor.enter_position(pd.Timestamp(dates[entry_idx]), open_prices[entry_idx], portfolio_value)
+            exit_info = trade_executor.find_exit(entry_idx, high_prices, low_prices, close_prices)
+            if exit_info is None:
+                break  # Position is still open at the end of the data
+            
+            exit_idx, exit_reason, exit_price = exit_info
+            trade_executor.close_position(pd.Timestamp(dates[exit_idx]), exit_price, exit_reason,
+                                          periods_held=exit_idx - entry_idx + 1)
+            portfolio_value = trade_executor.get_portfolio_history()[-1]['value']
+            next_entry_idx = exit_idx + 1
         
-        return results 
\ No newline at end of file
+        return portfolio_value
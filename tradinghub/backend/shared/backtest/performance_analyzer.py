@@ -34,6 +34,19 @@ class PerformanceAnalyzer:
             'hourly_performance': self._calculate_hourly_performance(trades)
         }
         
+    def calculate_summary_metrics(self, trades: List[Trade]) -> Dict[str, Any]:
+        """Calculate headline metrics only, without the trade list or hourly breakdown"""
+        core = self._compute_core_stats(trades)
+        return {
+            'total_trades': core['total_trades'],
+            'winning_trades': core['winning_trades'],
+            'losing_trades': core['losing_trades'],
+            'win_rate': core['win_rate'],
+            'profit_factor': core['profit_factor'],
+            'average_profit': core['average_profit'],
+            'total_profit_pct': core['total_profit'] * 100
+        }
+        
     def _calculate_hourly_performance(self, trades: List[Trade]) -> Dict[str, Any]:
         """
         Calculate performance metrics by hour of day
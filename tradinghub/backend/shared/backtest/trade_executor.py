@@ -1,4 +1,5 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
+import numpy as np
 import pandas as pd
 from tradinghub.backend.shared.models.dto.trade_results import Trade
 from tradinghub.backend.shared.models.dto.trade_params import TradeParams
@@ -95,6 +96,63 @@ class TradeExecutor:
             
         return False
 
+    def find_exit(self, entry_idx: int, high: np.ndarray, low: np.ndarray, close: np.ndarray) -> Optional[Tuple[int, str, float]]:
+        """
+        Find where the open position exits, scanning forward from its entry bar
+        
+        Gives the same result as calling manage_position on every bar from the
+        entry bar on: a stop loss or take profit hit exits at that level (stop
+        loss checked first), and the max_holding_periods-th bar exits at its
+        close even if a level was hit on it.
+        
+        Args:
+            entry_idx: Position of the entry bar
+            high: High prices of all bars
+            low: Low prices of all bars
+            close: Close prices of all bars
+            
+        Returns:
+            Tuple of (exit bar position, exit reason, exit price), or None if the
+            position is still open after the last bar
+        """
+        stop = self.current_position['stop_loss']
+        take = self.current_position['take_profit']
+        last_offset = max(self.trade_params.max_holding_periods, 1) - 1
+        window_end = min(entry_idx + last_offset + 1, len(close))
+        
+        if self.position_type == 'long':
+            stop_hit = low[entry_idx:window_end] <= stop
+            take_hit = high[entry_idx:window_end] >= take
+        else:
+            stop_hit = high[entry_idx:window_end] >= stop
+            take_hit = low[entry_idx:window_end] <= take
+        
+        level_hit = stop_hit | take_hit
+        if level_hit.any():
+            offset = int(np.argmax(level_hit))
+            if offset < last_offset:
+                if stop_hit[offset]:
+                    return entry_idx + offset, 'stop_loss', stop
+                return entry_idx + offset, 'take_profit', take
+        
+        # Max holding periods reached (same for both)
+        if entry_idx + last_offset < len(close):
+            return entry_idx + last_offset, 'max_periods', close[entry_idx + last_offset]
+        return None
+
+    def close_position(self, exit_date: pd.Timestamp, exit_price: float, exit_reason: str, periods_held: int):
+        """
+        Close the current position after it was held for periods_held bars
+        
+        Args:
+            exit_date: Date to close the position
+            exit_price: Price to close at
+            exit_reason: Reason for closing the position
+            periods_held: Number of bars the position was held
+        """
+        self.current_position['periods_held'] = periods_held
+        self._close_position(exit_date, exit_price, exit_reason)
+
     def _close_position(self, exit_date: pd.Timestamp, exit_price: float, exit_reason: str):
         """
         Close the current position and record the trade
@@ -6,8 +6,10 @@ class Config:
     DEBUG = False
     TESTING = False
     
-    # Default timezone for the application
-    DEFAULT_TIMEZONE = 'Asia/Jerusalem'
+    # Timezone dates are shown in, and the exchange timezone assumed for naive market data
+    DISPLAY_TIMEZONE = os.environ.get('DISPLAY_TIMEZONE', 'Asia/Jerusalem')
+    DISPLAY_TIMEZONE_LABEL = os.environ.get('DISPLAY_TIMEZONE_LABEL', 'Israel')  # shown in table headers
+    MARKET_TIMEZONE = os.environ.get('MARKET_TIMEZONE', 'US/Eastern')
     
     # Default stock data parameters
     DEFAULT_SYMBOL = 'AAPL'
@@ -21,8 +23,47 @@ class Config:
     DEFAULT_MA_PERIOD = 5
     DEFAULT_REQUIRE_GREEN = True
     
+    # Largest number of grid points a single backtest sweep may evaluate
+    SWEEP_MAX_GRID_POINTS = int(os.environ.get('SWEEP_MAX_GRID_POINTS', 2000))
+    
+    # Executor for independent detection/backtest units: 'inline' or 'process'
+    TASK_EXECUTOR = os.environ.get('TASK_EXECUTOR', 'inline')
+    TASK_EXECUTOR_WORKERS = int(os.environ.get('TASK_EXECUTOR_WORKERS', 0)) or None  # None: one per CPU
+    TASK_EXECUTOR_START_METHOD = os.environ.get('TASK_EXECUTOR_START_METHOD', 'spawn')
+    
+    # Thread pool for blocking request handlers (keeps the event loop free)
+    BLOCKING_POOL_WORKERS = int(os.environ.get('BLOCKING_POOL_WORKERS', 8))  # handlers running at once
+    BLOCKING_POOL_MAX_QUEUED = int(os.environ.get('BLOCKING_POOL_MAX_QUEUED', 32))  # waiting handlers before 503
+    
+    # Background jobs (POST /jobs/backtest, polled with GET /jobs/{job_id})
+    JOB_WORKERS = int(os.environ.get('JOB_WORKERS', 2))  # jobs running at once
+    JOB_MAX_ACTIVE_PER_CLIENT = int(os.environ.get('JOB_MAX_ACTIVE_PER_CLIENT', 2))  # queued + running jobs per client
+    JOB_RESULT_TTL = int(os.environ.get('JOB_RESULT_TTL', 900))  # seconds finished jobs and their results are kept
+    
+    # Watchlist scans (POST /scan)
+    SCAN_MAX_SYMBOLS = int(os.environ.get('SCAN_MAX_SYMBOLS', 500))  # symbols per scan request
+    SCAN_MAX_CONCURRENCY = int(os.environ.get('SCAN_MAX_CONCURRENCY', 8))  # symbols downloaded/analyzed at once per scan
+    
+    # Streaming analysis (POST /analyze/stream): bars detected per partition before its hits are sent
+    ANALYZE_STREAM_PARTITION_ROWS = int(os.environ.get('ANALYZE_STREAM_PARTITION_ROWS', 5000))
+    
+    # Live detection (WebSocket /ws/live) replays recorded bars from {LIVE_REPLAY_DIR}/{SYMBOL}_{interval}.csv
+    LIVE_REPLAY_DIR = os.environ.get('LIVE_REPLAY_DIR') or os.path.join(os.path.expanduser('~'), '.cache', 'tradinghub', 'replay')
+    LIVE_REPLAY_DELAY = float(os.environ.get('LIVE_REPLAY_DELAY', 1.0))  # seconds between replayed bars
+    
+    # Async Yahoo downloads (pooled aiohttp session)
+    ASYNC_FETCH_LIMIT_PER_HOST = int(os.environ.get('ASYNC_FETCH_LIMIT_PER_HOST', 8))  # concurrent connections to Yahoo
+    ASYNC_FETCH_TIMEOUT = float(os.environ.get('ASYNC_FETCH_TIMEOUT', 30))  # seconds per request
+    ASYNC_FETCH_MAX_ATTEMPTS = int(os.environ.get('ASYNC_FETCH_MAX_ATTEMPTS', 3))  # tries per request, with backoff
+    
     # Cache configuration
     CACHE_TTL = int(os.environ.get('CACHE_TTL', 300))  # cache TTL in seconds (5 minutes)
+    CACHE_MAX_BYTES = int(os.environ.get('CACHE_MAX_BYTES', 256 * 1024 * 1024))  # memory budget for downloaded bars
+    FEATURE_CACHE_MAX_BYTES = int(os.environ.get('FEATURE_CACHE_MAX_BYTES', 256 * 1024 * 1024))  # memory budget for candle features
+    
+    # On-disk bar store (downloaded history survives restarts and is shared by workers)
+    BAR_STORE_ENABLED = os.environ.get('BAR_STORE_ENABLED', 'true').lower() == 'true'
+    BAR_STORE_DIR = os.environ.get('BAR_STORE_DIR') or os.path.join(os.path.expanduser('~'), '.cache', 'tradinghub', 'bars')
 
 
 class DevelopmentConfig(Config):
@@ -1,14 +1,16 @@
-from typing import Dict, Any, Tuple
+import time
+from typing import Dict, Any, AsyncIterator, Awaitable, Callable, Tuple
 from tradinghub.backend.shared.models.dto.pattern_params import PatternParams, AnalysisRequest
 from tradinghub.backend.shared.services.stock_service import StockService
+from tradinghub.backend.shared.pattern_config.pattern_registry import PatternRegistry
 from tradinghub.backend.shared.utils.data_utils import parse_pattern_params, normalize_request_params
 
 
 class AnalyzeController:
     """Main controller that runs analysis for ANY pattern via StockService"""
 
-    def __init__(self):
-        self.stock_service = StockService()
+    def __init__(self, stock_service: StockService = None):
+        self.stock_service = stock_service or StockService()
 
     def analyze(self, data: Dict[str, Any]) -> Tuple[Any, int]:
         """
@@ -39,11 +41,234 @@ class AnalyzeController:
 
             # Delegate detection to StockService/PatternRegistry
             result = self.stock_service.analyze_stock(request_obj)
+            if data.get('response_format') == 'columnar':
+                return result.to_columns(), 200
             return result.to_dict(), 200
 
         except Exception as exc:
             return {"error": str(exc)}, 400
 
+    def analyze_stream(self, data: Dict[str, Any], run_blocking: Callable[..., Awaitable[Any]] = None) -> Tuple[Any, int]:
+        """
+        Run pattern analysis over time-ordered partitions of the data.
+
+        Args:
+            data: Request JSON payload from the client
+            run_blocking: Awaitable runner for the detection work
+
+        Returns:
+            Tuple of (async iterator of per-partition result dicts, 200), or
+            (error dict, 400) if the request is invalid
+        """
+        try:
+            symbol, days, interval = normalize_request_params(data)
+            pattern_type = data.get('pattern_type', 'hammer')
+            PatternRegistry.get_pattern_class(pattern_type)  # fail fast on unknown patterns
+
+            request_obj = AnalysisRequest(
+                symbol=symbol,
+                days=days,
+                interval=interval,
+                pattern_type=pattern_type,
+                pattern_params=parse_pattern_params(data),
+            )
+            return self._stream_analysis(request_obj, data.get('response_format'), run_blocking), 200
+
+        except Exception as exc:
+            return {"error": str(exc)}, 400
+
+    async def _stream_analysis(self, request, response_format, run_blocking) -> AsyncIterator[Dict[str, Any]]:
+        """Yield the patterns of each partition as it is analyzed, then a summary"""
+        started = time.perf_counter()
+        count = 0
+        partitions = 0
+        results = self.stock_service.analyze_stream(
+            request,
+            run_blocking=run_blocking,
+            partition_rows=self.stock_service.config.ANALYZE_STREAM_PARTITION_ROWS,
+        )
+        try:
+            async for result, rows_done, rows_total in results:
+                count += result.count
+                partitions += 1
+                chunk = result.to_columns() if response_format == 'columnar' else result.to_dict()
+                yield {**chunk, "rows_done": rows_done, "rows_total": rows_total}
+        except Exception as exc:
+            # The 200 status is already sent; report the failure in the stream
+            yield {"error": str(exc)}
+            return
+        yield {
+            "done": True,
+            "count": count,
+            "partitions": partitions,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+        }
+
+    def analyze_multi(self, data: Dict[str, Any]) -> Tuple[Any, int]:
+        """
+        Run analysis for several patterns over a single data download.
+
+        Args:
+            data: Request JSON payload with symbol/days/interval and a 'patterns'
+                list, each entry holding a pattern_type and its parameters
+
+        Returns:
+            Tuple of (JSON response as dict, HTTP status code)
+        """
+        try:
+            symbol, days, interval = normalize_request_params(data)
+            pattern_entries = data.get('patterns') or []
+            if not pattern_entries:
+                return {"error": "No patterns requested"}, 400
+
+            requests = [
+                AnalysisRequest(
+                    symbol=symbol,
+                    days=days,
+                    interval=interval,
+                    pattern_type=entry.get('pattern_type', 'hammer'),
+                    pattern_params=parse_pattern_params(entry),
+                )
+                for entry in pattern_entries
+            ]
+
+            results = self.stock_service.analyze_stock_multi(requests)
+            return {
+                "symbol": symbol,
+                "days": days,
+                "interval": interval,
+                "results": [
+                    {"pattern_type": request.pattern_type, **result.to_dict()}
+                    for request, result in zip(requests, results)
+                ],
+            }, 200
+
+        except Exception as exc:
+            return {"error": str(exc)}, 400
+
+    def scan(self, data: Dict[str, Any], run_blocking: Callable[..., Awaitable[Any]] = None) -> Tuple[Any, int]:
+        """
+        Scan a watchlist of symbols for one pattern.
+
+        Args:
+            data: Request JSON payload with a 'symbols' list, days/interval,
+                pattern_type and pattern parameters
+            run_blocking: Awaitable runner for the detection work
+
+        Returns:
+            Tuple of (async iterator of per-symbol result dicts, 200), or
+            (error dict, 400) if the request is invalid
+        """
+        try:
+            _, days, interval = normalize_request_params(data)
+            pattern_type = data.get('pattern_type', 'hammer')
+            PatternRegistry.get_pattern_class(pattern_type)  # fail fast on unknown patterns
+            params = parse_pattern_params(data)
+
+            # Upper-case and de-duplicate, keeping the watchlist order
+            symbols = list(dict.fromkeys(
+                str(symbol).strip().upper() for symbol in data.get('symbols') or [] if str(symbol).strip()
+            ))
+            if not symbols:
+                return {"error": "No symbols requested"}, 400
+            max_symbols = self.stock_service.config.SCAN_MAX_SYMBOLS
+            if len(symbols) > max_symbols:
+                return {"error": f"Scan of {len(symbols)} symbols exceeds the limit of {max_symbols}"}, 400
+
+            requests = [
+                AnalysisRequest(
+                    symbol=symbol,
+                    days=days,
+                    interval=interval,
+                    pattern_type=pattern_type,
+                    pattern_params=params,
+                )
+                for symbol in symbols
+            ]
+            return self._stream_scan(requests, run_blocking), 200
+
+        except Exception as exc:
+            return {"error": str(exc)}, 400
+
+    async def _stream_scan(self, requests, run_blocking) -> AsyncIterator[Dict[str, Any]]:
+        """Yield one dict per symbol as it completes, then a summary"""
+        started = time.perf_counter()
+        errors = 0
+        results = self.stock_service.scan_async(
+            requests,
+            run_blocking=run_blocking,
+            max_concurrency=self.stock_service.config.SCAN_MAX_CONCURRENCY,
+        )
+        async for request, result, error in results:
+            if error is not None:
+                errors += 1
+                yield {"symbol": request.symbol, "error": str(error)}
+            else:
+                yield {"symbol": request.symbol, **result.to_dict()}
+        yield {
+            "done": True,
+            "symbols": len(requests),
+            "errors": errors,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+        }
+
+    def live(self, data: Dict[str, Any], run_blocking: Callable[..., Awaitable[Any]] = None) -> Tuple[Any, int]:
+        """
+        Subscribe to live detection of several patterns for one symbol and interval.
+
+        Args:
+            data: Subscription payload with symbol/interval and a 'patterns'
+                list, each entry holding a pattern_type and its parameters
+            run_blocking: Awaitable runner for the per-bar detection
+
+        Returns:
+            Tuple of (async iterator of message dicts, 200), or (error dict, 400)
+            if the subscription is invalid
+        """
+        try:
+            symbol, days, interval = normalize_request_params(data)
+            pattern_entries = data.get('patterns') or []
+            if not pattern_entries:
+                return {"error": "No patterns requested"}, 400
+
+            requests = []
+            for entry in pattern_entries:
+                pattern_type = entry.get('pattern_type', 'hammer')
+                PatternRegistry.get_pattern_class(pattern_type)  # fail fast on unknown patterns
+                requests.append(AnalysisRequest(
+                    symbol=symbol,
+                    days=days,
+                    interval=interval,
+                    pattern_type=pattern_type,
+                    pattern_params=parse_pattern_params(entry),
+                ))
+            return self._stream_live(requests, run_blocking), 200
+
+        except Exception as exc:
+            return {"error": str(exc)}, 400
+
+    async def _stream_live(self, requests, run_blocking) -> AsyncIterator[Dict[str, Any]]:
+        """Yield a message per pattern hit as bars arrive, then a summary when the feed ends"""
+        yield {
+            "type": "subscribed",
+            "symbol": requests[0].symbol,
+            "interval": requests[0].interval,
+            "patterns": [request.pattern_type for request in requests],
+        }
+        bars = 0
+        hits = 0
+        try:
+            async for _, bar_hits in self.stock_service.live_detection(requests, run_blocking=run_blocking):
+                bars += 1
+                for request, result in bar_hits:
+                    for pattern in result.to_dict()['patterns']:
+                        hits += 1
+                        yield {"type": "pattern", "pattern_type": request.pattern_type, **pattern}
+        except Exception as exc:
+            yield {"type": "error", "error": str(exc)}
+            return
+        yield {"type": "end", "bars": bars, "hits": hits}
+
     def get_available_patterns(self):
         """Kept for compatibility; StockService/PatternRegistry defines capabilities."""
         # Could be enhanced to reflect registry dynamically if needed
@@ -1,27 +1,33 @@
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, Callable, Optional, Tuple
 import logging
 from tradinghub.backend.shared.models.dto.backtest_params import BacktestParams
 from tradinghub.backend.shared.models.dto.pattern_params import PatternParams
 from tradinghub.backend.shared.services.backtest_service import BacktestService
+from tradinghub.backend.shared.utils.job_queue import Job, JobCancelledError
 from tradinghub.backend.shared.utils.data_utils import (
     parse_pattern_params,
     parse_backtest_params,
     normalize_patterns_payload,
     normalize_request_params,
+    parse_exit_grid,
+    parse_pattern_grid,
+    SWEEP_EXIT_PARAMS,
 )
 
 class BacktestController:
     """Controller for handling backtest requests"""
     
-    def __init__(self):
-        self.backtest_service = BacktestService()
+    def __init__(self, backtest_service: BacktestService = None):
+        self.backtest_service = backtest_service or BacktestService()
 
-    def run_backtest(self, data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
+    def run_backtest(self, data: Dict[str, Any],
+                     progress: Optional[Callable[[float, str], None]] = None) -> Tuple[Dict[str, Any], int]:
         """
         Handle backtest request
         
         Args:
             data: Request data containing backtest parameters
+            progress: Optional callback(fraction done, stage), see BacktestService.run_backtest
             
         Returns:
             Tuple containing response data and HTTP status code
@@ -48,6 +54,8 @@ class BacktestController:
 
             pattern_type = data.get('pattern_type', 'hammer')
             position_type = data.get('position_type', 'long')
+            pattern_source = data.get('pattern_source') or 'client'
+            response_format = data.get('response_format') or 'rows'
             
             # Run backtest
             results = self.backtest_service.run_backtest(
@@ -58,10 +66,84 @@ class BacktestController:
                 backtest_params=backtest_params,
                 patterns=patterns,
                 pattern_type=pattern_type,
-                position_type=position_type
+                position_type=position_type,
+                pattern_source=pattern_source,
+                response_format=response_format,
+                progress=progress
             )
             return results, 200
             
+        except JobCancelledError:
+            raise
+        except ValueError as e:
+            logging.exception("BacktestController ValueError: %s", e)
+            return {'error': str(e)}, 400
+        except Exception as e:
+            logging.exception("BacktestController Exception: %s", e)
+            return {'error': str(e)}, 500
+
+    def run_backtest_job(self, job: Job, data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
+        """
+        Run a backtest request as a background job (see JobQueue.submit)
+        
+        Args:
+            job: Job to report progress to
+            data: Request data containing backtest parameters
+            
+        Returns:
+            Tuple containing response data and HTTP status code
+        """
+        return self.run_backtest(data, progress=job.report)
+
+    def run_sweep(self, data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
+        """
+        Handle backtest parameter-sweep request
+        
+        Args:
+            data: Request data with fixed parameters, exit-parameter grids
+                (stop_loss_pct, take_profit_pct, entry_delay, max_holding_periods
+                as lists) and an optional pattern_grid
+            
+        Returns:
+            Tuple containing response data and HTTP status code
+        """
+        try:
+            # Grids are lists; everything else is parsed as fixed parameters
+            exit_grid = parse_exit_grid(data)
+            pattern_grid = parse_pattern_grid(data)
+            fixed_data = {k: v for k, v in data.items() if k not in SWEEP_EXIT_PARAMS}
+            pattern_params = parse_pattern_params(fixed_data)
+            backtest_params = parse_backtest_params(fixed_data)
+
+            # Normalize request basics
+            symbol, days, interval = normalize_request_params(data)
+            pattern_type = data.get('pattern_type', 'hammer')
+            position_type = data.get('position_type', 'long')
+            logging.info(
+                "BacktestController: sweep pattern_type=%s position_type=%s pattern_grid=%s",
+                pattern_type, position_type, list(pattern_grid.keys())
+            )
+
+            results = self.backtest_service.run_sweep(
+                symbol=symbol,
+                days=days,
+                interval=interval,
+                pattern_params=pattern_params,
+                pattern_grid=pattern_grid,
+                backtest_params=backtest_params,
+                exit_grid=exit_grid,
+                pattern_type=pattern_type,
+                position_type=position_type
+            )
+            results.update({
+                'symbol': symbol,
+                'days': days,
+                'interval': interval,
+                'pattern_type': pattern_type,
+                'position_type': position_type,
+            })
+            return results, 200
+
         except ValueError as e:
             logging.exception("BacktestController ValueError: %s", e)
             return {'error': str(e)}, 400
@@ -1,4 +1,4 @@
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union
 from pydantic import BaseModel, Field, ConfigDict
 
 
@@ -13,11 +13,44 @@ class AnalyzeRequestModel(BaseModel):
 
 class AnalysisResponseModel(BaseModel):
     count: int
-    patterns: List[Dict[str, Any]]
+    patterns: Union[List[Dict[str, Any]], Dict[str, Any]]  # rows, or a columnar table
 
     model_config = ConfigDict(extra='allow')
 
 
+class PatternScanModel(BaseModel):
+    pattern_type: str = Field(default='hammer')
+
+    model_config = ConfigDict(extra='allow')  # allow pattern-specific params
+
+
+class MultiAnalyzeRequestModel(BaseModel):
+    symbol: str = Field(default='AAPL')
+    days: int = Field(default=50, ge=1, le=3650)
+    interval: str = Field(default='5m')
+    patterns: List[PatternScanModel] = Field(min_length=1)
+
+
+class ScanRequestModel(BaseModel):
+    symbols: List[str] = Field(min_length=1)
+    days: int = Field(default=50, ge=1, le=3650)
+    interval: str = Field(default='5m')
+    pattern_type: str = Field(default='hammer')
+
+    model_config = ConfigDict(extra='allow')  # allow pattern-specific params
+
+
+class PatternScanResultModel(AnalysisResponseModel):
+    pattern_type: str
+
+
+class MultiAnalysisResponseModel(BaseModel):
+    symbol: str
+    days: int
+    interval: str
+    results: List[PatternScanResultModel]
+
+
 class BacktestRequestModel(BaseModel):
     symbol: str = Field(default='AAPL')
     days: int = Field(default=50, ge=1, le=3650)
@@ -25,8 +58,9 @@ class BacktestRequestModel(BaseModel):
     pattern_type: str = Field(default='hammer')
     position_type: str = Field(default='long')  # 'long' | 'short'
 
-    # patterns found by analyze to backtest
+    # patterns found by analyze to backtest ('client'), or detect them again on the server ('server')
     patterns: List[Dict[str, Any]] = Field(default_factory=list)
+    pattern_source: str = Field(default='client')  # 'client' | 'server'
 
     # backtest params
     stop_loss_pct: float = 0.02
@@ -36,10 +70,47 @@ class BacktestRequestModel(BaseModel):
     initial_portfolio_size: float = 10000
     commission: float = 0.65
     slippage: float = 0.1
+    simulation_mode: str = Field(default='vectorized')  # 'vectorized' | 'bar'
 
     model_config = ConfigDict(extra='allow')  # allow pattern-specific params
 
 
+class BacktestSweepRequestModel(BaseModel):
+    symbol: str = Field(default='AAPL')
+    days: int = Field(default=50, ge=1, le=3650)
+    interval: str = Field(default='5m')
+    pattern_type: str = Field(default='hammer')
+    position_type: str = Field(default='long')  # 'long' | 'short'
+
+    # exit-parameter grids (every combination is evaluated)
+    stop_loss_pct: List[float] = Field(default_factory=lambda: [0.02], min_length=1)
+    take_profit_pct: List[float] = Field(default_factory=lambda: [0.04], min_length=1)
+    entry_delay: List[int] = Field(default_factory=lambda: [1], min_length=1)
+    max_holding_periods: List[int] = Field(default_factory=lambda: [20], min_length=1)
+
+    # pattern-parameter grid, e.g. {"body_size_ratio": [0.2, 0.3]}
+    pattern_grid: Dict[str, List[Any]] = Field(default_factory=dict)
+
+    # fixed backtest params
+    initial_portfolio_size: float = 10000
+    commission: float = 0.65
+    slippage: float = 0.1
+    simulation_mode: str = Field(default='vectorized')  # 'vectorized' | 'bar'
+
+    model_config = ConfigDict(extra='allow')  # allow fixed pattern params
+
+
+class BacktestSweepResponseModel(BaseModel):
+    symbol: str
+    days: int
+    interval: str
+    pattern_type: str
+    position_type: str
+    grid_size: int
+    columns: List[str]
+    rows: List[List[Any]]
+
+
 class BacktestResponseModel(BaseModel):
     total_trades: int
     winning_trades: int
@@ -50,9 +121,10 @@ class BacktestResponseModel(BaseModel):
     total_profit_pct: float
     initial_portfolio_value: float
     final_portfolio_value: float
-    portfolio_history: List[Dict[str, Any]]
-    trades: List[Dict[str, Any]]
-    stock_data: Optional[List[Dict[str, Any]]] = None
+    # rows, or columnar tables ({length, columns, time_columns}) when format is 'columnar'
+    portfolio_history: Union[List[Dict[str, Any]], Dict[str, Any]]
+    trades: Union[List[Dict[str, Any]], Dict[str, Any]]
+    stock_data: Optional[Union[List[Dict[str, Any]], Dict[str, Any]]] = None
 
     model_config = ConfigDict(extra='allow')
 
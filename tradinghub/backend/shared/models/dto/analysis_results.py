@@ -1,36 +1,86 @@
 from dataclasses import dataclass
-from datetime import datetime
 from typing import List
+import pandas as pd
+from tradinghub.backend.shared.utils.time_utils import convert_index_to_display_time
 
 @dataclass
-class PatternResult:
-    """Data transfer object for a single pattern detection result"""
-    date: datetime
-    trend: str
-    open_price: float
-    high_price: float
-    low_price: float
-    close_price: float
+class PatternTable:
+    """Data transfer object for the detected patterns, as parallel columns (one row per pattern)"""
+    dates: pd.DatetimeIndex  # display wall-clock time, tz-naive
+    trend: List[str]
+    open_price: List[float]
+    high_price: List[float]
+    low_price: List[float]
+    close_price: List[float]
+
+    @classmethod
+    def empty(cls) -> 'PatternTable':
+        return cls(dates=pd.DatetimeIndex([]), trend=[],
+                   open_price=[], high_price=[], low_price=[], close_price=[])
+
+    @classmethod
+    def from_frame(cls, patterns_found: pd.DataFrame) -> 'PatternTable':
+        """Build the table from detected rows (one timezone conversion for all dates)"""
+        if 'trend' in patterns_found.columns:
+            trend = patterns_found['trend'].tolist()
+        else:
+            trend = ['unknown'] * len(patterns_found)
+        return cls(
+            dates=convert_index_to_display_time(patterns_found.index).tz_localize(None),
+            trend=trend,
+            open_price=patterns_found['Open'].to_numpy(dtype=float).tolist(),
+            high_price=patterns_found['High'].to_numpy(dtype=float).tolist(),
+            low_price=patterns_found['Low'].to_numpy(dtype=float).tolist(),
+            close_price=patterns_found['Close'].to_numpy(dtype=float).tolist()
+        )
+
+    def __len__(self):
+        return len(self.dates)
 
 @dataclass
 class AnalysisResult:
     """Data transfer object for the complete analysis results"""
     count: int
-    patterns: List[PatternResult]
-    
+    patterns: PatternTable
+
     def to_dict(self):
         """Convert the result to a dictionary for JSON serialization"""
+        patterns = self.patterns
         return {
             'count': self.count,
             'patterns': [
                 {
-                    'date': pattern.date.strftime('%Y-%m-%d %H:%M'),
-                    'trend': pattern.trend,
-                    'open': pattern.open_price,
-                    'high': pattern.high_price,
-                    'low': pattern.low_price,
-                    'close': pattern.close_price
+                    'date': date,
+                    'trend': trend,
+                    'open': open_price,
+                    'high': high_price,
+                    'low': low_price,
+                    'close': close_price
                 }
-                for pattern in self.patterns
+                for date, trend, open_price, high_price, low_price, close_price in zip(
+                    patterns.dates.strftime('%Y-%m-%d %H:%M'), patterns.trend, patterns.open_price,
+                    patterns.high_price, patterns.low_price, patterns.close_price)
             ]
-        } 
\ No newline at end of file
+        }
+
+    def to_columns(self):
+        """Convert the result to a dictionary with patterns as parallel arrays
+        (dates as wall-clock epoch seconds, rebuilt by the client)"""
+        patterns = self.patterns
+        wall_clock = patterns.dates.as_unit('ns').asi8 // 10**9
+        return {
+            'count': self.count,
+            'patterns': {
+                'length': len(patterns),
+                'columns': {
+                    'date': wall_clock.tolist(),
+                    'trend': patterns.trend,
+                    'open': patterns.open_price,
+                    'high': patterns.high_price,
+                    'low': patterns.low_price,
+                    'close': patterns.close_price
+                },
+                'time_columns': {'date': 'YYYY-MM-DD HH:MM'}
+            },
+            'format': 'columnar'
+        }
@@ -10,3 +10,4 @@ class BacktestParams:
     initial_portfolio_size: float = 10000.0  # Initial portfolio size in dollars
     commission: float = 0.65  # Commission per trade in dollars
     slippage: float = 0.1  # Slippage per trade in dollars (fixed dollar amount)
+    simulation_mode: str = 'vectorized'  # 'vectorized' (array search per trade) or 'bar' (bar-by-bar executor)
@@ -0,0 +1,165 @@
+import asyncio
+import logging
+from typing import Any, Dict, Optional, Protocol
+import aiohttp
+import numpy as np
+import pandas as pd
+from tenacity import AsyncRetrying, retry_if_exception_type, stop_after_attempt, wait_exponential_jitter
+
+logger = logging.getLogger(__name__)
+
+YAHOO_CHART_URL = 'https://query2.finance.yahoo.com/v8/finance/chart/{symbol}'
+USER_AGENT = 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36'
+
+# Request window padding around the UTC day bounds, wide enough for any exchange timezone
+_WINDOW_PADDING = pd.Timedelta(hours=14)
+
+
+class AsyncDataFetcher(Protocol):
+    async def fetch(self, symbol: str, start: str, end: str, interval: str) -> pd.DataFrame:
+        ...
+
+
+class RetryableStatusError(Exception):
+    """Yahoo answered with a status worth retrying (rate limit or server error)"""
+
+
+class AsyncYahooFetcher:
+    """
+    Fetch bars from the Yahoo Finance chart API with aiohttp
+
+    One pooled ``ClientSession`` is reused for every request, with at most
+    ``limit_per_host`` concurrent connections to Yahoo. Connection errors,
+    timeouts, 429 and 5xx answers are retried with exponential backoff.
+    The returned frame has the same shape as ``yf.Ticker.history`` (adjusted
+    OHLC, Volume, Dividends, Stock Splits; index in the exchange timezone).
+    """
+
+    def __init__(self, limit_per_host: int = 8, timeout: float = 30, max_attempts: int = 3):
+        self.limit_per_host = limit_per_host
+        self.timeout = timeout
+        self.max_attempts = max_attempts
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def fetch(self, symbol: str, start: str, end: str, interval: str) -> pd.DataFrame:
+        params = {
+            'period1': int((pd.Timestamp(start, tz='UTC') - _WINDOW_PADDING).timestamp()),
+            'period2': int((pd.Timestamp(end, tz='UTC') + _WINDOW_PADDING).timestamp()),
+            'interval': interval,
+            'includePrePost': 'false',
+            'events': 'div,splits',
+        }
+        retrying = AsyncRetrying(
+            stop=stop_after_attempt(self.max_attempts),
+            wait=wait_exponential_jitter(initial=0.5, max=8),
+            retry=retry_if_exception_type((aiohttp.ClientConnectionError, aiohttp.ClientPayloadError,
+                                           asyncio.TimeoutError, RetryableStatusError)),
+            reraise=True,
+        )
+        async for attempt in retrying:
+            with attempt:
+                if attempt.retry_state.attempt_number > 1:
+                    logger.warning(f"Retrying {symbol} download (attempt {attempt.retry_state.attempt_number})")
+                chart = await self._get_chart(symbol, params)
+        return _parse_chart(chart, start, end, interval)
+
+    async def close(self):
+        """Close the pooled HTTP session"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def _get_chart(self, symbol: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        session = self._get_session()
+        async with session.get(YAHOO_CHART_URL.format(symbol=symbol), params=params) as response:
+            if response.status == 429 or response.status >= 500:
+                raise RetryableStatusError(f"Yahoo returned {response.status} for {symbol}")
+            try:
+                body = await response.json(content_type=None)
+            except ValueError:
+                raise ValueError(f"Yahoo returned an invalid response ({response.status}) for {symbol}")
+        chart = body.get('chart') or {}
+        if chart.get('error'):
+            # Unknown symbol or a range the interval does not support; yfinance returns no rows here too
+            logger.warning(f"No data for {symbol}: {chart['error'].get('description')}")
+            return None
+        return (chart.get('result') or [None])[0]
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            # Sessions are bound to the loop they were created on
+            connector = aiohttp.TCPConnector(limit_per_host=self.limit_per_host, ttl_dns_cache=300)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers={'User-Agent': USER_AGENT},
+            )
+            self._session_loop = loop
+        return self._session
+
+
+def _parse_chart(result: Optional[Dict[str, Any]], start: str, end: str, interval: str) -> pd.DataFrame:
+    """Convert a chart API result into a yfinance-style history frame limited to [start, end)"""
+    intraday = interval[-1] in ('m', 'h')
+    timezone = ((result or {}).get('meta') or {}).get('exchangeTimezoneName') or 'UTC'
+    timestamps = (result or {}).get('timestamp')
+    if not timestamps:
+        return _empty_frame(timezone, intraday)
+
+    quote = result['indicators']['quote'][0]
+    df = pd.DataFrame(
+        {column: _to_array(quote.get(column.lower()), len(timestamps))
+         for column in ('Open', 'High', 'Low', 'Close', 'Volume')},
+        index=pd.to_datetime(timestamps, unit='s', utc=True).tz_convert(timezone),
+    )
+    adjclose = result['indicators'].get('adjclose')
+    if adjclose:
+        df['Adj Close'] = _to_array(adjclose[0].get('adjclose'), len(timestamps))
+    if not intraday:
+        df.index = pd.to_datetime(df.index.date).tz_localize(timezone, ambiguous=True, nonexistent='shift_forward')
+    df = df.sort_index()
+    df = df[~df.index.duplicated(keep='first')]
+
+    if 'Adj Close' in df.columns:
+        # Adjust OHLC for splits and dividends, as yfinance does with auto_adjust
+        ratio = (df['Adj Close'] / df['Close']).to_numpy()
+        for column in ('Open', 'High', 'Low'):
+            df[column] = df[column] * ratio
+        df['Close'] = df.pop('Adj Close')
+
+    events = result.get('events') or {}
+    df['Dividends'] = _event_column(df.index, events.get('dividends'), lambda event: event['amount'])
+    df['Stock Splits'] = _event_column(df.index, events.get('splits'),
+                                       lambda event: event['numerator'] / event['denominator'])
+
+    window = (df.index >= pd.Timestamp(start, tz=timezone)) & (df.index < pd.Timestamp(end, tz=timezone))
+    df = df[window]
+    empty_rows = (df.isna() | (df == 0)).all(axis=1)
+    df = df[~empty_rows].assign(Volume=lambda frame: frame['Volume'].fillna(0).astype(np.int64))
+    df.index.name = 'Datetime' if intraday else 'Date'
+    return df
+
+
+def _to_array(values, length: int) -> np.ndarray:
+    return np.array(values if values is not None else [None] * length, dtype=float)
+
+
+def _event_column(index: pd.DatetimeIndex, events: Optional[Dict[str, Dict[str, Any]]], value) -> np.ndarray:
+    """Place each dividend/split event on the bar whose period contains it"""
+    column = np.zeros(len(index))
+    for event in (events or {}).values():
+        position = index.searchsorted(pd.Timestamp(event['date'], unit='s', tz='UTC'), side='right') - 1
+        if position >= 0:
+            column[position] = value(event)
+    return column
+
+
+def _empty_frame(timezone: str, intraday: bool) -> pd.DataFrame:
+    index = pd.DatetimeIndex([], tz=timezone, name='Datetime' if intraday else 'Date')
+    return pd.DataFrame({
+        'Open': pd.Series(dtype=float), 'High': pd.Series(dtype=float), 'Low': pd.Series(dtype=float),
+        'Close': pd.Series(dtype=float), 'Volume': pd.Series(dtype=np.int64),
+        'Dividends': pd.Series(dtype=float), 'Stock Splits': pd.Series(dtype=float),
+    }, index=index)
@@ -1,21 +1,81 @@
-from typing import Dict, Any, List, Type
+from typing import Dict, Any, Callable, List, Optional, Tuple, Type
+from dataclasses import dataclass, replace
+import itertools
 import logging
+import math
+import numpy as np
 import pandas as pd
 from ..models.dto.backtest_params import BacktestParams
 from ..models.dto.pattern_params import PatternParams
-from tradinghub.backend.shared.utils.time_utils import normalize_series_to_israel_naive
+from tradinghub.backend.shared.utils.time_utils import normalize_series_to_display_naive
 from tradinghub.backend.shared.backtest.base_backtest import BaseBacktest
 from tradinghub.backend.single_candle.backtest.hammer_backtest import HammerBacktest
 from .stock_service import StockService
+from .task_executor import TaskExecutor, get_task_executor
 from tradinghub.backend.shared.pattern_config.pattern_registry import PatternRegistry
-from tradinghub.backend.shared.utils.data_utils import format_stock_data, serialize_datetime_fields
+from tradinghub.backend.shared.utils.data_utils import (
+    format_stock_data,
+    format_stock_data_columns,
+    records_to_columns,
+    parse_pattern_params,
+    SWEEP_EXIT_PARAMS,
+)
+from tradinghub.backend.shared.config import Config
+
+SWEEP_METRICS = ['total_trades', 'winning_trades', 'losing_trades', 'win_rate', 'profit_factor',
+                 'average_profit', 'total_profit_pct', 'final_portfolio_value']
+
+_sweep_backtesters = {}  # Backtesters of this process (also used inside worker processes)
+
+
+@dataclass
+class SweepUnit:
+    """One pattern-parameter set and a chunk of exit-parameter combinations of a sweep"""
+    pattern_type: str
+    position_type: str
+    pattern_values: Tuple[Any, ...]
+    pattern_params: Dict[str, Any]
+    backtest_params: BacktestParams
+    exit_names: List[str]
+    exit_points: List[Tuple[Any, ...]]
+
+
+def run_sweep_unit(features: pd.DataFrame, unit: SweepUnit) -> List[List[Any]]:
+    """
+    Detect patterns once and simulate every exit combination of a sweep unit (a TaskExecutor unit)
+    
+    Args:
+        features: Bars plus candle features; only a shallow view of it is modified
+        unit: Pattern parameters and exit combinations to evaluate
+        
+    Returns:
+        List of table rows: pattern values, exit values, then SWEEP_METRICS
+    """
+    cache_key = f"{unit.pattern_type}_{unit.position_type}"
+    if cache_key not in _sweep_backtesters:
+        backtester = PatternRegistry.get_backtest_class(unit.pattern_type)()
+        backtester.position_type = unit.position_type
+        _sweep_backtesters[cache_key] = backtester
+    backtester = _sweep_backtesters[cache_key]
+    
+    detected = backtester.pattern_detector.detect(features.copy(deep=False), unit.pattern_params)
+    rows = []
+    for exit_values in unit.exit_points:
+        point_params = replace(unit.backtest_params, **dict(zip(unit.exit_names, exit_values)))
+        trade_executor = backtester.simulate(detected, unit.pattern_params, point_params)
+        metrics = backtester.performance_analyzer.calculate_summary_metrics(trade_executor.get_trades())
+        metrics['final_portfolio_value'] = trade_executor.get_portfolio_history()[-1]['value']
+        rows.append(list(unit.pattern_values) + list(exit_values) + [metrics[name] for name in SWEEP_METRICS])
+    return rows
+
 
 class BacktestService:
     """Service for running backtests on different pattern strategies"""
     
-    def __init__(self):
-        self.stock_service = StockService()
+    def __init__(self, stock_service: StockService = None, executor: TaskExecutor = None):
+        self.stock_service = stock_service or StockService()  # Pass the app-wide service to share its caches
         self._backtesters = {}  # Cache for backtesters
+        self.executor: TaskExecutor = executor or get_task_executor()  # Runs sweep units
     
     def get_backtester(self, pattern_type: str, position_type: str = 'long') -> BaseBacktest:
         """
@@ -45,68 +105,25 @@ class BacktestService:
         
         return self._backtesters[cache_key]
 
-    def _format_stock_data(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
-        return format_stock_data(df)
-
-    def _serialize_datetime_fields(self, obj: Any) -> Any:
-        """Recursively convert datetime-like objects in dict/list to ISO strings."""
-        try:
-            import datetime as _dt
-            import pandas as _pd
-        except Exception:
-            _dt = None
-            _pd = None
-        
-        if isinstance(obj, list):
-            return [self._serialize_datetime_fields(x) for x in obj]
-        if isinstance(obj, dict):
-            out = {}
-            for k, v in obj.items():
-                out[k] = self._serialize_datetime_fields(v)
-            return out
-        # pandas Timestamp
-        if 'pandas' in str(type(obj)) or (hasattr(obj, 'isoformat') and str(type(obj)).endswith("Timestamp'>")):
-            try:
-                return obj.isoformat() if hasattr(obj, 'isoformat') else str(obj)
-            except Exception:
-                return str(obj)
-        # datetime
-        if _dt and isinstance(obj, _dt.datetime):
-            try:
-                return obj.isoformat()
-            except Exception:
-                return str(obj)
-        return obj
-
-    def run_backtest(self, 
-                    symbol: str, 
-                    days: int, 
-                    interval: str,
-                    pattern_params: PatternParams,
-                    backtest_params: BacktestParams,
-                    patterns: List[Dict[str, Any]],
-                    pattern_type: str = 'hammer',
-                    position_type: str = 'long') -> Dict[str, Any]:
+    def _mark_patterns(self, symbol: str, days: int, interval: str, patterns: List[Dict[str, Any]],
+                       pattern_column: str) -> Tuple[pd.DataFrame, pd.DataFrame]:
         """
-        Run a backtest for the given parameters
+        Mark posted patterns on the bars of the dataset
         
         Args:
             symbol: Stock symbol
             days: Number of days of historical data
-            interval: Data interval (e.g., '5m', '1h')
-            pattern_params: Parameters for pattern detection
-            backtest_params: Parameters for backtesting
-            patterns: List of pattern data to backtest
-            pattern_type: Type of pattern to backtest (default: 'hammer')
+            interval: Data interval
+            patterns: Patterns found by analyze (each with a 'date')
+            pattern_column: Name of the signal column to add
             
         Returns:
-            Dictionary containing backtest results
+            Tuple of (bars, shallow copy of the bars indexed in display time with the pattern column)
         """
-        logging.info("BacktestService: start run_backtest pattern_type=%s position_type=%s patterns=%d", pattern_type, position_type, len(patterns))
-        # Get historical data
-        df = self.stock_service.download_stock_data(symbol, days, interval)
+        # Get historical data (loaded once; also used for the chart)
+        bars = self.stock_service.download_stock_data(symbol, days, interval)
         
-        if df.empty:
+        if bars.empty:
             raise ValueError('No data available for the specified parameters')
         
         if not patterns:
@@ -121,39 +138,121 @@ class BacktestService:
         # Convert date strings to datetime objects
         patterns_df['date'] = pd.to_datetime(patterns_df['date'], errors='raise')
         
-        # Robust timezone normalization: align both to naive timestamps in Israel time
-        patterns_df['date'] = normalize_series_to_israel_naive(patterns_df['date'])
-        df.index = normalize_series_to_israel_naive(df.index)
+        # Robust timezone normalization: align both to naive timestamps in display time
+        # (on a shallow copy, so the bars keep their exchange-time index for the chart)
+        patterns_df['date'] = normalize_series_to_display_naive(patterns_df['date'])
+        df = bars.copy(deep=False)
+        df.index = normalize_series_to_display_naive(df.index)
         
-        # Create a list of pattern dates for matching
-        pattern_dates = patterns_df['date'].tolist()
+        # Mark patterns in the main dataframe (closest bar of each pattern date, in one lookup)
+        pattern_positions = df.index.get_indexer(pd.DatetimeIndex(patterns_df['date']), method='nearest')
+        pattern_signals = np.zeros(len(df), dtype=bool)
+        pattern_signals[pattern_positions] = True
+        df[pattern_column] = pattern_signals
+        return bars, df
+    
+    def _detect_patterns(self, symbol: str, days: int, interval: str, pattern_params: PatternParams,
+                         backtester: BaseBacktest) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Detect patterns server-side on the cached feature frame of the dataset
+        
+        Args:
+            symbol: Stock symbol
+            days: Number of days of historical data
+            interval: Data interval
+            pattern_params: Parameters for pattern detection
+            backtester: Backtester whose detector adds the pattern column
+            
+        Returns:
+            Tuple of (bars with features, detected frame indexed in display time)
+        """
+        bars = self.stock_service.get_feature_frame(symbol, days, interval, [pattern_params.ma_period])
+        
+        if bars.empty:
+            raise ValueError('No data available for the specified parameters')
+        
+        df = backtester.pattern_detector.detect(bars.copy(deep=False), pattern_params.__dict__)
+        df.index = normalize_series_to_display_naive(df.index)
+        return bars, df
+    
+    def _get_window_mask(self, positions: np.ndarray, lookback: int, length: int) -> np.ndarray:
+        """
+        Mark every row within lookback rows of any of the given positions
+        
+        Each window adds +1 at its first row and -1 after its last; the running
+        sum is positive exactly on the union of the windows.
+        
+        Args:
+            positions: Row positions of the patterns
+            lookback: Rows to include before and after each position
+            length: Number of rows
+            
+        Returns:
+            Boolean mask of the rows to keep
+        """
+        events = np.zeros(length + 1, dtype=np.int64)
+        np.add.at(events, np.maximum(positions - lookback, 0), 1)
+        np.add.at(events, np.minimum(positions + lookback + 1, length), -1)
+        return np.cumsum(events[:-1]) > 0
+    
+    def _format_stock_data(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
+        return format_stock_data(df)
+
+    def run_backtest(self, 
+                    symbol: str, 
+                    days: int, 
+                    interval: str,
+                    pattern_params: PatternParams,
+                    backtest_params: BacktestParams,
+                    patterns: List[Dict[str, Any]],
+                    pattern_type: str = 'hammer',
+                    position_type: str = 'long',
+                    pattern_source: str = 'client',
+                    response_format: str = 'rows',
+                    progress: Optional[Callable[[float, str], None]] = None) -> Dict[str, Any]:
+        """
+        Run a backtest for the given parameters
         
+        Args:
+            symbol: Stock symbol
+            days: Number of days of historical data
+            interval: Data interval (e.g., '5m', '1h')
+            pattern_params: Parameters for pattern detection
+            backtest_params: Parameters for backtesting
+            patterns: List of pattern data to backtest (ignored when pattern_source is 'server')
+            pattern_type: Type of pattern to backtest (default: 'hammer')
+            pattern_source: 'client' to backtest the posted patterns, 'server' to
+                detect them again on the cached feature frame
+            response_format: 'rows' for lists of dicts, 'columnar' for parallel
+                arrays in stock_data, trades and portfolio_history
+            progress: Optional callback(fraction done, stage) called between stages
+                and periodically during the simulation (e.g. Job.report, which
+                also stops cancelled jobs)
+            
+        Returns:
+            Dictionary containing backtest results
+        """
+        progress = progress or (lambda fraction, stage: None)
+        logging.info("BacktestService: start run_backtest pattern_type=%s position_type=%s pattern_source=%s patterns=%d", pattern_type, position_type, pattern_source, len(patterns))
         # Get the appropriate backtester
         backtester = self.get_backtester(pattern_type, position_type)
         logging.info("BacktestService: obtained backtester=%s detector=%s", type(backtester).__name__, type(backtester.pattern_detector).__name__)
-        
-        # Mark patterns in the main dataframe
         pattern_column = backtester.pattern_detector.get_pattern_column_name()
-        df[pattern_column] = False
-        for date in pattern_dates:
-            # Find the closest date in the dataframe
-            closest_idx = df.index[df.index.get_indexer([date], method='nearest')[0]]
-            df.loc[closest_idx, pattern_column] = True
+        
+        # Bars for the chart, and a frame indexed in display time holding the pattern column
+        progress(0.1, 'Loading data and patterns')
+        if pattern_source == 'server':
+            bars, df = self._detect_patterns(symbol, days, interval, pattern_params, backtester)
+        elif pattern_source == 'client':
+            bars, df = self._mark_patterns(symbol, days, interval, patterns, pattern_column)
+        else:
+            raise ValueError(f"Unknown pattern source: {pattern_source}")
+        pattern_signals = df[pattern_column].to_numpy(dtype=bool)
         
         # Filter df to only include data around pattern dates
         # Include data before and after each pattern for backtesting
         lookback = max(backtest_params.entry_delay, backtest_params.max_holding_periods)
-        pattern_indices = df[df[pattern_column]].index
-        
-        # Create a mask for rows to include
-        include_mask = pd.Series(False, index=df.index)
-        for idx in pattern_indices:
-            # Find the position of this index in the dataframe
-            pos = df.index.get_loc(idx)
-            # Include rows before and after the pattern
-            start_pos = max(0, pos - lookback)
-            end_pos = min(len(df), pos + lookback + 1)
-            include_mask.iloc[start_pos:end_pos] = True
+        include_mask = self._get_window_mask(np.flatnonzero(pattern_signals), lookback, len(df))
         
         # Apply the mask to filter the dataframe
         df = df[include_mask]
@@ -161,8 +260,12 @@ class BacktestService:
         if df.empty:
             raise ValueError('No matching data found for the provided patterns')
         
-        # Run backtest
-        results = backtester.run_backtest(df, pattern_params.__dict__, backtest_params)
+        # Run backtest (simulation progress fills 0.4..0.9)
+        progress(0.4, 'Simulating trades')
+        results = backtester.run_backtest(
+            df, pattern_params.__dict__, backtest_params,
+            progress=lambda fraction: progress(0.4 + 0.5 * fraction, 'Simulating trades')
+        )
         logging.info("BacktestService: backtest completed trades=%d", len(results.get('trades', [])) if isinstance(results, dict) else -1)
         
         # Ensure all required fields are present in the results
@@ -182,18 +285,98 @@ class BacktestService:
             }
         
         # Add stock data for chart visualization
-        # Use the original full dataset for chart, not the filtered backtest data
-        original_df = self.stock_service.download_stock_data(symbol, days, interval)
-        if original_df is not None and not original_df.empty:
-            results['stock_data'] = self._format_stock_data(original_df)
+        # Use the full dataset loaded above for the chart, not the filtered backtest data
+        progress(0.9, 'Formatting results')
+        if response_format == 'columnar':
+            results['stock_data'] = format_stock_data_columns(bars)
         else:
-            # Fallback to filtered data if original data not available
-            results['stock_data'] = self._format_stock_data(df)
-        
-        # Ensure JSON-serializable results (convert datetime-like fields)
-        if isinstance(results, dict):
-            if 'portfolio_history' in results:
-                results['portfolio_history'] = serialize_datetime_fields(results['portfolio_history'])
-            if 'trades' in results:
-                results['trades'] = serialize_datetime_fields(results['trades'])
+            results['stock_data'] = self._format_stock_data(bars)
+        
+        # Timestamps in portfolio_history and trades are encoded by the JSON response class
+        if response_format == 'columnar':
+            results['portfolio_history'] = records_to_columns(results['portfolio_history'])
+            results['trades'] = records_to_columns(results['trades'])
+            results['format'] = 'columnar'
         return results
+
+    def run_sweep(self,
+                  symbol: str,
+                  days: int,
+                  interval: str,
+                  pattern_params: PatternParams,
+                  pattern_grid: Dict[str, List[Any]],
+                  backtest_params: BacktestParams,
+                  exit_grid: Dict[str, List[Any]],
+                  pattern_type: str = 'hammer',
+                  position_type: str = 'long') -> Dict[str, Any]:
+        """
+        Backtest every combination of pattern and exit parameters over one dataset
+        
+        The bars and candle features are loaded once, patterns are detected once
+        per pattern-parameter combination (per unit), and every exit-parameter
+        combination is simulated over the same detected frame. Units run on the
+        task executor, in parallel when it is a process pool. Unlike
+        run_backtest, the whole dataset is simulated (not only the bars around
+        given patterns).
+        
+        Args:
+            symbol: Stock symbol
+            days: Number of days of historical data
+            interval: Data interval (e.g., '5m', '1h')
+            pattern_params: Fixed parameters for pattern detection
+            pattern_grid: Pattern parameters to sweep, {name: [values]}
+            backtest_params: Fixed parameters for backtesting (costs, portfolio size)
+            exit_grid: Exit parameters to sweep, {name: [values]} (see SWEEP_EXIT_PARAMS)
+            pattern_type: Type of pattern to backtest (default: 'hammer')
+            position_type: 'long' or 'short' position type
+            
+        Returns:
+            Dictionary with the grid size and a table of metrics (columns and rows)
+        """
+        pattern_names = list(pattern_grid.keys())
+        exit_names = list(SWEEP_EXIT_PARAMS.keys())
+        pattern_points = list(itertools.product(*(pattern_grid[name] for name in pattern_names)))
+        exit_points = list(itertools.product(*(exit_grid[name] for name in exit_names)))
+        grid_size = len(pattern_points) * len(exit_points)
+        if grid_size > Config.SWEEP_MAX_GRID_POINTS:
+            raise ValueError(f'Sweep has {grid_size} grid points, the maximum is {Config.SWEEP_MAX_GRID_POINTS}')
+        logging.info("BacktestService: start run_sweep pattern_type=%s position_type=%s grid_size=%d", pattern_type, position_type, grid_size)
+        
+        # Resolve every pattern-parameter combination (typed like a regular request)
+        pattern_param_sets = []
+        for values in pattern_points:
+            params = {**pattern_params.__dict__, **dict(zip(pattern_names, values))}
+            pattern_param_sets.append({**params, **parse_pattern_params(params).__dict__})
+        
+        # Load bars and shared candle features once
+        ma_periods = sorted({params['ma_period'] for params in pattern_param_sets})
+        features = self.stock_service.get_feature_frame(symbol, days, interval, ma_periods)
+        if features.empty:
+            raise ValueError('No data available for the specified parameters')
+        
+        self.get_backtester(pattern_type, position_type)  # Validate the pattern type up front
+        
+        # Split exit combinations so there are at least as many units as workers
+        chunk_count = min(len(exit_points), math.ceil(self.executor.max_workers / len(pattern_points)))
+        chunk_size = math.ceil(len(exit_points) / chunk_count)
+        units = [
+            SweepUnit(
+                pattern_type=pattern_type,
+                position_type=position_type,
+                pattern_values=pattern_values,
+                pattern_params=params,
+                backtest_params=backtest_params,
+                exit_names=exit_names,
+                exit_points=exit_points[start:start + chunk_size],
+            )
+            for pattern_values, params in zip(pattern_points, pattern_param_sets)
+            for start in range(0, len(exit_points), chunk_size)
+        ]
+        rows = [row for unit_rows in self.executor.map_frame(run_sweep_unit, features, units) for row in unit_rows]
+        
+        logging.info("BacktestService: sweep completed grid_size=%d", grid_size)
+        return {
+            'grid_size': grid_size,
+            'columns': pattern_names + exit_names + SWEEP_METRICS,
+            'rows': rows,
+        }
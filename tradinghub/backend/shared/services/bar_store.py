@@ -0,0 +1,261 @@
+import asyncio
+import json
+import os
+import re
+import tempfile
+import threading
+import logging
+from typing import Any, Dict, List, Optional
+import numpy as np
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to the in-process lock only
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+TIMESTAMP_FIELD = '__ts__'  # UTC nanoseconds of each bar
+ADJUSTMENT_COLUMNS = ('Dividends', 'Stock Splits')  # Events that re-adjust all earlier prices
+
+
+def adjustment_dates(df: pd.DataFrame) -> pd.DatetimeIndex:
+    """
+    Get the bars of a history frame that carry a dividend or stock split
+
+    Yahoo prices are split/dividend-adjusted as of the download, so bars
+    before such an event that were downloaded earlier are on another basis.
+
+    Args:
+        df: History frame (with Dividends/Stock Splits columns, as from yfinance)
+
+    Returns:
+        pd.DatetimeIndex: Timestamps of the bars with an event
+    """
+    columns = [column for column in ADJUSTMENT_COLUMNS if column in df.columns]
+    if not columns:
+        return df.index[:0]
+    has_event = (df[columns].fillna(0) != 0).any(axis=1).to_numpy()
+    return df.index[has_event]
+
+
+class BarStore:
+    """
+    Persistent on-disk OHLCV store
+
+    Each symbol/interval partition is a directory holding one ``bars.npy`` file
+    (a NumPy structured array sorted by timestamp, one field per column) and a
+    ``meta.json`` file with the index timezone and the date ranges that were
+    fully downloaded. Bars are read through ``np.load(mmap_mode='r')`` so only
+    the requested slice is paged in. Files are replaced atomically and writers
+    hold a per-partition file lock, so several worker processes can share one
+    store directory.
+    """
+
+    def __init__(self, root_dir: str):
+        self.root_dir = root_dir
+        self._lock = threading.Lock()
+
+    def read(self, symbol: str, start: str, end: str, interval: str) -> Optional[pd.DataFrame]:
+        """
+        Read stored bars for a date range if the whole range was downloaded before
+
+        Args:
+            symbol: Stock symbol
+            start: Start date in YYYY-MM-DD format (inclusive)
+            end: End date in YYYY-MM-DD format (exclusive)
+            interval: Data interval
+
+        Returns:
+            DataFrame with the stored bars, or None if the range is not fully covered
+        """
+        partition = self._get_partition_dir(symbol, interval)
+        meta = self._read_meta(partition)
+        if meta is None or not self._is_covered(meta['coverage'], start, end):
+            return None
+
+        bars = np.load(os.path.join(partition, 'bars.npy'), mmap_mode='r')
+        timestamps = bars[TIMESTAMP_FIELD]
+        first = np.searchsorted(timestamps, self._to_utc_ns(start, meta['timezone']), side='left')
+        last = np.searchsorted(timestamps, self._to_utc_ns(end, meta['timezone']), side='left')
+        return self._to_frame(bars[first:last], meta)
+
+    def write(self, symbol: str, start: str, end: str, interval: str, df: pd.DataFrame):
+        """
+        Merge downloaded bars into the store and record the covered date range
+
+        Only days before today (in the bars' timezone) are recorded as covered,
+        since today's bars are still being formed. If the downloaded bars carry
+        a dividend or split at or after the first stored bar, the stored bars
+        and their coverage are dropped: they were adjusted on the old basis and
+        would meet the new bars with a false price jump.
+
+        Args:
+            symbol: Stock symbol
+            start: Start date in YYYY-MM-DD format (inclusive)
+            end: End date in YYYY-MM-DD format (exclusive)
+            interval: Data interval
+            df: Downloaded bars for the range
+        """
+        if df.empty or not isinstance(df.index, pd.DatetimeIndex):
+            return
+        if not all(pd.api.types.is_numeric_dtype(dtype) for dtype in df.dtypes):
+            logger.warning(f"Not storing {symbol} {interval} bars: non-numeric columns")
+            return
+
+        covered_end = min(end, pd.Timestamp.now(tz=df.index.tz).strftime('%Y-%m-%d'))
+        partition = self._get_partition_dir(symbol, interval)
+        os.makedirs(partition, exist_ok=True)
+        with self._lock, open(os.path.join(partition, '.lock'), 'w') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            meta = self._read_meta(partition)
+            timezone = str(df.index.tz) if df.index.tz is not None else None
+            stored = None
+            if meta is not None and meta['timezone'] == timezone:
+                stored = self._to_frame(np.load(os.path.join(partition, 'bars.npy'), mmap_mode='r'), meta)
+                events = adjustment_dates(df)
+                if len(events) and len(stored) and events[-1] >= stored.index[0]:
+                    logger.info(f"Dropping stored {symbol} {interval} bars: prices re-adjusted on {events[-1]}")
+                    stored = None
+            if stored is not None:
+                df = pd.concat([stored, df])
+                df = df[~df.index.duplicated(keep='last')].sort_index()
+                coverage = meta['coverage']
+            else:
+                df = df[~df.index.duplicated(keep='last')].sort_index()
+                coverage = []
+            if start < covered_end:
+                coverage = self._merge_ranges(coverage + [[start, covered_end]])
+
+            self._atomic_save(partition, 'bars.npy', lambda f: np.save(f, self._to_records(df)))
+            meta = {
+                'timezone': timezone,
+                'index_name': df.index.name,
+                'coverage': coverage,
+            }
+            self._atomic_save(partition, 'meta.json', lambda f: f.write(json.dumps(meta).encode()))
+        logger.info(f"Stored {len(df)} {symbol} {interval} bars in {partition}")
+
+    def _get_partition_dir(self, symbol: str, interval: str) -> str:
+        safe_symbol = re.sub(r'[^A-Za-z0-9._-]', '_', symbol.upper())
+        return os.path.join(self.root_dir, safe_symbol, interval)
+
+    def _read_meta(self, partition: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(os.path.join(partition, 'meta.json')) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _is_covered(coverage: List[List[str]], start: str, end: str) -> bool:
+        return any(covered_start <= start and end <= covered_end for covered_start, covered_end in coverage)
+
+    @staticmethod
+    def _merge_ranges(ranges: List[List[str]]) -> List[List[str]]:
+        merged = []
+        for range_start, range_end in sorted(ranges):
+            if merged and range_start <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], range_end)
+            else:
+                merged.append([range_start, range_end])
+        return merged
+
+    @staticmethod
+    def _to_utc_ns(date: str, timezone: Optional[str]) -> int:
+        return pd.Timestamp(date, tz=timezone).value
+
+    @staticmethod
+    def _to_records(df: pd.DataFrame) -> np.ndarray:
+        dtype = [(TIMESTAMP_FIELD, 'i8')] + [(column, df[column].dtype.str) for column in df.columns]
+        records = np.empty(len(df), dtype=dtype)
+        records[TIMESTAMP_FIELD] = df.index.as_unit('ns').asi8
+        for column in df.columns:
+            records[column] = df[column].to_numpy()
+        return records
+
+    @staticmethod
+    def _to_frame(bars: np.ndarray, meta: Dict[str, Any]) -> pd.DataFrame:
+        index = pd.DatetimeIndex(np.array(bars[TIMESTAMP_FIELD]).view('datetime64[ns]'))
+        if meta['timezone'] is not None:
+            index = index.tz_localize('UTC').tz_convert(meta['timezone'])
+        index.name = meta['index_name']
+        columns = [name for name in bars.dtype.names if name != TIMESTAMP_FIELD]
+        return pd.DataFrame({column: np.array(bars[column]) for column in columns}, index=index)
+
+    @staticmethod
+    def _atomic_save(directory: str, filename: str, save):
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f'.{filename}.')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                save(f)
+            os.replace(tmp_path, os.path.join(directory, filename))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+
+class StoredFetcher:
+    """
+    DataFetcher that serves previously downloaded ranges from a BarStore
+
+    Ranges the store has not fully covered yet are fetched from the upstream
+    fetcher and written back to the store.
+    """
+
+    def __init__(self, store: BarStore, upstream):
+        self.store = store
+        self.upstream = upstream
+
+    def fetch(self, symbol: str, start: str, end: str, interval: str) -> pd.DataFrame:
+        try:
+            stored = self.store.read(symbol, start, end, interval)
+        except Exception as e:
+            logger.warning(f"Could not read stored {symbol} {interval} bars: {e}")
+            stored = None
+        if stored is not None:
+            logger.info(f"Loaded {len(stored)} {symbol} {interval} bars from store")
+            return stored
+
+        df = self.upstream.fetch(symbol, start, end, interval)
+        try:
+            self.store.write(symbol, start, end, interval, df)
+        except Exception as e:
+            logger.warning(f"Could not store {symbol} {interval} bars: {e}")
+        return df
+
+
+class AsyncStoredFetcher:
+    """
+    AsyncDataFetcher counterpart of StoredFetcher
+
+    Store reads are memory-mapped and cheap, so they run on the event loop;
+    writes (merge, save, file lock) run in a thread.
+    """
+
+    def __init__(self, store: BarStore, upstream):
+        self.store = store
+        self.upstream = upstream
+
+    async def fetch(self, symbol: str, start: str, end: str, interval: str) -> pd.DataFrame:
+        try:
+            stored = self.store.read(symbol, start, end, interval)
+        except Exception as e:
+            logger.warning(f"Could not read stored {symbol} {interval} bars: {e}")
+            stored = None
+        if stored is not None:
+            logger.info(f"Loaded {len(stored)} {symbol} {interval} bars from store")
+            return stored
+
+        df = await self.upstream.fetch(symbol, start, end, interval)
+        try:
+            await asyncio.to_thread(self.store.write, symbol, start, end, interval, df)
+        except Exception as e:
+            logger.warning(f"Could not store {symbol} {interval} bars: {e}")
+        return df
+
+    async def close(self):
+        """Close the upstream fetcher's HTTP session"""
+        await self.upstream.close()
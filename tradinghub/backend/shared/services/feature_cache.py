@@ -0,0 +1,67 @@
+import threading
+import logging
+from typing import Any, Dict, Iterable
+import pandas as pd
+from tradinghub.backend.shared.utils.candlestick_utils import CandlestickUtils
+from tradinghub.backend.shared.utils.lru_cache import LRUCache, frame_nbytes
+from tradinghub.backend.shared.utils.frame_utils import freeze_frame
+
+logger = logging.getLogger(__name__)
+
+
+class FeatureCache:
+    """
+    Cache of derived candle features per dataset
+
+    Keeps one read-only feature frame per dataset key (the OHLCV columns plus
+    the candlestick properties from CandlestickUtils) and extends it with
+    moving average columns the first time each MA period is requested. Callers
+    get a shallow view of the frame, so detectors add their own result columns
+    as a per-request overlay without copying the OHLC data or touching the
+    cached entry.
+    """
+
+    def __init__(self, ttl: int, max_bytes: int):
+        self._cache = LRUCache(max_bytes, ttl)
+        self._lock = threading.Lock()
+
+    def get_features(self, dataset_key: str, df: pd.DataFrame, ma_periods: Iterable[int] = ()) -> pd.DataFrame:
+        """
+        Get the feature frame for a dataset, computing it on first use
+
+        Args:
+            dataset_key: Identity of the dataset (symbol, interval and date range)
+            df: OHLCV data for the dataset, used when the features are not cached yet
+            ma_periods: Moving average periods the caller needs
+
+        Returns:
+            pd.DataFrame: Shallow view of the cached feature frame
+        """
+        with self._lock:
+            cached = self._cache.get(dataset_key)
+            if cached is None:
+                features = CandlestickUtils.calculate_properties(df.copy(deep=False))
+            else:
+                logger.info(f"Using cached features for {dataset_key}")
+                features = cached
+
+            missing_periods = [ma_period for ma_period in ma_periods if f'MA{ma_period}' not in features.columns]
+            if cached is None or missing_periods:
+                features = features.copy(deep=False)
+                for ma_period in missing_periods:
+                    CandlestickUtils.add_moving_average(features, ma_period)
+                features = freeze_frame(features)
+                self._cache.set(dataset_key, features, frame_nbytes(features))
+            return features.copy(deep=False)
+
+    def invalidate(self, dataset_key: str):
+        """Drop the features of a dataset (e.g. after its data was re-downloaded)"""
+        self._cache.pop(dataset_key)
+
+    def clear(self):
+        """Drop all cached features"""
+        self._cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get size and hit/miss/eviction counters"""
+        return self._cache.stats()
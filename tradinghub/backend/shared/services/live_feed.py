@@ -0,0 +1,53 @@
+import asyncio
+import logging
+import os
+from typing import AsyncIterator, Dict, Protocol, Tuple
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+BAR_COLUMNS = ('Open', 'High', 'Low', 'Close', 'Volume')
+
+Bar = Tuple[pd.Timestamp, Dict[str, float]]  # (bar time, OHLCV values)
+
+
+class BarFeed(Protocol):
+    def stream(self, symbol: str, interval: str) -> AsyncIterator[Bar]:
+        ...
+
+
+class ReplayFileFeed:
+    """
+    Replay recorded bars as if they were arriving live
+
+    Bars are read from ``{replay_dir}/{SYMBOL}_{interval}.csv``, a file with
+    the bar time as first column and Open/High/Low/Close/Volume columns (the
+    layout of ``DataFrame.to_csv`` on downloaded history), and yielded in time
+    order with ``delay`` seconds between bars.
+    """
+
+    def __init__(self, replay_dir: str, delay: float = 1.0):
+        self.replay_dir = replay_dir
+        self.delay = delay
+
+    async def stream(self, symbol: str, interval: str) -> AsyncIterator[Bar]:
+        path = os.path.join(self.replay_dir, f"{symbol.upper()}_{interval}.csv")
+        if not os.path.exists(path):
+            raise ValueError(f"No replay file for {symbol} {interval}")
+        df = await asyncio.to_thread(self._read, path)
+        logger.info(f"Replaying {len(df)} bars of {symbol} {interval} from {path}")
+        values = df[list(BAR_COLUMNS)].to_numpy(dtype=float)
+        for timestamp, row in zip(df.index, values):
+            yield timestamp, dict(zip(BAR_COLUMNS, row.tolist()))
+            await asyncio.sleep(self.delay)
+
+    def _read(self, path: str) -> pd.DataFrame:
+        df = pd.read_csv(path, index_col=0)
+        times = df.index.astype(str)
+        # Times with UTC offsets (which change across DST) are parsed to UTC; naive ones are market time
+        has_offset = bool(times.str.match(r'.*([+-]\d\d:?\d\d|Z)$').all())
+        df.index = pd.to_datetime(times, utc=has_offset)
+        missing = [column for column in BAR_COLUMNS if column not in df.columns]
+        if missing:
+            raise ValueError(f"Replay file {path} is missing columns {missing}")
+        return df.sort_index()
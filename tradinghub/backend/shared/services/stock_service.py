@@ -1,11 +1,22 @@
+import asyncio
+from collections import deque
 import yfinance as yf
 import pandas as pd
-from typing import Dict, Any, Protocol
-import time
+from typing import Dict, Any, AsyncIterator, Awaitable, Callable, List, Optional, Protocol, Tuple
+from dataclasses import dataclass
+from datetime import datetime, timedelta
 import logging
 from tradinghub.backend.shared.models.dto.pattern_params import PatternParams, AnalysisRequest
-from tradinghub.backend.shared.models.dto.analysis_results import PatternResult, AnalysisResult
-from tradinghub.backend.shared.utils.time_utils import convert_to_israel_time
+from tradinghub.backend.shared.models.dto.analysis_results import PatternTable, AnalysisResult
+from tradinghub.backend.shared.utils.candlestick_utils import CandlestickUtils
+from tradinghub.backend.shared.utils.single_flight import SingleFlight, AsyncSingleFlight
+from tradinghub.backend.shared.utils.lru_cache import LRUCache, frame_nbytes
+from tradinghub.backend.shared.utils.frame_utils import freeze_frame, frame_view
+from tradinghub.backend.shared.services.feature_cache import FeatureCache
+from tradinghub.backend.shared.services.bar_store import BarStore, StoredFetcher, AsyncStoredFetcher, adjustment_dates
+from tradinghub.backend.shared.services.async_fetcher import AsyncDataFetcher, AsyncYahooFetcher
+from tradinghub.backend.shared.services.live_feed import BarFeed, ReplayFileFeed
+from tradinghub.backend.shared.services.task_executor import TaskExecutor, get_task_executor
 from tradinghub.backend.shared.config import Config
 from tradinghub.backend.shared.pattern_config.pattern_registry import PatternRegistry
 
@@ -25,70 +36,258 @@ class YahooFetcher:
         return stock.history(start=start, end=end, interval=interval)
 
 
+@dataclass
+class CachedSeries:
+    """Bars of one symbol/interval covering [start_date, end_date)"""
+    data: pd.DataFrame  # read-only (see freeze_frame), shared by all requests
+    start_date: str  # YYYY-MM-DD, inclusive
+    end_date: str  # YYYY-MM-DD, exclusive
+
+
+_detectors = {}  # Pattern detectors of this process (also used inside worker processes)
+
+# Longest candle window of any detector (three-candle patterns)
+_MAX_PATTERN_CANDLES = 3
+
+
+def detect_pattern_rows(features: pd.DataFrame, request: AnalysisRequest) -> pd.DataFrame:
+    """
+    Detect one request's pattern over a feature frame (a TaskExecutor unit)
+    
+    Args:
+        features: Bars plus candle features; only a shallow view of it is modified
+        request: Analysis request holding the pattern type and parameters
+        
+    Returns:
+        pd.DataFrame: Copy of the rows where the pattern was found
+    """
+    if request.pattern_type not in _detectors:
+        try:
+            _detectors[request.pattern_type] = PatternRegistry.get_pattern_class(request.pattern_type)()
+            logger.info(f"Created pattern detector for {request.pattern_type}")
+        except ValueError as e:
+            logger.error(f"Failed to create pattern detector for {request.pattern_type}: {e}")
+            raise e
+    pattern_detector = _detectors[request.pattern_type]
+    detected_df = pattern_detector.detect(features.copy(deep=False), request.pattern_params.__dict__)
+    pattern_column = pattern_detector.get_pattern_column_name()
+    return detected_df[detected_df[pattern_column]]
+
+
+def detection_context_rows(params: PatternParams) -> int:
+    """
+    Bars before a bar that detection needs to evaluate it as over the full history
+    
+    Covers the trend moving average, the volume averages and the longest
+    multi-candle window.
+    """
+    return max(params.ma_period, params.volume_lookback, CandlestickUtils.VOLUME_MA_PERIOD, _MAX_PATTERN_CANDLES)
+
+
+class LiveDetector:
+    """
+    Detect patterns on the newest bar of an appended bar stream
+    
+    Only the last ``window_rows`` bars are kept (see detection_context_rows),
+    so every new bar costs the same fixed amount of work however long the
+    stream runs. The candle features of the window are computed once per bar
+    and shared by all requested patterns, and a hit is reported when the
+    newest bar completes a pattern, as detection over the full history would.
+    """
+    
+    def __init__(self, requests: List[AnalysisRequest]):
+        self.requests = requests
+        self.window_rows = max(detection_context_rows(request.pattern_params) for request in requests) + 1
+        self._ma_periods = sorted({request.pattern_params.ma_period for request in requests})
+        self._times = deque(maxlen=self.window_rows)
+        self._bars = deque(maxlen=self.window_rows)
+    
+    def append(self, timestamp: pd.Timestamp, bar: Dict[str, float]) -> List[Tuple[AnalysisRequest, AnalysisResult]]:
+        """
+        Add a bar and detect the patterns it completes
+        
+        Args:
+            timestamp (pd.Timestamp): Bar time; bars not newer than the last one are ignored
+            bar (Dict[str, float]): Open, High, Low, Close and Volume of the bar
+            
+        Returns:
+            List of (request, result with the new bar) for every pattern found on it
+        """
+        if self._times and timestamp <= self._times[-1]:
+            return []
+        self._times.append(timestamp)
+        self._bars.append(bar)
+        
+        features = CandlestickUtils.calculate_properties(
+            pd.DataFrame(list(self._bars), index=pd.DatetimeIndex(list(self._times))))
+        for ma_period in self._ma_periods:
+            CandlestickUtils.add_moving_average(features, ma_period)
+        
+        hits = []
+        for request in self.requests:
+            patterns_found = detect_pattern_rows(features, request)
+            patterns_found = patterns_found[patterns_found.index == timestamp]
+            if not patterns_found.empty:
+                patterns = PatternTable.from_frame(patterns_found)
+                hits.append((request, AnalysisResult(count=len(patterns), patterns=patterns)))
+        return hits
+
+
 class StockService:
     """Service for handling stock data operations"""
     
-    def __init__(self, config: Config = None, fetcher: DataFetcher = None):
+    def __init__(self, config: Config = None, fetcher: DataFetcher = None, executor: TaskExecutor = None,
+                 async_fetcher: AsyncDataFetcher = None, live_feed: BarFeed = None):
         self.config = config or Config()
-        self._cache = {}  # Simple in-memory cache
         self._cache_ttl = self.config.CACHE_TTL  # Cache TTL in seconds
-        self._pattern_detectors = {}  # Cache for pattern detectors
-        self.fetcher: DataFetcher = fetcher or YahooFetcher()
+        self._cache = LRUCache(self.config.CACHE_MAX_BYTES, self._cache_ttl)  # Bar series per symbol/interval
+        self._feature_cache = FeatureCache(self._cache_ttl, self.config.FEATURE_CACHE_MAX_BYTES)  # Derived candle features per dataset
+        self._downloads = SingleFlight()  # Concurrent identical downloads share one fetch
+        self._async_downloads = AsyncSingleFlight()  # Same, for the awaitable download path
+        self.fetcher: DataFetcher = fetcher or self._create_default_fetcher()
+        self.async_fetcher: AsyncDataFetcher = async_fetcher or self._create_default_async_fetcher()
+        self.executor: TaskExecutor = executor or get_task_executor(self.config)  # Runs detection units
+        self.live_feed: BarFeed = live_feed or ReplayFileFeed(self.config.LIVE_REPLAY_DIR, self.config.LIVE_REPLAY_DELAY)
+    
+    def _create_default_fetcher(self) -> DataFetcher:
+        """Create the Yahoo fetcher, backed by the on-disk bar store when enabled"""
+        if self.config.BAR_STORE_ENABLED:
+            return StoredFetcher(BarStore(self.config.BAR_STORE_DIR), YahooFetcher())
+        return YahooFetcher()
+    
+    def _create_default_async_fetcher(self) -> AsyncDataFetcher:
+        """Create the aiohttp Yahoo fetcher, backed by the on-disk bar store when enabled"""
+        fetcher = AsyncYahooFetcher(
+            limit_per_host=self.config.ASYNC_FETCH_LIMIT_PER_HOST,
+            timeout=self.config.ASYNC_FETCH_TIMEOUT,
+            max_attempts=self.config.ASYNC_FETCH_MAX_ATTEMPTS
+        )
+        if self.config.BAR_STORE_ENABLED:
+            return AsyncStoredFetcher(BarStore(self.config.BAR_STORE_DIR), fetcher)
+        return fetcher
     
     def _get_cache_key(self, symbol: str, start_date: str, end_date: str, interval: str) -> str:
         """Generate a cache key for the request"""
         return f"{symbol}_{start_date}_{end_date}_{interval}"
     
-    def _get_cached_data(self, cache_key: str) -> pd.DataFrame:
-        """Get data from cache if it exists and is not expired"""
-        if cache_key in self._cache:
-            cached_data, timestamp = self._cache[cache_key]
-            if time.time() - timestamp < self._cache_ttl:
-                logger.info(f"Using cached data for {cache_key}")
-                return cached_data.copy()  # Return a copy to avoid modifying cached data
-        return None
-    
-    def _set_cached_data(self, cache_key: str, data: pd.DataFrame):
-        """Store data in cache with timestamp"""
-        self._cache[cache_key] = (data.copy(), time.time())
-        logger.info(f"Cached data for {cache_key}")
-        
-        # Clean up old cache entries (keep only last 50 entries)
-        if len(self._cache) > 50:
-            oldest_key = min(self._cache.keys(), key=lambda k: self._cache[k][1])
-            del self._cache[oldest_key]
+    def _get_date_range(self, days: int) -> Tuple[str, str]:
+        """Get the (start, end) dates in YYYY-MM-DD format for the last `days` days"""
+        end_date = datetime.now()
+        start_date = end_date - timedelta(days=days)
+        return start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d')
+    
+    def _get_dataset_key(self, symbol: str, days: int, interval: str) -> str:
+        """Get the identity of the dataset download_stock_data serves for these parameters"""
+        start_date, end_date = self._get_date_range(days)
+        return self._get_cache_key(symbol, start_date, end_date, interval)
     
-    def clear_cache(self):
-        """Clear the cache - useful for troubleshooting"""
-        self._cache.clear()
-        logger.info("Cache cleared")
+    def _get_series_key(self, symbol: str, interval: str) -> str:
+        """Generate the cache key of a symbol/interval bar series"""
+        return f"{symbol}_{interval}"
+    
+    def _get_cached_series(self, series_key: str) -> Optional[CachedSeries]:
+        """Get a cached bar series if it exists and is not expired"""
+        return self._cache.get(series_key)
+    
+    def _set_cached_series(self, series_key: str, series: CachedSeries):
+        """Store a bar series in cache, evicting least recently used series over the memory budget"""
+        self._cache.set(series_key, series, frame_nbytes(series.data))
+        logger.info(f"Cached {series_key} bars from {series.start_date} to {series.end_date}")
+    
+    def _overlaps(self, series: Optional[CachedSeries], start_date: str, end_date: str) -> bool:
+        """Check whether a window overlaps or touches the cached date range"""
+        return series is not None and start_date <= series.end_date and end_date >= series.start_date
+    
+    def _get_missing_ranges(self, series: Optional[CachedSeries], start_date: str, end_date: str) -> List[Tuple[str, str]]:
+        """
+        Get the date ranges of a requested window that are not cached yet
+        
+        Args:
+            series: Cached bar series (None if nothing is cached)
+            start_date: Window start in YYYY-MM-DD format (inclusive)
+            end_date: Window end in YYYY-MM-DD format (exclusive)
+            
+        Returns:
+            List of (start, end) ranges to download: the missing head and/or tail
+            of the window, or the whole window if it does not touch the cached one
+        """
+        if not self._overlaps(series, start_date, end_date):
+            return [(start_date, end_date)]
+        
+        missing = []
+        if start_date < series.start_date:
+            missing.append((start_date, series.start_date))
+        if end_date > series.end_date:
+            missing.append((series.end_date, end_date))
+        return missing
     
-    def _get_pattern_detector(self, pattern_type: str):
+    def _is_readjusted(self, series: Optional[CachedSeries], frames: List[pd.DataFrame]) -> bool:
         """
-        Get or create a pattern detector for the given pattern type
+        Check whether downloaded bars carry a dividend or split that re-adjusts cached bars
         
         Args:
-            pattern_type: Type of pattern (e.g., 'hammer', 'doji')
+            series: Cached bar series the frames would extend (None if nothing is cached)
+            frames: Downloaded bars of the missing ranges
             
         Returns:
-            Pattern detector instance
+            bool: True if an event falls at or after the first cached bar, so the
+            cached bars are on an older price basis than the downloaded ones
         """
-        if pattern_type not in self._pattern_detectors:
-            try:
-                pattern_class = PatternRegistry.get_pattern_class(pattern_type)
-                self._pattern_detectors[pattern_type] = pattern_class()
-                logger.info(f"Created pattern detector for {pattern_type}")
-            except ValueError as e:
-                logger.error(f"Failed to create pattern detector for {pattern_type}: {e}")
-                raise e
+        if series is None or series.data.empty:
+            return False
+        first_cached = series.data.index[0]
+        return any(len(events) and events[-1] >= first_cached for events in map(adjustment_dates, frames))
+    
+    def _merge_series(self, frames: List[pd.DataFrame]) -> pd.DataFrame:
+        """Merge downloaded bar frames, keeping the latest copy of duplicated timestamps"""
+        non_empty = [frame for frame in frames if not frame.empty]
+        if not non_empty:
+            return frames[-1]
+        if len(non_empty) == 1:
+            return non_empty[0]
+        merged = pd.concat(non_empty)
+        return merged[~merged.index.duplicated(keep='last')].sort_index()
+    
+    def _slice_series(self, df: pd.DataFrame, start_date: str, end_date: str) -> pd.DataFrame:
+        """
+        Get the bars of a window from a cached series without copying them
         
-        return self._pattern_detectors[pattern_type]
+        The returned frame shares the read-only cached arrays; callers add their
+        own columns to it instead of modifying the bars.
+        """
+        if df.empty or not isinstance(df.index, pd.DatetimeIndex):
+            return frame_view(df)
+        first = df.index.searchsorted(pd.Timestamp(start_date, tz=df.index.tz), side='left')
+        last = df.index.searchsorted(pd.Timestamp(end_date, tz=df.index.tz), side='left')
+        return frame_view(df, first, last)
     
+    def clear_cache(self):
+        """Clear the cache - useful for troubleshooting"""
+        self._cache.clear()
+        self._feature_cache.clear()
+        logger.info("Cache cleared")
+    
+    async def close(self):
+        """Close the async fetcher's pooled HTTP session"""
+        close = getattr(self.async_fetcher, 'close', None)
+        if close is not None:
+            await close()
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """Get hit/miss/eviction counters and memory usage of the data and feature caches"""
+        return {
+            'data': self._cache.stats(),
+            'features': self._feature_cache.stats(),
+            'in_flight_downloads': self._downloads.in_flight() + self._async_downloads.in_flight(),
+        }
     
     def _download_stock_data(self, symbol: str, start_date: str, end_date: str, interval: str) -> pd.DataFrame:
         """
         Download stock data from Yahoo Finance
         
+        Concurrent calls for the same range wait for the download already in
+        flight instead of issuing their own request.
+        
         Args:
             symbol: Stock symbol
             start_date: Start date in YYYY-MM-DD format
@@ -98,6 +297,11 @@ class StockService:
         Returns:
             DataFrame with stock data
         """
+        cache_key = self._get_cache_key(symbol, start_date, end_date, interval)
+        return self._downloads.do(cache_key, self._fetch_stock_data, symbol, start_date, end_date, interval)
+    
+    def _fetch_stock_data(self, symbol: str, start_date: str, end_date: str, interval: str) -> pd.DataFrame:
+        """Fetch stock data from the configured fetcher"""
         try:
             logger.info(f"Downloading {symbol} data from {start_date} to {end_date} with interval {interval}")
             df = self.fetcher.fetch(symbol, start_date, end_date, interval)
@@ -112,6 +316,28 @@ class StockService:
         except Exception as e:
             logger.error(f"Error downloading {symbol} data: {e}")
             raise e
+    
+    async def _download_stock_data_async(self, symbol: str, start_date: str, end_date: str, interval: str) -> pd.DataFrame:
+        """Awaitable counterpart of _download_stock_data using the async fetcher"""
+        cache_key = self._get_cache_key(symbol, start_date, end_date, interval)
+        return await self._async_downloads.do(cache_key, self._fetch_stock_data_async, symbol, start_date, end_date, interval)
+    
+    async def _fetch_stock_data_async(self, symbol: str, start_date: str, end_date: str, interval: str) -> pd.DataFrame:
+        """Fetch stock data from the configured async fetcher"""
+        try:
+            logger.info(f"Downloading {symbol} data from {start_date} to {end_date} with interval {interval} (async)")
+            df = await self.async_fetcher.fetch(symbol, start_date, end_date, interval)
+            
+            logger.info(f"Downloaded {len(df)} rows of data for {symbol}")
+            
+            if df.empty:
+                logger.warning(f"Empty data for {symbol} - symbol may not exist or no data available")
+            
+            return df
+            
+        except Exception as e:
+            logger.error(f"Error downloading {symbol} data: {e}")
+            raise e
 
     def analyze_stock(self, request: AnalysisRequest) -> AnalysisResult:
         """
@@ -123,38 +349,188 @@ class StockService:
         Returns:
             AnalysisResult: Analysis results
         """
-        df = self._fetch_data(request)
+        return self.analyze_frame(request, self._fetch_data(request))
+
+    def analyze_frame(self, request: AnalysisRequest, df: pd.DataFrame) -> AnalysisResult:
+        """
+        Analyze already downloaded bars for one pattern
+        
+        Args:
+            request (AnalysisRequest): Analysis request parameters
+            df (pd.DataFrame): Bars returned by download_stock_data for the request
+            
+        Returns:
+            AnalysisResult: Analysis results
+        """
         if df.empty:
-            return AnalysisResult(count=0, patterns=[])
+            return AnalysisResult(count=0, patterns=PatternTable.empty())
 
-        patterns_found = self._detect_patterns(df, request)
-        patterns = self._build_pattern_results(patterns_found)
+        features = self._get_features(df, [request])
+        patterns_found = self.executor.map_frame(detect_pattern_rows, features, [request])[0]
+        patterns = PatternTable.from_frame(patterns_found)
         return AnalysisResult(count=len(patterns), patterns=patterns)
 
+    async def scan_async(self, requests: List[AnalysisRequest],
+                         run_blocking: Callable[..., Awaitable[Any]] = None,
+                         max_concurrency: int = 8) -> AsyncIterator[Tuple[AnalysisRequest, Optional[AnalysisResult], Optional[Exception]]]:
+        """
+        Analyze many symbols concurrently, yielding each result as soon as it is ready
+        
+        Bars are fetched with the async fetcher (connection-pooled, coalesced and
+        cached like download_stock_data_async); detection runs through
+        ``run_blocking`` so it stays off the event loop. At most
+        ``max_concurrency`` symbols are downloaded or analyzed at once.
+        Pending work is cancelled if the consumer stops iterating.
+        
+        Args:
+            requests (List[AnalysisRequest]): One request per symbol
+            run_blocking: Awaitable runner for blocking calls (default asyncio.to_thread)
+            max_concurrency (int): Symbols in flight at once
+            
+        Yields:
+            Tuple of (request, result, error) in completion order; exactly one of
+            result and error is set
+        """
+        run_blocking = run_blocking or asyncio.to_thread
+        slots = asyncio.Semaphore(max_concurrency)
+
+        async def scan_one(request: AnalysisRequest):
+            async with slots:
+                try:
+                    df = await self.download_stock_data_async(request.symbol, request.days, request.interval)
+                    return request, await run_blocking(self.analyze_frame, request, df), None
+                except Exception as e:
+                    logger.error(f"Scan of {request.symbol} failed: {e}")
+                    return request, None, e
+
+        tasks = [asyncio.ensure_future(scan_one(request)) for request in requests]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def analyze_stream(self, request: AnalysisRequest,
+                             run_blocking: Callable[..., Awaitable[Any]] = None,
+                             partition_rows: int = 5000) -> AsyncIterator[Tuple[AnalysisResult, int, int]]:
+        """
+        Analyze a dataset in time-ordered partitions, yielding each partition's patterns as it is done
+        
+        The bars are downloaded with the async fetcher and their features come
+        from the feature cache; detection then runs over ``partition_rows`` bars
+        at a time through ``run_blocking``. Each partition is detected together
+        with the bars before it that its rolling and multi-candle windows need,
+        so the hits are the same as analyze_stock's.
+        
+        Args:
+            request (AnalysisRequest): Analysis request parameters
+            run_blocking: Awaitable runner for blocking calls (default asyncio.to_thread)
+            partition_rows (int): Bars per partition
+            
+        Yields:
+            Tuple of (patterns of the partition, bars analyzed so far, total bars)
+        """
+        run_blocking = run_blocking or asyncio.to_thread
+        df = await self.download_stock_data_async(request.symbol, request.days, request.interval)
+        if df.empty:
+            return
+
+        features = await run_blocking(self._get_features, df, [request])
+        context_rows = detection_context_rows(request.pattern_params)
+        for start in range(0, len(features), partition_rows):
+            end = min(start + partition_rows, len(features))
+            result = await run_blocking(self._analyze_partition, request, features, start, end, context_rows)
+            yield result, end, len(features)
+
+    def _analyze_partition(self, request: AnalysisRequest, features: pd.DataFrame,
+                           start: int, end: int, context_rows: int) -> AnalysisResult:
+        window = features.iloc[max(start - context_rows, 0):end]
+        patterns_found = self.executor.map_frame(detect_pattern_rows, window, [request])[0]
+        # Hits inside the context rows belong to the previous partition
+        patterns_found = patterns_found[patterns_found.index >= features.index[start]]
+        patterns = PatternTable.from_frame(patterns_found)
+        return AnalysisResult(count=len(patterns), patterns=patterns)
+
+    async def live_detection(self, requests: List[AnalysisRequest],
+                             run_blocking: Callable[..., Awaitable[Any]] = None
+                             ) -> AsyncIterator[Tuple[pd.Timestamp, List[Tuple[AnalysisRequest, AnalysisResult]]]]:
+        """
+        Detect patterns on the bars of the live feed as they arrive
+        
+        Each bar is checked by a LiveDetector through ``run_blocking`` (fixed
+        work per bar, see LiveDetector); nothing is downloaded or re-detected.
+        
+        Args:
+            requests (List[AnalysisRequest]): One request per pattern, sharing symbol and interval
+            run_blocking: Awaitable runner for blocking calls (default asyncio.to_thread)
+            
+        Yields:
+            Tuple of (bar time, patterns completed by that bar) for every bar of the feed
+        """
+        run_blocking = run_blocking or asyncio.to_thread
+        detector = LiveDetector(requests)
+        async for timestamp, bar in self.live_feed.stream(requests[0].symbol, requests[0].interval):
+            yield timestamp, await run_blocking(detector.append, timestamp, bar)
+
+    def analyze_stock_multi(self, requests: List[AnalysisRequest]) -> List[AnalysisResult]:
+        """
+        Analyze one dataset for several patterns in a single pass
+        
+        The data is downloaded once and the shared candle features (body, shadows,
+        volume and moving averages) come from the feature cache; every detector
+        then runs over its own shallow view of that feature frame, as one unit
+        of the task executor (in parallel when it is a process pool).
+        
+        Args:
+            requests (List[AnalysisRequest]): Requests sharing symbol, days and interval
+            
+        Returns:
+            List[AnalysisResult]: One result per request, in request order
+        """
+        if not requests:
+            return []
+
+        df = self._fetch_data(requests[0])
+        if df.empty:
+            return [AnalysisResult(count=0, patterns=PatternTable.empty()) for _ in requests]
+
+        features = self._get_features(df, requests)
+        results = []
+        for patterns_found in self.executor.map_frame(detect_pattern_rows, features, requests):
+            patterns = PatternTable.from_frame(patterns_found)
+            results.append(AnalysisResult(count=len(patterns), patterns=patterns))
+        return results
+
+    def get_feature_frame(self, symbol: str, days: int, interval: str, ma_periods: List[int] = ()) -> pd.DataFrame:
+        """
+        Get the bars of a dataset together with its cached candle features
+        
+        Args:
+            symbol (str): Stock symbol
+            days (int): Number of days of data
+            interval (str): Data interval
+            ma_periods (List[int]): Moving average periods to include
+            
+        Returns:
+            pd.DataFrame: Shallow view of the feature frame (empty if no data)
+        """
+        df = self.download_stock_data(symbol, days, interval)
+        if df.empty:
+            return df
+        dataset_key = self._get_dataset_key(symbol, days, interval)
+        return self._feature_cache.get_features(dataset_key, df, ma_periods)
+
     # --- helpers to simplify analyze_stock ---
     def _fetch_data(self, request: AnalysisRequest) -> pd.DataFrame:
         return self.download_stock_data(request.symbol, request.days, request.interval)
 
-    def _detect_patterns(self, df: pd.DataFrame, request: AnalysisRequest) -> pd.DataFrame:
-        pattern_detector = self._get_pattern_detector(request.pattern_type)
-        detected_df = pattern_detector.detect(df, request.pattern_params.__dict__)
-        pattern_column = pattern_detector.get_pattern_column_name()
-        return detected_df[detected_df[pattern_column]]
-
-    def _build_pattern_results(self, patterns_found: pd.DataFrame):
-        patterns = []
-        for date, row in patterns_found.iterrows():
-            israel_time = convert_to_israel_time(date)
-            patterns.append(PatternResult(
-                date=israel_time,
-                trend=row.get('trend', 'unknown'),
-                open_price=float(row['Open']),
-                high_price=float(row['High']),
-                low_price=float(row['Low']),
-                close_price=float(row['Close'])
-            ))
-        return patterns
-    
+    def _get_features(self, df: pd.DataFrame, requests: List[AnalysisRequest]) -> pd.DataFrame:
+        request = requests[0]
+        dataset_key = self._get_dataset_key(request.symbol, request.days, request.interval)
+        ma_periods = sorted({request.pattern_params.ma_period for request in requests})
+        return self._feature_cache.get_features(dataset_key, df, ma_periods)
+
     def download_stock_data(self, symbol: str, days: int, interval: str) -> pd.DataFrame:
         """
         Download stock data from Yahoo Finance
@@ -167,26 +543,91 @@ class StockService:
         Returns:
             pd.DataFrame: Stock data
         """
-        from datetime import datetime, timedelta
+        start_date, end_date = self._get_date_range(days)
         
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=days)
+        series_key = self._get_series_key(symbol, interval)
+        series = self._get_cached_series(series_key)
+        missing_ranges = self._get_missing_ranges(series, start_date, end_date)
         
-        cache_key = self._get_cache_key(symbol, start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d'), interval)
-        cached_data = self._get_cached_data(cache_key)
+        if not missing_ranges:
+            logger.info(f"Using cached data for {series_key} from {start_date} to {end_date}")
+            return self._slice_series(series.data, start_date, end_date)
+        
+        frames = [
+            self._download_stock_data(symbol, range_start, range_end, interval)
+            for range_start, range_end in missing_ranges
+        ]
+        if self._overlaps(series, start_date, end_date) and self._is_readjusted(series, frames):
+            # Cached bars are on the old price basis: download the whole window again
+            logger.info(f"Prices of {series_key} were re-adjusted, downloading {start_date} to {end_date} again")
+            series = None
+            frames = [self._download_stock_data(symbol, start_date, end_date, interval)]
+        return self._extend_series(symbol, interval, series, start_date, end_date, frames)
+    
+    async def download_stock_data_async(self, symbol: str, days: int, interval: str) -> pd.DataFrame:
+        """
+        Awaitable version of download_stock_data
         
-        if cached_data is not None:
-            return cached_data
+        Missing ranges are fetched with the async fetcher on the event loop, so
+        many symbols can be downloaded concurrently (e.g. with asyncio.gather)
+        without holding a thread each. Cached and stored bars are shared with
+        the synchronous path.
         
-        try:
-            df = self._download_stock_data(
-                symbol,
-                start_date.strftime('%Y-%m-%d'),
-                end_date.strftime('%Y-%m-%d'),
-                interval
-            )
-            self._set_cached_data(cache_key, df)
-            return df
-        except Exception as e:
-            # Re-raise exceptions
-            raise e 
\ No newline at end of file
+        Args:
+            symbol (str): Stock symbol
+            days (int): Number of days to analyze
+            interval (str): Data interval (1m, 5m, 15m, 30m, 1h, 1d)
+            
+        Returns:
+            pd.DataFrame: Stock data
+        """
+        start_date, end_date = self._get_date_range(days)
+        
+        series_key = self._get_series_key(symbol, interval)
+        series = self._get_cached_series(series_key)
+        missing_ranges = self._get_missing_ranges(series, start_date, end_date)
+        
+        if not missing_ranges:
+            logger.info(f"Using cached data for {series_key} from {start_date} to {end_date}")
+            return self._slice_series(series.data, start_date, end_date)
+        
+        frames = list(await asyncio.gather(*[
+            self._download_stock_data_async(symbol, range_start, range_end, interval)
+            for range_start, range_end in missing_ranges
+        ]))
+        if self._overlaps(series, start_date, end_date) and self._is_readjusted(series, frames):
+            # Cached bars are on the old price basis: download the whole window again
+            logger.info(f"Prices of {series_key} were re-adjusted, downloading {start_date} to {end_date} again")
+            series = None
+            frames = [await self._download_stock_data_async(symbol, start_date, end_date, interval)]
+        return self._extend_series(symbol, interval, series, start_date, end_date, frames)
+    
+    def _extend_series(self, symbol: str, interval: str, series: Optional[CachedSeries], start_date: str,
+                       end_date: str, frames: List[pd.DataFrame]) -> pd.DataFrame:
+        """
+        Merge downloaded ranges into the cached series and return the requested window
+        
+        Args:
+            symbol: Stock symbol
+            interval: Data interval
+            series: Cached bar series before the download (None if nothing was cached)
+            start_date: Window start in YYYY-MM-DD format (inclusive)
+            end_date: Window end in YYYY-MM-DD format (exclusive)
+            frames: Downloaded bars of the missing ranges
+            
+        Returns:
+            pd.DataFrame: Read-only view of the window's bars
+        """
+        # Extend the cached series with the missing head/tail, or start a new one
+        extends_cache = self._overlaps(series, start_date, end_date)
+        if extends_cache:
+            frames = [series.data] + frames
+        
+        series = CachedSeries(
+            data=freeze_frame(self._merge_series(frames)),
+            start_date=min(start_date, series.start_date) if extends_cache else start_date,
+            end_date=max(end_date, series.end_date) if extends_cache else end_date
+        )
+        self._set_cached_series(self._get_series_key(symbol, interval), series)
+        self._feature_cache.invalidate(self._get_cache_key(symbol, start_date, end_date, interval))
+        return self._slice_series(series.data, start_date, end_date)
@@ -0,0 +1,103 @@
+import os
+import threading
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, List, Optional, Protocol, Sequence
+import pandas as pd
+from tradinghub.backend.shared.config import Config
+from tradinghub.backend.shared.utils.shared_frame import SharedFrame, attach_shared_frame
+
+logger = logging.getLogger(__name__)
+
+
+class TaskExecutor(Protocol):
+    """Runs independent work units (e.g. pattern x param set) over one shared frame"""
+    max_workers: int
+
+    def map_frame(self, fn: Callable[[pd.DataFrame, Any], Any], df: pd.DataFrame, units: Sequence[Any]) -> List[Any]:
+        ...
+
+
+class InlineExecutor:
+    """Runs every unit in the calling thread"""
+    max_workers = 1
+
+    def map_frame(self, fn: Callable[[pd.DataFrame, Any], Any], df: pd.DataFrame, units: Sequence[Any]) -> List[Any]:
+        return [fn(df, unit) for unit in units]
+
+
+class ProcessPoolTaskExecutor:
+    """
+    Fans units out to a pool of worker processes
+
+    The frame is copied once into shared memory and every worker attaches to
+    it read-only, so only the small unit descriptions and results are pickled.
+    ``fn`` must be a module-level function so it can be sent to the workers.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, start_method: str = 'spawn'):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._start_method = start_method
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def map_frame(self, fn: Callable[[pd.DataFrame, Any], Any], df: pd.DataFrame, units: Sequence[Any]) -> List[Any]:
+        if len(units) < 2:
+            # Nothing to parallelize; skip the shared memory round trip
+            return [fn(df, unit) for unit in units]
+        with SharedFrame(df) as shared:
+            tasks = [(fn, shared.handle, unit) for unit in units]
+            return list(self._get_pool().map(_run_unit, tasks))
+
+    def shutdown(self):
+        """Stop the worker processes"""
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                logger.info(f"Starting process pool with {self.max_workers} workers ({self._start_method})")
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context(self._start_method),
+                    initializer=_init_worker,
+                )
+            return self._pool
+
+
+def _init_worker():
+    # Spawned workers start with an empty pattern registry
+    from tradinghub.backend.shared.pattern_config.pattern_registry import PatternRegistry
+    PatternRegistry.auto_register_patterns()
+
+
+def _run_unit(task) -> Any:
+    fn, handle, unit = task
+    with attach_shared_frame(handle) as frame:
+        return fn(frame, unit)
+
+
+_default_executor: Optional[TaskExecutor] = None
+_default_executor_lock = threading.Lock()
+
+
+def get_task_executor(config: Config = None) -> TaskExecutor:
+    """
+    Get the process-wide task executor selected by configuration
+
+    TASK_EXECUTOR='process' enables the process pool (TASK_EXECUTOR_WORKERS
+    workers, default one per CPU); anything else runs units inline.
+    """
+    global _default_executor
+    config = config or Config()
+    with _default_executor_lock:
+        if _default_executor is None:
+            if config.TASK_EXECUTOR == 'process':
+                _default_executor = ProcessPoolTaskExecutor(config.TASK_EXECUTOR_WORKERS, config.TASK_EXECUTOR_START_METHOD)
+            else:
+                _default_executor = InlineExecutor()
+        return _default_executor
@@ -0,0 +1,110 @@
+"""
+Blocking Pool
+Run blocking handlers (downloads, detection, backtests) off the asyncio event loop
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+
+class PoolSaturatedError(Exception):
+    """Raised when a call is submitted while the pool's queue is full"""
+
+
+class BlockingPool:
+    """
+    Bounded thread pool for synchronous work called from async routes.
+
+    At most ``max_workers`` calls run at once and at most ``max_queued`` more
+    wait for a thread; anything beyond that is rejected with
+    ``PoolSaturatedError`` instead of piling up behind the event loop. The pool
+    is separate from the event loop and from Starlette's own threadpool, so
+    health checks and static files keep being served while it is busy.
+    """
+
+    def __init__(self, max_workers: int, max_queued: int):
+        self.max_workers = max_workers
+        self.max_queued = max_queued
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='blocking')
+        self._lock = threading.Lock()
+        self._pending = 0  # queued + running
+        self._running = 0
+        self.peak_queued = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self._total_wait = 0.0
+        self._total_run = 0.0
+
+    async def run(self, fn: Callable[..., Any], *args) -> Any:
+        """
+        Run ``fn(*args)`` on a pool thread and await its result
+
+        Args:
+            fn (Callable): Blocking function to run
+
+        Returns:
+            Any: Result of the call
+
+        Raises:
+            PoolSaturatedError: If all workers are busy and the queue is full
+        """
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queued:
+                self.rejected += 1
+                raise PoolSaturatedError('Server is busy, please retry shortly')
+            self._pending += 1
+            self.peak_queued = max(self.peak_queued, self._pending - self._running)
+
+        future = self._executor.submit(self._call, time.perf_counter(), fn, args)
+        # Released from the future callback so calls cancelled before they start
+        # (e.g. the client went away) still free their slot
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get concurrency, queue-depth and timing counters"""
+        with self._lock:
+            finished = self.completed + self.failed
+            return {
+                'max_workers': self.max_workers,
+                'max_queued': self.max_queued,
+                'running': self._running,
+                'queued': self._pending - self._running,
+                'peak_queued': self.peak_queued,
+                'completed': self.completed,
+                'failed': self.failed,
+                'rejected': self.rejected,
+                'avg_wait_ms': round(self._total_wait / finished * 1000, 2) if finished else 0.0,
+                'avg_run_ms': round(self._total_run / finished * 1000, 2) if finished else 0.0,
+            }
+
+    def shutdown(self):
+        """Stop accepting work and wait for running calls to finish"""
+        self._executor.shutdown(wait=True)
+
+    def _call(self, submitted: float, fn: Callable[..., Any], args) -> Any:
+        started = time.perf_counter()
+        with self._lock:
+            self._running += 1
+            self._total_wait += started - submitted
+        ok = False
+        try:
+            result = fn(*args)
+            ok = True
+            return result
+        finally:
+            with self._lock:
+                self._running -= 1
+                self._total_run += time.perf_counter() - started
+                if ok:
+                    self.completed += 1
+                else:
+                    self.failed += 1
+
+    def _release(self, future: Future):
+        with self._lock:
+            self._pending -= 1
@@ -5,17 +5,44 @@ from typing import Dict, Any
 class CandlestickUtils:
     """Utility class for candlestick calculations"""
     
+    # Columns produced by calculate_properties (volume columns only when Volume exists)
+    PROPERTY_COLUMNS = ['body', 'upper_shadow', 'lower_shadow', 'body_size', 'total_range', 'is_green']
+    VOLUME_PROPERTY_COLUMNS = ['volume_ma', 'relative_volume']
+    VOLUME_MA_PERIOD = 20  # bars averaged for volume_ma
+    
+    @staticmethod
+    def has_properties(df: pd.DataFrame) -> bool:
+        """
+        Check whether candlestick properties were already calculated for the dataframe
+        
+        Args:
+            df (pd.DataFrame): DataFrame with OHLC data
+            
+        Returns:
+            bool: True if all property columns are present
+        """
+        required = list(CandlestickUtils.PROPERTY_COLUMNS)
+        if 'Volume' in df.columns:
+            required += CandlestickUtils.VOLUME_PROPERTY_COLUMNS
+        return all(column in df.columns for column in required)
+    
     @staticmethod
     def calculate_properties(df: pd.DataFrame) -> pd.DataFrame:
         """
         Calculate basic candlestick properties
         
+        Properties already present on the dataframe (e.g. computed once and shared
+        by several detectors) are reused instead of being recalculated.
+        
         Args:
             df (pd.DataFrame): DataFrame with OHLC data
             
         Returns:
             pd.DataFrame: DataFrame with additional candlestick properties
         """
+        if CandlestickUtils.has_properties(df):
+            return df
+        
         df['body'] = df['Close'] - df['Open']
         df['upper_shadow'] = df['High'] - df[['Open', 'Close']].max(axis=1)
         df['lower_shadow'] = df[['Open', 'Close']].min(axis=1) - df['Low']
@@ -25,7 +52,7 @@ class CandlestickUtils:
         
         # Add volume calculations if Volume column exists
         if 'Volume' in df.columns:
-            df['volume_ma'] = df['Volume'].rolling(window=20).mean()
+            df['volume_ma'] = df['Volume'].rolling(window=CandlestickUtils.VOLUME_MA_PERIOD).mean()
             df['relative_volume'] = df['Volume'] / df['volume_ma']
         
         return df
@@ -35,6 +62,8 @@ class CandlestickUtils:
         """
         Add trend context using moving average
         
+        An existing MA column for the same period is reused.
+        
         Args:
             df (pd.DataFrame): DataFrame with OHLC data
             ma_period (int): Period for moving average calculation
@@ -42,6 +71,22 @@ class CandlestickUtils:
         Returns:
             pd.DataFrame: DataFrame with trend information
         """
-        df[f'MA{ma_period}'] = df['Close'].rolling(window=ma_period).mean()
+        CandlestickUtils.add_moving_average(df, ma_period)
         df['trend'] = np.where(df['Close'] > df[f'MA{ma_period}'], 'uptrend', 'downtrend')
-        return df 
\ No newline at end of file
+        return df
+    
+    @staticmethod
+    def add_moving_average(df: pd.DataFrame, ma_period: int) -> pd.DataFrame:
+        """
+        Add the closing price moving average column if it is not present yet
+        
+        Args:
+            df (pd.DataFrame): DataFrame with OHLC data
+            ma_period (int): Period for moving average calculation
+            
+        Returns:
+            pd.DataFrame: DataFrame with the MA{ma_period} column
+        """
+        if f'MA{ma_period}' not in df.columns:
+            df[f'MA{ma_period}'] = df['Close'].rolling(window=ma_period).mean()
+        return df
@@ -1,4 +1,6 @@
 from typing import Any, Dict, List, Tuple
+import numpy as np
+import pandas as pd
 from tradinghub.backend.shared.models.dto.pattern_params import PatternParams
 from tradinghub.backend.shared.models.dto.backtest_params import BacktestParams
 
@@ -18,33 +20,55 @@ def format_stock_data(df) -> List[Dict[str, Any]]:
     return stock_data
 
 
-def serialize_datetime_fields(obj: Any) -> Any:
-    """Recursively convert datetime-like objects in dict/list to ISO strings."""
-    try:
-        import datetime as _dt
-    except Exception:
-        _dt = None
-
-    # pandas Timestamp and DatetimeIndex elements
-    if 'pandas' in str(type(obj)) or (hasattr(obj, 'isoformat') and str(type(obj)).endswith("Timestamp'>")):
-        try:
-            return obj.isoformat() if hasattr(obj, 'isoformat') else str(obj)
-        except Exception:
-            return str(obj)
-
-    if isinstance(obj, list):
-        return [serialize_datetime_fields(x) for x in obj]
-    if isinstance(obj, dict):
-        out = {}
-        for k, v in obj.items():
-            out[k] = serialize_datetime_fields(v)
-        return out
-    if _dt and isinstance(obj, _dt.datetime):
-        try:
-            return obj.isoformat()
-        except Exception:
-            return str(obj)
-    return obj
+# Response formats: 'rows' (lists of dicts, the default) or 'columnar' (parallel arrays)
+RESPONSE_FORMATS = ('rows', 'columnar')
+STOCK_DATA_TIME_FORMAT = 'YYYY-MM-DD HH:MM:SS'
+
+
+def format_stock_data_columns(df) -> Dict[str, Any]:
+    """
+    Format OHLCV dataframe as a columnar table (see records_to_columns).
+
+    Dates are sent as wall-clock epoch seconds (the bar's local time read as
+    UTC), so clients rebuild exactly the 'date' strings of format_stock_data.
+    """
+    if isinstance(df.index, pd.DatetimeIndex):
+        wall_clock = df.index.tz_localize(None) if df.index.tz is not None else df.index
+        dates = (wall_clock.as_unit('s').asi8).tolist()
+        time_columns = {'date': STOCK_DATA_TIME_FORMAT}
+    else:
+        dates = [str(idx) for idx in df.index]
+        time_columns = {}
+    volume = df['Volume'].to_numpy(dtype=float) if 'Volume' in df.columns else np.zeros(len(df))
+    return {
+        'length': len(df),
+        'columns': {
+            'date': dates,
+            'open': df['Open'].to_numpy(dtype=float).tolist(),
+            'high': df['High'].to_numpy(dtype=float).tolist(),
+            'low': df['Low'].to_numpy(dtype=float).tolist(),
+            'close': df['Close'].to_numpy(dtype=float).tolist(),
+            'volume': volume.tolist(),
+        },
+        'time_columns': time_columns,
+    }
+
+
+def records_to_columns(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Convert a list of dicts into a columnar table.
+
+    The table is {'length': n, 'columns': {key: [values]}, 'time_columns': {}};
+    keys missing from a record become None. Clients turn it back into rows.
+    """
+    names: Dict[str, None] = {}
+    for record in records:
+        names.update(dict.fromkeys(record))
+    return {
+        'length': len(records),
+        'columns': {name: [record.get(name) for record in records] for name in names},
+        'time_columns': {},
+    }
 
 
 def parse_pattern_params(data: Dict[str, Any]) -> PatternParams:
@@ -78,10 +102,49 @@ def parse_backtest_params(data: Dict[str, Any]) -> BacktestParams:
         max_holding_periods=int(data.get('max_holding_periods', 20)),
         initial_portfolio_size=float(data.get('initial_portfolio_size', 10000)),
         commission=float(data.get('commission', 0.65)),
-        slippage=float(data.get('slippage', 0.1))
+        slippage=float(data.get('slippage', 0.1)),
+        simulation_mode=str(data.get('simulation_mode', 'vectorized'))
     )
 
 
+# Exit parameters a backtest sweep can take a grid of values for
+SWEEP_EXIT_PARAMS = {
+    'stop_loss_pct': float,
+    'take_profit_pct': float,
+    'entry_delay': int,
+    'max_holding_periods': int,
+}
+
+
+def parse_exit_grid(data: Dict[str, Any]) -> Dict[str, List[Any]]:
+    """Parse exit-parameter grids (a single value or a list of values per parameter) for backtest sweeps."""
+    defaults = BacktestParams()
+    grid: Dict[str, List[Any]] = {}
+    for name, cast in SWEEP_EXIT_PARAMS.items():
+        values = data.get(name, getattr(defaults, name))
+        if not isinstance(values, (list, tuple)):
+            values = [values]
+        if not values:
+            raise ValueError(f'Empty grid for {name}')
+        grid[name] = [cast(v) for v in values]
+    return grid
+
+
+def parse_pattern_grid(data: Dict[str, Any]) -> Dict[str, List[Any]]:
+    """Parse the pattern-parameter grid ({param: [values]}) for backtest sweeps."""
+    incoming = data.get('pattern_grid') or {}
+    if not isinstance(incoming, dict):
+        raise ValueError('pattern_grid must map parameter names to lists of values')
+    grid: Dict[str, List[Any]] = {}
+    for name, values in incoming.items():
+        if not isinstance(values, (list, tuple)):
+            values = [values]
+        if not values:
+            raise ValueError(f'Empty grid for {name}')
+        grid[name] = list(values)
+    return grid
+
+
 def normalize_patterns_payload(incoming_patterns: List[Any]) -> List[Dict[str, Any]]:
     """Ensure each pattern dict has 'date' and keep fields intact; ignore invalid items."""
     patterns: List[Dict[str, Any]] = []
@@ -0,0 +1,50 @@
+"""
+Frame Utilities
+Read-only DataFrames for sharing cached data between requests without copying
+"""
+
+import pandas as pd
+
+
+def freeze_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Build a read-only DataFrame sharing memory with the given one
+
+    Every column becomes its own block backed by a read-only NumPy view, so any
+    in-place write (e.g. ``frozen.loc[i, 'Close'] = x``) raises instead of
+    silently changing cached data. The source frame must not be modified
+    afterwards.
+
+    Args:
+        df (pd.DataFrame): Frame to freeze
+
+    Returns:
+        pd.DataFrame: Read-only frame with the same index and columns
+    """
+    columns = {}
+    for column in df.columns:
+        values = df[column].to_numpy()
+        if values.flags.writeable:
+            values = values.view()
+            values.flags.writeable = False
+        columns[column] = values
+    return pd.DataFrame(columns, index=df.index, copy=False)
+
+
+def frame_view(df: pd.DataFrame, start: int = None, stop: int = None) -> pd.DataFrame:
+    """
+    Zero-copy row slice of a (frozen) frame
+
+    The result shares the column arrays of ``df`` but has its own column set,
+    so callers can add result columns to it (a per-request overlay) or replace
+    its index without affecting ``df``.
+
+    Args:
+        df (pd.DataFrame): Source frame
+        start (int): First row position (inclusive)
+        stop (int): Last row position (exclusive)
+
+    Returns:
+        pd.DataFrame: Shallow view of the selected rows
+    """
+    return df.iloc[start:stop].copy(deep=False)
@@ -0,0 +1,221 @@
+"""
+Job Queue
+In-process background jobs with progress, cancellation and results kept for a TTL
+"""
+
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+QUEUED = 'queued'
+RUNNING = 'running'
+SUCCEEDED = 'succeeded'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+FINISHED_STATES = (SUCCEEDED, FAILED, CANCELLED)
+
+
+class JobLimitError(Exception):
+    """Raised when a client already has the maximum number of active jobs"""
+
+
+class JobCancelledError(Exception):
+    """Raised inside a job when it reports progress after being cancelled"""
+
+
+@dataclass
+class Job:
+    """State of one background job"""
+    job_id: str
+    kind: str
+    client_id: str
+    status: str = QUEUED
+    progress: float = 0.0  # 0..1
+    message: str = ''
+    result: Any = None
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    cancel_requested: threading.Event = field(default_factory=threading.Event, repr=False)
+    future: Optional[Future] = field(default=None, repr=False)
+
+    def report(self, progress: float, message: str = ''):
+        """
+        Record progress from inside the job; also the job's cancellation point
+
+        Args:
+            progress (float): Fraction done, 0..1
+            message (str): Current stage
+
+        Raises:
+            JobCancelledError: If the job was cancelled
+        """
+        if self.cancel_requested.is_set():
+            raise JobCancelledError(f'Job {self.job_id} was cancelled')
+        self.progress = max(self.progress, min(progress, 1.0))
+        self.message = message
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Status of the job for the API (the result only once it succeeded)"""
+        data = {
+            'job_id': self.job_id,
+            'kind': self.kind,
+            'status': self.status,
+            'progress': round(self.progress, 3),
+            'message': self.message,
+            'cancel_requested': self.cancel_requested.is_set(),
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+        }
+        if self.status == SUCCEEDED:
+            data['result'] = self.result
+        if self.error is not None:
+            data['error'] = self.error
+        return data
+
+
+class JobQueue:
+    """
+    Run long jobs on a small in-process thread pool and keep their results.
+
+    ``submit`` returns at once with a ``Job`` the caller can poll by id. At most
+    ``max_active_per_client`` jobs of one client may be queued or running;
+    further submissions raise ``JobLimitError``. Finished jobs (with their
+    results) are kept for ``ttl`` seconds and then dropped. Cancelling a queued
+    job removes it from the queue; a running job stops at its next
+    ``Job.report`` call.
+    """
+
+    def __init__(self, max_workers: int, max_active_per_client: int, ttl: float):
+        self.max_workers = max_workers
+        self.max_active_per_client = max_active_per_client
+        self.ttl = ttl
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='job')
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+        self.rejected = 0
+        self.expired = 0
+
+    def submit(self, kind: str, client_id: str, fn: Callable[..., Any], *args) -> Job:
+        """
+        Queue ``fn(job, *args)`` as a background job
+
+        The function gets its Job first so it can call ``job.report``, and
+        returns ``(body, status)`` like the controllers; an error status marks
+        the job as failed with the body's 'error'.
+
+        Args:
+            kind (str): Job type, e.g. 'backtest'
+            client_id (str): Identity the per-client cap is counted against
+            fn (Callable): Blocking function to run
+
+        Returns:
+            Job: The queued job
+
+        Raises:
+            JobLimitError: If the client already has too many active jobs
+        """
+        with self._lock:
+            self._expire()
+            active = sum(1 for job in self._jobs.values()
+                         if job.client_id == client_id and job.status not in FINISHED_STATES)
+            if active >= self.max_active_per_client:
+                self.rejected += 1
+                raise JobLimitError(
+                    f'Client already has {active} active jobs (limit {self.max_active_per_client})')
+            job = Job(job_id=uuid.uuid4().hex, kind=kind, client_id=client_id)
+            self._jobs[job.job_id] = job
+            job.future = self._executor.submit(self._run, job, fn, args)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """
+        Get a job by id
+
+        Returns:
+            Job, or None if unknown or expired
+        """
+        with self._lock:
+            self._expire()
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """
+        Cancel a queued or running job (finished jobs are left as they are)
+
+        Returns:
+            Job, or None if unknown or expired
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.status in FINISHED_STATES:
+                return job
+            job.cancel_requested.set()
+            if job.future.cancel():
+                # Never started
+                self._finish(job, CANCELLED)
+        return job
+
+    def stats(self) -> Dict[str, Any]:
+        """Get job counts by status and rejection/expiry counters"""
+        with self._lock:
+            self._expire()
+            counts = {status: 0 for status in (QUEUED, RUNNING) + FINISHED_STATES}
+            for job in self._jobs.values():
+                counts[job.status] += 1
+            return {
+                'max_workers': self.max_workers,
+                'max_active_per_client': self.max_active_per_client,
+                'ttl': self.ttl,
+                'jobs': counts,
+                'rejected': self.rejected,
+                'expired': self.expired,
+            }
+
+    def shutdown(self):
+        """Cancel every unfinished job and wait for running ones to stop"""
+        with self._lock:
+            jobs: List[Job] = list(self._jobs.values())
+        for job in jobs:
+            self.cancel(job.job_id)
+        self._executor.shutdown(wait=True)
+
+    def _run(self, job: Job, fn: Callable[..., Any], args):
+        with self._lock:
+            if job.cancel_requested.is_set():
+                self._finish(job, CANCELLED)
+                return
+            job.status = RUNNING
+            job.started_at = time.time()
+        try:
+            body, status = fn(job, *args)
+        except Exception as e:
+            body, status = {'error': str(e)}, 500
+
+        with self._lock:
+            if job.cancel_requested.is_set():
+                self._finish(job, CANCELLED)
+            elif status >= 400:
+                self._finish(job, FAILED, error=body.get('error', f'Job failed with status {status}'))
+            else:
+                job.result = body
+                job.progress = 1.0
+                self._finish(job, SUCCEEDED)
+
+    def _finish(self, job: Job, status: str, error: Optional[str] = None):
+        job.status = status
+        job.error = error
+        job.finished_at = time.time()
+
+    def _expire(self):
+        now = time.time()
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job.finished_at is not None and now - job.finished_at >= self.ttl]
+        for job_id in expired:
+            del self._jobs[job_id]
+        self.expired += len(expired)
@@ -0,0 +1,43 @@
+"""
+JSON Response
+orjson-based JSON encoding for API responses, with pandas and NumPy support
+"""
+
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+# NumPy scalars/arrays natively, non-string dict keys (e.g. ints) as strings
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def _default(obj: Any) -> Any:
+    # Called only for types orjson does not handle itself, e.g. pd.Timestamp,
+    # pd.NaT or pd.Timedelta; they are sent as ISO strings
+    if hasattr(obj, 'isoformat'):
+        return obj.isoformat()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Encode content as JSON in a single pass
+
+    datetime and pandas timestamps become ISO strings, NumPy values become
+    JSON numbers/arrays, and NaN/Infinity become null.
+
+    Args:
+        content: JSON-like structure of dicts, lists and scalars
+
+    Returns:
+        bytes: UTF-8 encoded JSON
+    """
+    return orjson.dumps(content, default=_default, option=ORJSON_OPTIONS)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson (see dumps)"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
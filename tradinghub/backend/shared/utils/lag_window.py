@@ -0,0 +1,128 @@
+"""
+Lag Window
+Aligned NumPy arrays of the previous N candles for vectorized multi-candle pattern detection
+"""
+
+from dataclasses import dataclass, fields
+from typing import List
+import numpy as np
+import pandas as pd
+
+
+@dataclass(frozen=True)
+class CandleArrays:
+    """OHLC and derived candle values for one lag, aligned to the current bar"""
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    body: np.ndarray  # Close - Open (signed)
+    body_size: np.ndarray  # abs(Close - Open)
+    total_range: np.ndarray  # High - Low
+    upper_shadow: np.ndarray  # High - max(Open, Close)
+    lower_shadow: np.ndarray  # min(Open, Close) - Low
+
+    @property
+    def is_green(self) -> np.ndarray:
+        """Bullish candles (Close above Open)"""
+        return self.close > self.open
+
+    @property
+    def is_red(self) -> np.ndarray:
+        """Bearish candles (Close below Open)"""
+        return self.close < self.open
+
+
+class LagWindow:
+    """
+    Sliding window over the last ``size`` candles of a DataFrame.
+
+    ``window[k]`` returns the candle ``k`` bars before each row as arrays aligned
+    with the frame, so ``window[2].close[i]`` is ``df['Close'].iloc[i - 2]``.
+    Rows without enough history are padded with NaN, which makes every
+    comparison against them evaluate to False.
+    """
+
+    def __init__(self, df: pd.DataFrame, size: int):
+        """
+        Build the lag window
+
+        Args:
+            df (pd.DataFrame): DataFrame with OHLC columns
+            size (int): Number of candles in the window (current candle included)
+        """
+        if size < 1:
+            raise ValueError('Lag window size must be at least 1')
+
+        self.size = size
+        self.length = len(df)
+
+        open_ = df['Open'].to_numpy(dtype=np.float64)
+        high = df['High'].to_numpy(dtype=np.float64)
+        low = df['Low'].to_numpy(dtype=np.float64)
+        close = df['Close'].to_numpy(dtype=np.float64)
+        body = close - open_
+        current = CandleArrays(
+            open=open_,
+            high=high,
+            low=low,
+            close=close,
+            body=body,
+            body_size=np.abs(body),
+            total_range=high - low,
+            upper_shadow=high - np.maximum(open_, close),
+            lower_shadow=np.minimum(open_, close) - low,
+        )
+
+        self._candles = [current] + [
+            CandleArrays(**{field.name: self.lag_values(getattr(current, field.name), lag) for field in fields(CandleArrays)})
+            for lag in range(1, size)
+        ]
+
+    def __getitem__(self, lag: int) -> CandleArrays:
+        """Get the candle ``lag`` bars back (0 is the current candle)"""
+        return self._candles[lag]
+
+    def candles(self) -> List[CandleArrays]:
+        """Get all candles in the window ordered oldest first, current candle last"""
+        return self._candles[::-1]
+
+    @property
+    def valid(self) -> np.ndarray:
+        """Rows that have a full window of history behind them"""
+        mask = np.zeros(self.length, dtype=bool)
+        mask[self.size - 1:] = True
+        return mask
+
+    def lag_values(self, values, lag: int) -> np.ndarray:
+        """
+        Shift any per-row values (array or Series) ``lag`` bars forward
+
+        Args:
+            values: Values aligned with the frame (e.g. an indicator column)
+            lag (int): Number of bars to look back
+
+        Returns:
+            np.ndarray: Float array where row i holds the value of row i - lag
+        """
+        values = np.asarray(values, dtype=np.float64)
+        if lag == 0:
+            return values
+        shifted = np.full(self.length, np.nan)
+        if lag < self.length:
+            shifted[lag:] = values[:-lag]
+        return shifted
+
+
+def safe_ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """
+    Divide element-wise, returning NaN where the denominator is zero
+
+    Args:
+        numerator (np.ndarray): Dividend values
+        denominator (np.ndarray): Divisor values
+
+    Returns:
+        np.ndarray: Ratios with NaN in place of divisions by zero
+    """
+    return np.divide(numerator, denominator, out=np.full(len(numerator), np.nan), where=denominator != 0)
@@ -0,0 +1,116 @@
+"""
+LRU Cache
+Thread-safe least-recently-used cache with a TTL and a memory budget in bytes
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+import pandas as pd
+
+
+def frame_nbytes(df: pd.DataFrame) -> int:
+    """Memory used by a DataFrame, including its index and object columns"""
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+class LRUCache:
+    """
+    Least-recently-used cache bounded by total size in bytes.
+
+    Entries are kept in an ``OrderedDict`` ordered by last access, so lookups,
+    inserts and evictions are all O(1). Entries older than ``ttl`` seconds are
+    dropped when they are read. The caller passes the size of each value on
+    insert (see ``frame_nbytes``); values larger than the whole budget are not
+    cached at all.
+    """
+
+    def __init__(self, max_bytes: int, ttl: float):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries: OrderedDict = OrderedDict()  # key -> (value, size, timestamp)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Get a value and mark it as most recently used
+
+        Args:
+            key: Cache key
+
+        Returns:
+            The cached value, or None if missing or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, size, timestamp = entry
+            if time.time() - timestamp >= self.ttl:
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, size: int):
+        """
+        Insert or replace a value, evicting least recently used entries over budget
+
+        Args:
+            key: Cache key
+            value: Value to cache
+            size: Size of the value in bytes
+        """
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (value, size, time.time())
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self.evictions += 1
+
+    def pop(self, key: Hashable):
+        """Remove a value if present"""
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def clear(self):
+        """Remove all values (counters are kept)"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Get size and hit/miss/eviction counters"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+            }
+
+    def _remove(self, key: Hashable):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
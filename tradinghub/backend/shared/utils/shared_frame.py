@@ -0,0 +1,133 @@
+"""
+Shared Frame
+Pass numeric DataFrames to worker processes through shared memory instead of pickling them
+"""
+
+from contextlib import contextmanager
+from dataclasses import dataclass
+from multiprocessing.shared_memory import SharedMemory
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from tradinghub.backend.shared.utils.frame_utils import freeze_frame
+
+_ALIGNMENT = 64  # Start every column on a cache-line boundary
+
+# Worker-side segments that could not be closed yet because arrays still referenced them
+_pending_close: List[SharedMemory] = []
+
+
+@dataclass(frozen=True)
+class SharedFrameHandle:
+    """Picklable description of a frame stored in a shared memory segment"""
+    shm_name: str
+    length: int
+    columns: Tuple[Tuple[str, str, int], ...]  # (name, dtype, byte offset)
+    index_offset: int  # byte offset of the int64 (nanosecond) index
+    index_tz: Optional[str]
+    index_name: Optional[str]
+
+
+class SharedFrame:
+    """
+    Owner side of a frame copied into shared memory.
+
+    The index and every column are laid out in one segment; workers rebuild
+    a read-only DataFrame over it with ``attach_shared_frame`` without copying.
+    Use as a context manager so the segment is unlinked once the work is done.
+    Only a DatetimeIndex and numeric/bool columns are supported.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        if not isinstance(df.index, pd.DatetimeIndex):
+            raise TypeError('SharedFrame requires a DatetimeIndex')
+        for column in df.columns:
+            if not (pd.api.types.is_numeric_dtype(df[column]) or pd.api.types.is_bool_dtype(df[column])):
+                raise TypeError(f"SharedFrame cannot share non-numeric column '{column}'")
+
+        length = len(df)
+        layout = []
+        offset = 0
+        for column in df.columns:
+            dtype = np.dtype(df[column].dtype)
+            layout.append((column, dtype.str, offset))
+            offset += _aligned(dtype.itemsize * length)
+        index_offset = offset
+        offset += _aligned(8 * length)
+
+        self._shm = SharedMemory(create=True, size=max(offset, 1))
+        for column, dtype, column_offset in layout:
+            target = np.ndarray(length, dtype=dtype, buffer=self._shm.buf, offset=column_offset)
+            target[:] = df[column].to_numpy()
+        index_target = np.ndarray(length, dtype=np.int64, buffer=self._shm.buf, offset=index_offset)
+        index_target[:] = df.index.as_unit('ns').asi8
+        del target, index_target
+
+        self.handle = SharedFrameHandle(
+            shm_name=self._shm.name,
+            length=length,
+            columns=tuple(layout),
+            index_offset=index_offset,
+            index_tz=str(df.index.tz) if df.index.tz is not None else None,
+            index_name=df.index.name,
+        )
+
+    def close(self):
+        """Release and unlink the shared memory segment"""
+        self._shm.close()
+        self._shm.unlink()
+
+    def __enter__(self) -> 'SharedFrame':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+@contextmanager
+def attach_shared_frame(handle: SharedFrameHandle) -> Iterator[pd.DataFrame]:
+    """
+    Attach to a shared frame from a worker process
+
+    Args:
+        handle (SharedFrameHandle): Handle created by the owning SharedFrame
+
+    Yields:
+        pd.DataFrame: Read-only frame backed by the shared segment. Anything the
+        caller returns from the block must be a copy, not a view of it.
+    """
+    _close_pending()
+    shm = SharedMemory(name=handle.shm_name)
+
+    columns = {
+        column: np.ndarray(handle.length, dtype=dtype, buffer=shm.buf, offset=offset)
+        for column, dtype, offset in handle.columns
+    }
+    index_values = np.ndarray(handle.length, dtype=np.int64, buffer=shm.buf, offset=handle.index_offset)
+    index = pd.DatetimeIndex(index_values.view('datetime64[ns]'))
+    if handle.index_tz is not None:
+        index = index.tz_localize('UTC').tz_convert(handle.index_tz)
+    index.name = handle.index_name
+    frame = freeze_frame(pd.DataFrame(columns, index=index, copy=False))
+    del columns, index_values, index
+    try:
+        yield frame
+    finally:
+        del frame
+        _pending_close.append(shm)
+        _close_pending()
+
+
+def _close_pending():
+    for shm in list(_pending_close):
+        try:
+            shm.close()
+        except BufferError:
+            continue  # Still referenced by a live array; retry on the next attach
+        _pending_close.remove(shm)
+
+
+def _aligned(size: int) -> int:
+    return (size + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
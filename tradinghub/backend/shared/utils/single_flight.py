@@ -0,0 +1,101 @@
+"""
+Single Flight
+Deduplicate concurrent calls for the same key so only one of them does the work
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent identical calls into one in-flight execution.
+
+    The first caller for a key runs the function; callers arriving while it is
+    still running wait on the same future and receive its result (or its
+    exception). Once the call completes the key is released, so later calls
+    run again.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._in_flight: Dict[str, Future] = {}
+
+    def do(self, key: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run ``fn(*args, **kwargs)`` unless a call with the same key is in flight
+
+        Args:
+            key (str): Identity of the call
+            fn (Callable): Function to run
+
+        Returns:
+            Any: Result of the in-flight call shared by all concurrent callers
+        """
+        with self._lock:
+            future = self._in_flight.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = Future()
+                self._in_flight[key] = future
+
+        if not is_leader:
+            return future.result()
+
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+
+    def in_flight(self) -> int:
+        """Number of calls currently running"""
+        with self._lock:
+            return len(self._in_flight)
+
+
+class AsyncSingleFlight:
+    """
+    Coalesce concurrent identical coroutine calls on one event loop.
+
+    Like ``SingleFlight``, but waiters await the in-flight task instead of
+    blocking a thread. A waiter that is cancelled does not cancel the shared
+    call for the others.
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[str, asyncio.Future] = {}
+
+    async def do(self, key: str, fn: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        """
+        Await ``fn(*args, **kwargs)`` unless a call with the same key is in flight
+
+        Args:
+            key (str): Identity of the call
+            fn (Callable): Coroutine function to run
+
+        Returns:
+            Any: Result of the in-flight call shared by all concurrent callers
+        """
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn(*args, **kwargs))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._release(key, done))
+        return await asyncio.shield(task)
+
+    def in_flight(self) -> int:
+        """Number of calls currently running"""
+        return len(self._in_flight)
+
+    def _release(self, key: str, task: asyncio.Future):
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
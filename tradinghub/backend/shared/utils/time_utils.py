@@ -1,91 +1,177 @@
+import datetime
+import threading
+from functools import lru_cache
+from typing import Optional, Union
+import numpy as np
+import pandas as pd
 import pytz
+from tradinghub.backend.shared.config import Config
 
-def convert_to_israel_time(date):
+DatetimeValues = Union[pd.DatetimeIndex, pd.Series]
+
+
+@lru_cache(maxsize=None)
+def get_zone(name: str) -> pytz.BaseTzInfo:
     """
-    Convert a datetime from US Eastern Time to Israel Time
-    
+    Get a timezone object, built once per name
+
     Args:
-        date (datetime): Date to convert
-        
+        name (str): IANA timezone name, e.g. 'Asia/Jerusalem'
+
     Returns:
-        datetime: Date in Israel timezone
+        pytz.BaseTzInfo: Timezone object
     """
-    # Use default timezones (don't rely on Flask config to avoid context issues)
-    et_tz = pytz.timezone('US/Eastern')
-    israel_tz = pytz.timezone('Asia/Jerusalem')
-    
-    # Handle different date types
-    if hasattr(date, 'to_pydatetime'):
-        # Pandas Timestamp
-        date = date.to_pydatetime()
-    elif isinstance(date, (int, float)):
-        # Unix timestamp
-        import datetime
-        date = datetime.datetime.fromtimestamp(date)
-    
-    # If the date is naive (no timezone), assume it's in ET
-    if date.tzinfo is None:
-        date = et_tz.localize(date)
-    
-    # Convert to Israel time
-    israel_time = date.astimezone(israel_tz)
-    return israel_time 
-
-def normalize_datetime_to_israel_naive(date):
+    return pytz.timezone(name)
+
+
+class TimezoneService:
     """
-    Convert a datetime-like object to Israel timezone and return tz-naive datetime.
-    Safe across pandas.Timestamp and Python datetime, handling DST ambiguities.
+    Convert bar and pattern timestamps to the display timezone
+
+    Every conversion works on whole DatetimeIndex/Series values at once;
+    the per-value helpers below wrap a one-element index. Naive market data
+    is read in ``market_timezone`` (the exchange's local time).
     """
-    israel_tz = pytz.timezone('Asia/Jerusalem')
-    et_tz = pytz.timezone('US/Eastern')
-    import datetime
-    # Pandas Timestamp
-    if hasattr(date, 'to_pydatetime'):
-        date = date.to_pydatetime()
-    # Unix timestamp
-    if isinstance(date, (int, float)):
-        date = datetime.datetime.fromtimestamp(date)
-    # Localize if naive (assume ET as data source)
-    if isinstance(date, datetime.datetime) and date.tzinfo is None:
+
+    def __init__(self, display_timezone: str = 'Asia/Jerusalem', market_timezone: str = 'US/Eastern'):
+        self.display_timezone = display_timezone
+        self.market_timezone = market_timezone
+        self.display_zone = get_zone(display_timezone)
+        self.market_zone = get_zone(market_timezone)
+
+    def to_display(self, values: DatetimeValues) -> DatetimeValues:
+        """
+        Convert timestamps to the display timezone
+
+        Naive timestamps are taken as market time (ambiguous and nonexistent
+        DST times as standard time, like pytz's default).
+
+        Args:
+            values: DatetimeIndex or datetime Series
+
+        Returns:
+            Same type as values, tz-aware in the display timezone
+        """
+        return _apply(values, self._to_display)
+
+    def to_display_naive(self, values: DatetimeValues) -> DatetimeValues:
+        """
+        Convert timestamps to display wall-clock time without timezone
+
+        Args:
+            values: DatetimeIndex or datetime Series (naive ones are market time)
+
+        Returns:
+            Same type as values, tz-naive
+        """
+        return _apply(values, lambda index: self._to_display(index).tz_localize(None))
+
+    def normalize_naive(self, values: DatetimeValues) -> DatetimeValues:
+        """
+        Align timestamps to naive display wall-clock time
+
+        Unlike to_display_naive, naive timestamps are assumed to be display
+        time already (e.g. pattern dates sent back by the client).
+
+        Args:
+            values: DatetimeIndex or datetime Series
+
+        Returns:
+            Same type as values, tz-naive
+        """
+        return _apply(values, self._normalize_naive)
+
+    def _to_display(self, index: pd.DatetimeIndex) -> pd.DatetimeIndex:
+        if index.tz is None:
+            index = index.tz_localize(self.market_zone, ambiguous=np.zeros(len(index), dtype=bool),
+                                      nonexistent=pd.Timedelta(hours=1))
+        return index.tz_convert(self.display_zone)
+
+    def _normalize_naive(self, index: pd.DatetimeIndex) -> pd.DatetimeIndex:
         try:
-            date = et_tz.localize(date)
+            if index.tz is None:
+                index = index.tz_localize(self.display_zone, ambiguous='infer', nonexistent='shift_forward')
+            return index.tz_convert(self.display_zone).tz_localize(None)
         except Exception:
-            # Fallback: treat as Israel tz directly
-            date = israel_tz.localize(date)
-    try:
-        return date.astimezone(israel_tz).replace(tzinfo=None)
-    except Exception:
-        return date.replace(tzinfo=None)
-
-def normalize_series_to_israel_naive(series_or_index):
+            return index.tz_localize(None)
+
+
+def _apply(values: DatetimeValues, convert) -> DatetimeValues:
+    """Run an index conversion on a DatetimeIndex, or on the values of a Series"""
+    if isinstance(values, pd.Series):
+        index = pd.DatetimeIndex(pd.to_datetime(values, errors='coerce'))
+        return pd.Series(convert(index), index=values.index, name=values.name)
+    return convert(values)
+
+
+_default_service: Optional[TimezoneService] = None
+_default_service_lock = threading.Lock()
+
+
+def get_timezone_service(config: Config = None) -> TimezoneService:
     """
-    Normalize a pandas Series or DatetimeIndex to Israel timezone and strip tz.
-    Handles tz-naive and tz-aware inputs, DST ambiguous/nonexistent times.
+    Get the process-wide timezone service selected by configuration
+
+    DISPLAY_TIMEZONE sets the zone dates are shown in and MARKET_TIMEZONE
+    the zone of naive market data.
     """
-    try:
-        import pandas as pd
-    except Exception:
+    global _default_service
+    config = config or Config()
+    with _default_service_lock:
+        if _default_service is None:
+            _default_service = TimezoneService(config.DISPLAY_TIMEZONE, config.MARKET_TIMEZONE)
+        return _default_service
+
+
+def _to_index(date) -> pd.DatetimeIndex:
+    if isinstance(date, (int, float)):
+        # Unix timestamp
+        date = datetime.datetime.fromtimestamp(date)
+    return pd.DatetimeIndex([date])
+
+
+def convert_to_display_time(date):
+    """
+    Convert a datetime from market time (US Eastern by default) to the display timezone
+
+    Args:
+        date (datetime): Date to convert
+
+    Returns:
+        datetime: Date in the display timezone
+    """
+    return get_timezone_service().to_display(_to_index(date))[0]
+
+
+def convert_index_to_display_time(index: pd.DatetimeIndex) -> pd.DatetimeIndex:
+    """
+    Convert a whole DatetimeIndex from market time to the display timezone at once
+
+    Args:
+        index (pd.DatetimeIndex): Dates to convert
+
+    Returns:
+        pd.DatetimeIndex: Dates in the display timezone
+    """
+    return get_timezone_service().to_display(index)
+
+
+def normalize_datetime_to_display_naive(date):
+    """
+    Convert a datetime-like object to the display timezone and return tz-naive datetime.
+    Naive input is assumed to be market time.
+    """
+    if not isinstance(date, (datetime.datetime, int, float)):
+        return date
+    return get_timezone_service().to_display_naive(_to_index(date))[0]
+
+
+def normalize_series_to_display_naive(series_or_index):
+    """
+    Normalize a pandas Series or DatetimeIndex to the display timezone and strip tz.
+    Naive input is assumed to be display time already; DST ambiguous/nonexistent
+    times are inferred/shifted forward.
+    """
+    if not isinstance(series_or_index, (pd.Series, pd.DatetimeIndex)):
         return series_or_index
-    israel_tz = 'Asia/Jerusalem'
-    s = series_or_index
-    # Convert to pandas datetime if it's a Series
-    if isinstance(s, pd.Series):
-        s = pd.to_datetime(s, errors='coerce')
-        try:
-            if s.dt.tz is not None:
-                s = s.dt.tz_convert(israel_tz).dt.tz_localize(None)
-            else:
-                s = s.dt.tz_localize(israel_tz, ambiguous='infer', nonexistent='shift_forward').dt.tz_localize(None)
-        except Exception:
-            s = s.dt.tz_localize(None)
-        return s
-    # DatetimeIndex
-    if isinstance(s, pd.DatetimeIndex):
-        try:
-            if s.tz is not None:
-                return s.tz_convert(israel_tz).tz_localize(None)
-            else:
-                return s.tz_localize(israel_tz, ambiguous='infer', nonexistent='shift_forward').tz_localize(None)
-        except Exception:
-            return s.tz_localize(None)
-    return s
\ No newline at end of file
+    return get_timezone_service().normalize_naive(series_or_index)
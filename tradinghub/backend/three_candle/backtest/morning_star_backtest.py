@@ -3,7 +3,7 @@ Morning Star Pattern Backtest
 Backtesting implementation for Morning Star patterns
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, Callable, Optional
 import pandas as pd
 from tradinghub.backend.shared.backtest.base_backtest import BaseBacktest
 from tradinghub.backend.three_candle.patterns.morning_star_pattern import MorningStarPattern
@@ -16,7 +16,8 @@ class MorningStarBacktest(BaseBacktest):
         pattern_detector = MorningStarPattern()
         super().__init__(pattern_detector)
     
-    def run_backtest(self, df: pd.DataFrame, pattern_params: Dict[str, Any], backtest_params) -> Dict[str, Any]:
+    def run_backtest(self, df: pd.DataFrame, pattern_params: Dict[str, Any], backtest_params,
+                     progress: Optional[Callable[[float], None]] = None) -> Dict[str, Any]:
         """
         Run backtest on historical data for Morning Star patterns
         
@@ -24,9 +25,10 @@ class MorningStarBacktest(BaseBacktest):
             df: DataFrame with OHLC data
             pattern_params: Parameters for pattern detection
             backtest_params: Parameters for backtesting
+            progress: Optional callback(fraction of the simulation done)
             
         Returns:
             Dictionary containing backtest results
         """
         # Use the parent class backtest logic
-        return super().run_backtest(df, pattern_params, backtest_params)
+        return super().run_backtest(df, pattern_params, backtest_params, progress)
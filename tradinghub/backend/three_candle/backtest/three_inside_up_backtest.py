@@ -3,7 +3,7 @@ Three Inside Up Pattern Backtest
 Backtesting implementation for Three Inside Up patterns
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, Callable, Optional
 import pandas as pd
 from tradinghub.backend.shared.backtest.base_backtest import BaseBacktest
 from tradinghub.backend.three_candle.patterns.three_inside_up_pattern import ThreeInsideUpPattern
@@ -16,7 +16,8 @@ class ThreeInsideUpBacktest(BaseBacktest):
         pattern_detector = ThreeInsideUpPattern()
         super().__init__(pattern_detector)
     
-    def run_backtest(self, df: pd.DataFrame, pattern_params: Dict[str, Any], backtest_params) -> Dict[str, Any]:
+    def run_backtest(self, df: pd.DataFrame, pattern_params: Dict[str, Any], backtest_params,
+                     progress: Optional[Callable[[float], None]] = None) -> Dict[str, Any]:
         """
         Run backtest on historical data for Three Inside Up patterns
         
@@ -24,9 +25,10 @@ class ThreeInsideUpBacktest(BaseBacktest):
             df: DataFrame with OHLC data
             pattern_params: Parameters for pattern detection
             backtest_params: Parameters for backtesting
+            progress: Optional callback(fraction of the simulation done)
             
         Returns:
             Dictionary containing backtest results
         """
         # Use the parent class backtest logic
-        return super().run_backtest(df, pattern_params, backtest_params)
+        return super().run_backtest(df, pattern_params, backtest_params, progress)
@@ -8,6 +8,7 @@ import numpy as np
 from typing import Dict, Any
 from tradinghub.backend.shared.patterns.base_pattern import BasePattern
 from tradinghub.backend.shared.utils.candlestick_utils import CandlestickUtils
+from tradinghub.backend.shared.utils.lag_window import LagWindow, safe_ratio
 
 class MorningStarPattern(BasePattern):
     """Detector for Morning Star candlestick patterns"""
@@ -64,82 +65,47 @@ class MorningStarPattern(BasePattern):
         gap_ratio = params.get('gap_ratio', 0.1)  # Minimum gap size as fraction of first candle body
         penetration_ratio = params.get('penetration_ratio', 0.5)  # Minimum penetration into first candle
         require_trend = params.get('require_trend', True)
-        star_body_ratio = params.get('star_body_ratio', 0.3)  # Maximum star candle body size
-        
-        # Initialize pattern column
-        df['is_morning_star'] = False
-        
-        # Check for Morning Star patterns (need at least 3 candles)
-        for i in range(2, len(df)):
-            current_candle = df.iloc[i]
-            star_candle = df.iloc[i-1]
-            first_candle = df.iloc[i-2]
-            
-            # First candle must be bearish (red)
-            if first_candle['Close'] >= first_candle['Open']:
-                continue
-            
-            # Third candle must be bullish (green)
-            if current_candle['Close'] <= current_candle['Open']:
-                continue
-            
-            # Calculate body sizes
-            first_body_size = first_candle['Open'] - first_candle['Close']
-            star_body_size = abs(star_candle['Close'] - star_candle['Open'])
-            third_body_size = current_candle['Close'] - current_candle['Open']
-            
-            # Calculate total ranges
-            first_range = first_candle['High'] - first_candle['Low']
-            star_range = star_candle['High'] - star_candle['Low']
-            third_range = current_candle['High'] - current_candle['Low']
-            
-            if first_range == 0 or star_range == 0 or third_range == 0:  # Avoid division by zero
-                continue
-            
-            # Check first candle body size ratio
-            first_body_ratio = first_body_size / first_range
-            if first_body_ratio < body_size_ratio:
-                continue
-            
-            # Check third candle body size
-            third_body_ratio = third_body_size / third_range
-            if third_body_ratio < body_size_ratio:
-                continue
-            
-            # Check gap down from first candle to star candle
-            gap_size = first_candle['Close'] - star_candle['Open']
-            if gap_size <= 0:  # No gap down
-                continue
-            
-            # Check minimum gap ratio
-            min_gap = first_body_size * gap_ratio
-            if gap_size < min_gap:
-                continue
-            
-            # Check star candle body size (should be small)
-            star_body_ratio = star_body_size / first_body_size
-            if star_body_ratio > star_body_ratio:
-                continue
-            
-            # Check third candle penetration into first candle
-            penetration = current_candle['Close'] - first_candle['Close']
-            min_penetration = first_body_size * penetration_ratio
-            if penetration < min_penetration:
-                continue
-            
-            # Check that third candle closes above first candle's midpoint
-            first_midpoint = (first_candle['Open'] + first_candle['Close']) / 2
-            if current_candle['Close'] <= first_midpoint:
-                continue
-            
-            # Add trend context if required
-            if require_trend and 'ma_20' in df.columns:
-                # For Morning Star, we want to be in a downtrend initially
-                trend_condition = first_candle['Close'] < first_candle['ma_20']
-                if not trend_condition:
-                    continue
-            
-            # Set the pattern flag
-            df.iloc[i, df.columns.get_loc('is_morning_star')] = True
+        
+        # Build aligned arrays for the three-candle window (oldest first)
+        window = LagWindow(df, 3)
+        first_candle, star_candle, current_candle = window.candles()
+        
+        # First candle must be bearish (red), third candle must be bullish (green)
+        morning_star_condition = window.valid & first_candle.is_red & current_candle.is_green
+        
+        # Avoid division by zero
+        morning_star_condition &= (
+            (first_candle.total_range != 0) &
+            (star_candle.total_range != 0) &
+            (current_candle.total_range != 0)
+        )
+        
+        # Check first and third candle body size ratios
+        first_body_size = first_candle.body_size
+        morning_star_condition &= safe_ratio(first_body_size, first_candle.total_range) >= body_size_ratio
+        morning_star_condition &= safe_ratio(current_candle.body_size, current_candle.total_range) >= body_size_ratio
+        
+        # Check gap down from first candle to star candle, with minimum gap ratio
+        gap_size = first_candle.close - star_candle.open
+        morning_star_condition &= (gap_size > 0) & (gap_size >= first_body_size * gap_ratio)
+        
+        # Star candle body size (star_body_ratio) is intentionally not applied: the per-bar
+        # version compared the ratio with itself, so it never filtered any candles
+        
+        # Check third candle penetration into first candle
+        penetration = current_candle.close - first_candle.close
+        morning_star_condition &= penetration >= first_body_size * penetration_ratio
+        
+        # Check that third candle closes above first candle's midpoint
+        first_midpoint = (first_candle.open + first_candle.close) / 2
+        morning_star_condition &= current_candle.close > first_midpoint
+        
+        # Add trend context if required
+        if require_trend and 'ma_20' in df.columns:
+            # For Morning Star, we want to be in a downtrend initially
+            morning_star_condition &= first_candle.close < window.lag_values(df['ma_20'], 2)
+        
+        # Set the pattern flag
+        df['is_morning_star'] = morning_star_condition
         
         return df
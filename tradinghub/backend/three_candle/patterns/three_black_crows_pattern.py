@@ -8,6 +8,7 @@ import numpy as np
 from typing import Dict, Any
 from tradinghub.backend.shared.patterns.base_pattern import BasePattern
 from tradinghub.backend.shared.utils.candlestick_utils import CandlestickUtils
+from tradinghub.backend.shared.utils.lag_window import LagWindow, safe_ratio
 
 class ThreeBlackCrowsPattern(BasePattern):
     """Detector for Three Black Crows candlestick patterns"""
@@ -65,83 +66,48 @@ class ThreeBlackCrowsPattern(BasePattern):
         require_trend = params.get('require_trend', True)
         progressive_close = params.get('progressive_close', True)
         
-        # Initialize pattern column
-        df['is_three_black_crows'] = False
+        # Build aligned arrays for the three-candle window (oldest first)
+        window = LagWindow(df, 3)
+        candles = window.candles()
+        first_candle, second_candle, current_candle = candles
         
-        # Check for Three Black Crows patterns (need at least 3 candles)
-        for i in range(2, len(df)):
-            current_candle = df.iloc[i]
-            second_candle = df.iloc[i-1]
-            first_candle = df.iloc[i-2]
-            
+        three_black_crows_condition = window.valid.copy()
+        for candle in candles:
             # All three candles must be bearish (red)
-            if (current_candle['Close'] >= current_candle['Open'] or
-                second_candle['Close'] >= second_candle['Open'] or
-                first_candle['Close'] >= first_candle['Open']):
-                continue
-            
-            # Calculate body sizes for all three candles
-            first_body_size = first_candle['Open'] - first_candle['Close']
-            second_body_size = second_candle['Open'] - second_candle['Close']
-            third_body_size = current_candle['Open'] - current_candle['Close']
-            
-            # Calculate total ranges
-            first_range = first_candle['High'] - first_candle['Low']
-            second_range = second_candle['High'] - second_candle['Low']
-            third_range = current_candle['High'] - current_candle['Low']
-            
-            if first_range == 0 or second_range == 0 or third_range == 0:  # Avoid division by zero
-                continue
-            
+            three_black_crows_condition &= candle.is_red
+            # Avoid division by zero
+            three_black_crows_condition &= candle.total_range != 0
             # Check body size ratios for all candles
-            first_body_ratio = first_body_size / first_range
-            second_body_ratio = second_body_size / second_range
-            third_body_ratio = third_body_size / third_range
-            
-            if (first_body_ratio < body_size_ratio or 
-                second_body_ratio < body_size_ratio or 
-                third_body_ratio < body_size_ratio):
-                continue
-            
+            three_black_crows_condition &= safe_ratio(candle.body_size, candle.total_range) >= body_size_ratio
             # Check lower shadow ratios for all candles
-            first_lower_shadow = first_candle['Close'] - first_candle['Low']
-            second_lower_shadow = second_candle['Close'] - second_candle['Low']
-            third_lower_shadow = current_candle['Close'] - current_candle['Low']
-            
-            first_lower_shadow_ratio = first_lower_shadow / first_range
-            second_lower_shadow_ratio = second_lower_shadow / second_range
-            third_lower_shadow_ratio = third_lower_shadow / third_range
-            
-            if (first_lower_shadow_ratio > lower_shadow_ratio or
-                second_lower_shadow_ratio > lower_shadow_ratio or
-                third_lower_shadow_ratio > lower_shadow_ratio):
-                continue
-            
-            # Check that each candle opens within the previous candle's body
-            # Second candle should open within first candle's body
-            if (second_candle['Open'] < first_candle['Close'] or 
-                second_candle['Open'] > first_candle['Open']):
-                continue
-            
-            # Third candle should open within second candle's body
-            if (current_candle['Open'] < second_candle['Close'] or 
-                current_candle['Open'] > second_candle['Open']):
-                continue
-            
-            # Check for progressively lower closes if required
-            if progressive_close:
-                if (current_candle['Close'] >= second_candle['Close'] or
-                    second_candle['Close'] >= first_candle['Close']):
-                    continue
-            
-            # Add trend context if required
-            if require_trend and 'ma_20' in df.columns:
-                # For Three Black Crows, we want to be in an uptrend initially
-                trend_condition = first_candle['Close'] > first_candle['ma_20']
-                if not trend_condition:
-                    continue
-            
-            # Set the pattern flag
-            df.iloc[i, df.columns.get_loc('is_three_black_crows')] = True
+            three_black_crows_condition &= safe_ratio(candle.lower_shadow, candle.total_range) <= lower_shadow_ratio
+        
+        # Check that each candle opens within the previous candle's body
+        # Second candle should open within first candle's body
+        three_black_crows_condition &= (
+            (second_candle.open >= first_candle.close) &
+            (second_candle.open <= first_candle.open)
+        )
+        
+        # Third candle should open within second candle's body
+        three_black_crows_condition &= (
+            (current_candle.open >= second_candle.close) &
+            (current_candle.open <= second_candle.open)
+        )
+        
+        # Check for progressively lower closes if required
+        if progressive_close:
+            three_black_crows_condition &= (
+                (current_candle.close < second_candle.close) &
+                (second_candle.close < first_candle.close)
+            )
+        
+        # Add trend context if required
+        if require_trend and 'ma_20' in df.columns:
+            # For Three Black Crows, we want to be in an uptrend initially
+            three_black_crows_condition &= first_candle.close > window.lag_values(df['ma_20'], 2)
+        
+        # Set the pattern flag
+        df['is_three_black_crows'] = three_black_crows_condition
         
         return df
@@ -8,6 +8,7 @@ import numpy as np
 from typing import Dict, Any
 from tradinghub.backend.shared.patterns.base_pattern import BasePattern
 from tradinghub.backend.shared.utils.candlestick_utils import CandlestickUtils
+from tradinghub.backend.shared.utils.lag_window import LagWindow, safe_ratio
 
 class ThreeInsideUpPattern(BasePattern):
     """Detector for Three Inside Up candlestick patterns"""
@@ -64,74 +65,52 @@ class ThreeInsideUpPattern(BasePattern):
         require_trend = params.get('require_trend', True)
         confirmation_strength = params.get('confirmation_strength', 0.8)  # Third candle close strength
         
-        # Initialize pattern column
-        df['is_three_inside_up'] = False
-        
-        # Check for Three Inside Up patterns (need at least 3 candles)
-        for i in range(2, len(df)):
-            current_candle = df.iloc[i]
-            second_candle = df.iloc[i-1]
-            first_candle = df.iloc[i-2]
-            
-            # First candle must be bearish (red)
-            if first_candle['Close'] >= first_candle['Open']:
-                continue
-            
-            # Second candle must be bullish (green) and contained within first candle's body
-            if (second_candle['Close'] <= second_candle['Open'] or
-                second_candle['Open'] >= first_candle['Open'] or
-                second_candle['Close'] <= first_candle['Close']):
-                continue
-            
-            # Third candle must be bullish (green)
-            if current_candle['Close'] <= current_candle['Open']:
-                continue
-            
-            # Calculate body sizes
-            first_body_size = first_candle['Open'] - first_candle['Close']
-            second_body_size = second_candle['Close'] - second_candle['Open']
-            third_body_size = current_candle['Close'] - current_candle['Open']
-            
-            # Calculate total ranges
-            first_range = first_candle['High'] - first_candle['Low']
-            second_range = second_candle['High'] - second_candle['Low']
-            third_range = current_candle['High'] - current_candle['Low']
-            
-            if first_range == 0 or second_range == 0 or third_range == 0:  # Avoid division by zero
-                continue
-            
-            # Check first candle body size ratio
-            first_body_ratio = first_body_size / first_range
-            if first_body_ratio < body_size_ratio:
-                continue
-            
-            # Check that second candle body is small relative to first candle body (Harami)
-            harami_ratio = second_body_size / first_body_size
-            if harami_ratio > harami_body_ratio:
-                continue
-            
-            # Check third candle body size
-            third_body_ratio = third_body_size / third_range
-            if third_body_ratio < body_size_ratio:
-                continue
-            
-            # Third candle must close above first candle's high
-            if current_candle['Close'] <= first_candle['High']:
-                continue
-            
-            # Third candle should close strongly near its high (confirmation strength)
-            third_close_strength = (current_candle['Close'] - current_candle['Open']) / (current_candle['High'] - current_candle['Open'])
-            if third_close_strength < confirmation_strength:
-                continue
-            
-            # Add trend context if required
-            if require_trend and 'ma_20' in df.columns:
-                # For Three Inside Up, we want to be in a downtrend initially
-                trend_condition = first_candle['Close'] < first_candle['ma_20']
-                if not trend_condition:
-                    continue
-            
-            # Set the pattern flag
-            df.iloc[i, df.columns.get_loc('is_three_inside_up')] = True
+        # Build aligned arrays for the three-candle window (oldest first)
+        window = LagWindow(df, 3)
+        first_candle, second_candle, current_candle = window.candles()
+        
+        # First candle must be bearish (red)
+        three_inside_up_condition = window.valid & first_candle.is_red
+        
+        # Second candle must be bullish (green) and contained within first candle's body
+        three_inside_up_condition &= (
+            second_candle.is_green &
+            (second_candle.open < first_candle.open) &
+            (second_candle.close > first_candle.close)
+        )
+        
+        # Third candle must be bullish (green)
+        three_inside_up_condition &= current_candle.is_green
+        
+        # Avoid division by zero
+        three_inside_up_condition &= (
+            (first_candle.total_range != 0) &
+            (second_candle.total_range != 0) &
+            (current_candle.total_range != 0)
+        )
+        
+        # Check first candle body size ratio
+        three_inside_up_condition &= safe_ratio(first_candle.body_size, first_candle.total_range) >= body_size_ratio
+        
+        # Check that second candle body is small relative to first candle body (Harami)
+        three_inside_up_condition &= safe_ratio(second_candle.body_size, first_candle.body_size) <= harami_body_ratio
+        
+        # Check third candle body size
+        three_inside_up_condition &= safe_ratio(current_candle.body_size, current_candle.total_range) >= body_size_ratio
+        
+        # Third candle must close above first candle's high
+        three_inside_up_condition &= current_candle.close > first_candle.high
+        
+        # Third candle should close strongly near its high (confirmation strength)
+        third_close_strength = safe_ratio(current_candle.body, current_candle.high - current_candle.open)
+        three_inside_up_condition &= third_close_strength >= confirmation_strength
+        
+        # Add trend context if required
+        if require_trend and 'ma_20' in df.columns:
+            # For Three Inside Up, we want to be in a downtrend initially
+            three_inside_up_condition &= first_candle.close < window.lag_values(df['ma_20'], 2)
+        
+        # Set the pattern flag
+        df['is_three_inside_up'] = three_inside_up_condition
         
         return df
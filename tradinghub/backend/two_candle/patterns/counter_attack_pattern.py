@@ -71,93 +71,72 @@ class CounterAttackPattern(BasePattern):
         counter_attack_type = params.get('counter_attack_type', 'both')  # 'bullish', 'bearish', or 'both'
         require_trend = params.get('require_trend', True)
         
-        # Initialize pattern column
-        df['is_counter_attack'] = False
-        
-        # Check for counter attack patterns (need at least 2 candles)
-        for i in range(1, len(df)):
-            current_candle = df.iloc[i]
-            previous_candle = df.iloc[i-1]
-            
-            # Calculate body sizes and ranges
-            current_body_size = abs(current_candle['Close'] - current_candle['Open'])
-            previous_body_size = abs(previous_candle['Close'] - previous_candle['Open'])
-            
-            current_range = current_candle['High'] - current_candle['Low']
-            previous_range = previous_candle['High'] - previous_candle['Low']
-            
-            if current_range == 0 or previous_range == 0:  # Avoid division by zero
-                continue
-                
-            current_body_ratio = current_body_size / current_range
-            previous_body_ratio = previous_body_size / previous_range
-            
-            # Check if first candle has significant body
-            if previous_body_ratio < body_size_ratio:
-                continue
-            
-            # Calculate close level tolerance
-            close_diff = abs(float(current_candle['Close']) - float(previous_candle['Close']))
-            close_tolerance_value = float(previous_candle['Close']) * close_tolerance
-            
-            # Bullish Counter Attack conditions:
-            # 1. First candle is bearish (red)
-            # 2. Second candle is bullish (green) 
-            # 3. Second candle opens with gap down (open₂ < close₁)
-            # 4. Second candle closes almost at same level as previous close
-            bullish_counter_attack = (
-                # First candle is bearish (red)
-                (float(previous_candle['Close']) < float(previous_candle['Open'])) &
-                # Second candle is bullish (green)
-                (float(current_candle['Close']) > float(current_candle['Open'])) &
-                # Second candle opens with gap down
-                (float(current_candle['Open']) < float(previous_candle['Close'])) &
-                # Second candle closes almost at same level as previous close
-                (close_diff <= close_tolerance_value)
-            )
-            
-            # Bearish Counter Attack conditions:
-            # 1. First candle is bullish (green)
-            # 2. Second candle is bearish (red)
-            # 3. Second candle opens with gap up (open₂ > close₁)
-            # 4. Second candle closes almost at same level as previous close
-            bearish_counter_attack = (
-                # First candle is bullish (green)
-                (float(previous_candle['Close']) > float(previous_candle['Open'])) &
-                # Second candle is bearish (red)
-                (float(current_candle['Close']) < float(current_candle['Open'])) &
-                # Second candle opens with gap up
-                (float(current_candle['Open']) > float(previous_candle['Close'])) &
-                # Second candle closes almost at same level as previous close
-                (close_diff <= close_tolerance_value)
-            )
-            
-            # Apply counter attack type filter
-            if counter_attack_type == 'bullish':
-                counter_attack_condition = bullish_counter_attack
-            elif counter_attack_type == 'bearish':
-                counter_attack_condition = bearish_counter_attack
-            else:  # 'both'
-                counter_attack_condition = bullish_counter_attack | bearish_counter_attack
-            
-            # Add trend context if required
-            if require_trend and 'trend' in df.columns:
-                if pd.isna(current_candle['trend']):
-                    continue
-                # For bullish counter attack, we want to be in a downtrend (price below MA)
-                # For bearish counter attack, we want to be in an uptrend (price above MA)
-                if counter_attack_type == 'bullish':
-                    if current_candle['trend'] != 'downtrend':
-                        continue
-                elif counter_attack_type == 'bearish':
-                    if current_candle['trend'] != 'uptrend':
-                        continue
-                else:  # 'both'
-                    if not ((bullish_counter_attack and current_candle['trend'] == 'downtrend') or
-                           (bearish_counter_attack and current_candle['trend'] == 'uptrend')):
-                        continue
-            
-            # Set the pattern flag
-            df.iloc[i, df.columns.get_loc('is_counter_attack')] = counter_attack_condition
+        # Align each candle with the candle before it (first row has no predecessor)
+        previous_candle = df[['Open', 'High', 'Low', 'Close']].shift(1)
+        
+        # Calculate body sizes and ranges
+        current_range = df['High'] - df['Low']
+        previous_range = previous_candle['High'] - previous_candle['Low']
+        previous_body_size = (previous_candle['Close'] - previous_candle['Open']).abs()
+        
+        # Avoid division by zero and check if first candle has significant body
+        valid_candles = (
+            (current_range != 0) & (previous_range != 0) &
+            (previous_body_size / previous_range >= body_size_ratio)
+        )
+        
+        # Calculate close level tolerance
+        close_diff = (df['Close'] - previous_candle['Close']).abs()
+        close_tolerance_value = previous_candle['Close'] * close_tolerance
+        
+        # Bullish Counter Attack conditions:
+        # 1. First candle is bearish (red)
+        # 2. Second candle is bullish (green) 
+        # 3. Second candle opens with gap down (open₂ < close₁)
+        # 4. Second candle closes almost at same level as previous close
+        bullish_counter_attack = (
+            # First candle is bearish (red)
+            (previous_candle['Close'] < previous_candle['Open']) &
+            # Second candle is bullish (green)
+            (df['Close'] > df['Open']) &
+            # Second candle opens with gap down
+            (df['Open'] < previous_candle['Close']) &
+            # Second candle closes almost at same level as previous close
+            (close_diff <= close_tolerance_value)
+        )
+        
+        # Bearish Counter Attack conditions:
+        # 1. First candle is bullish (green)
+        # 2. Second candle is bearish (red)
+        # 3. Second candle opens with gap up (open₂ > close₁)
+        # 4. Second candle closes almost at same level as previous close
+        bearish_counter_attack = (
+            # First candle is bullish (green)
+            (previous_candle['Close'] > previous_candle['Open']) &
+            # Second candle is bearish (red)
+            (df['Close'] < df['Open']) &
+            # Second candle opens with gap up
+            (df['Open'] > previous_candle['Close']) &
+            # Second candle closes almost at same level as previous close
+            (close_diff <= close_tolerance_value)
+        )
+        
+        # Add trend context if required
+        if require_trend and 'trend' in df.columns:
+            # For bullish counter attack, we want to be in a downtrend (price below MA)
+            # For bearish counter attack, we want to be in an uptrend (price above MA)
+            bullish_counter_attack = bullish_counter_attack & (df['trend'] == 'downtrend')
+            bearish_counter_attack = bearish_counter_attack & (df['trend'] == 'uptrend')
+        
+        # Apply counter attack type filter
+        if counter_attack_type == 'bullish':
+            counter_attack_condition = bullish_counter_attack
+        elif counter_attack_type == 'bearish':
+            counter_attack_condition = bearish_counter_attack
+        else:  # 'both'
+            counter_attack_condition = bullish_counter_attack | bearish_counter_attack
+        
+        # Set the pattern flag
+        df['is_counter_attack'] = valid_candles & counter_attack_condition
         
         return df
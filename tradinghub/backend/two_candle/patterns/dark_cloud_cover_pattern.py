@@ -64,85 +64,69 @@ class DarkCloudCoverPattern(BasePattern):
         penetration_ratio = params.get('penetration_ratio', 0.5)
         require_trend = params.get('require_trend', True)
         
-        # Initialize pattern column
-        df['is_dark_cloud_cover'] = False
-        
-        # Check for Dark Cloud Cover patterns (need at least 2 candles)
-        for i in range(1, len(df)):
-            current_candle = df.iloc[i]
-            previous_candle = df.iloc[i-1]
-            
-            # First candle must be bullish (green)
-            if previous_candle['Close'] <= previous_candle['Open']:
-                continue
-            
-            # Second candle must be bearish (red)
-            if current_candle['Close'] >= current_candle['Open']:
-                continue
-            
-            # Calculate first candle properties
-            first_body_size = previous_candle['Close'] - previous_candle['Open']
-            first_total_range = previous_candle['High'] - previous_candle['Low']
-            
-            if first_total_range == 0:
-                continue
-            
-            first_body_ratio = first_body_size / first_total_range
-            first_upper_shadow = previous_candle['High'] - previous_candle['Close']
-            first_lower_shadow = previous_candle['Open'] - previous_candle['Low']
-            first_upper_shadow_ratio = first_upper_shadow / first_total_range
-            first_lower_shadow_ratio = first_lower_shadow / first_total_range
-            
-            # First candle should have substantial body and reasonable shadows
-            if (first_body_ratio < body_size_ratio or 
-                first_upper_shadow_ratio > max_shadow_ratio or 
-                first_lower_shadow_ratio > max_shadow_ratio):
-                continue
-            
-            # Calculate second candle properties
-            second_body_size = current_candle['Open'] - current_candle['Close']
-            second_total_range = current_candle['High'] - current_candle['Low']
-            
-            if second_total_range == 0:
-                continue
-            
-            second_body_ratio = second_body_size / second_total_range
-            second_upper_shadow = current_candle['High'] - current_candle['Open']
-            second_lower_shadow = current_candle['Close'] - current_candle['Low']
-            second_upper_shadow_ratio = second_upper_shadow / second_total_range
-            second_lower_shadow_ratio = second_lower_shadow / second_total_range
-            
-            # Second candle should have reasonable body and shadows
-            if (second_body_ratio < 0.3 or 
-                second_upper_shadow_ratio > max_shadow_ratio or 
-                second_lower_shadow_ratio > max_shadow_ratio):
-                continue
-            
-            # Gap up: Second candle opens above first candle's high
-            if current_candle['Open'] <= previous_candle['High']:
-                continue
-            
-            # Penetration check: Second candle must close below midpoint of first candle's body
-            first_body_midpoint = (previous_candle['Open'] + previous_candle['Close']) / 2
-            
-            if current_candle['Close'] >= first_body_midpoint:
-                continue
-            
-            # Calculate penetration depth
-            penetration_depth = (first_body_midpoint - current_candle['Close']) / first_body_size
-            
-            # Check if penetration meets minimum requirement
-            if penetration_depth < penetration_ratio:
-                continue
-            
-            # Add trend context if required
-            if require_trend and 'ma_20' in df.columns:
-                # For Dark Cloud Cover, we want to be in an uptrend (price above MA)
-                trend_condition = current_candle['Close'] > current_candle['ma_20']
-                if not trend_condition:
-                    continue
-            
-            # Set the pattern flag
-            df.iloc[i, df.columns.get_loc('is_dark_cloud_cover')] = True
+        # Align each candle with the candle before it (first row has no predecessor)
+        previous_candle = df[['Open', 'High', 'Low', 'Close']].shift(1)
+        
+        # First candle must be bullish (green), second candle must be bearish (red)
+        color_condition = (
+            (previous_candle['Close'] > previous_candle['Open']) &
+            (df['Close'] < df['Open'])
+        )
+        
+        # Calculate first candle properties
+        first_body_size = previous_candle['Close'] - previous_candle['Open']
+        first_total_range = previous_candle['High'] - previous_candle['Low']
+        first_upper_shadow = previous_candle['High'] - previous_candle['Close']
+        first_lower_shadow = previous_candle['Open'] - previous_candle['Low']
+        
+        # First candle should have substantial body and reasonable shadows
+        first_candle_condition = (
+            (first_total_range != 0) &
+            (first_body_size / first_total_range >= body_size_ratio) &
+            (first_upper_shadow / first_total_range <= max_shadow_ratio) &
+            (first_lower_shadow / first_total_range <= max_shadow_ratio)
+        )
+        
+        # Calculate second candle properties
+        second_body_size = df['Open'] - df['Close']
+        second_total_range = df['High'] - df['Low']
+        second_upper_shadow = df['High'] - df['Open']
+        second_lower_shadow = df['Close'] - df['Low']
+        
+        # Second candle should have reasonable body and shadows
+        second_candle_condition = (
+            (second_total_range != 0) &
+            (second_body_size / second_total_range >= 0.3) &
+            (second_upper_shadow / second_total_range <= max_shadow_ratio) &
+            (second_lower_shadow / second_total_range <= max_shadow_ratio)
+        )
+        
+        # Gap up: Second candle opens above first candle's high
+        gap_condition = df['Open'] > previous_candle['High']
+        
+        # Penetration check: Second candle must close below midpoint of first candle's body
+        # and the penetration depth must meet the minimum requirement
+        first_body_midpoint = (previous_candle['Open'] + previous_candle['Close']) / 2
+        penetration_depth = (first_body_midpoint - df['Close']) / first_body_size
+        penetration_condition = (
+            (df['Close'] < first_body_midpoint) &
+            (penetration_depth >= penetration_ratio)
+        )
+        
+        dark_cloud_cover_condition = (
+            color_condition &
+            first_candle_condition &
+            second_candle_condition &
+            gap_condition &
+            penetration_condition
+        )
+        
+        # Add trend context if required
+        if require_trend and 'ma_20' in df.columns:
+            # For Dark Cloud Cover, we want to be in an uptrend (price above MA)
+            dark_cloud_cover_condition = dark_cloud_cover_condition & (df['Close'] > df['ma_20'])
+        
+        # Set the pattern flag
+        df['is_dark_cloud_cover'] = dark_cloud_cover_condition
         
         return df
\ No newline at end of file
@@ -61,72 +61,59 @@ class EngulfingPattern(BasePattern):
         engulfing_type = params.get('engulfing_type', 'both')  # 'bullish', 'bearish', or 'both'
         require_trend = params.get('require_trend', True)
         
-        # Initialize pattern column
-        df['is_engulfing'] = False
+        # Align each candle with the candle before it (first row has no predecessor)
+        previous_candle = df[['Open', 'High', 'Low', 'Close']].shift(1)
         
-        # Check for engulfing patterns (need at least 2 candles)
-        for i in range(1, len(df)):
-            current_candle = df.iloc[i]
-            previous_candle = df.iloc[i-1]
-            
-            # Calculate body sizes
-            current_body_size = abs(current_candle['Close'] - current_candle['Open'])
-            previous_body_size = abs(previous_candle['Close'] - previous_candle['Open'])
-            
-            # Check if current candle has significant body
-            current_range = current_candle['High'] - current_candle['Low']
-            if current_range == 0:  # Avoid division by zero
-                continue
-                
-            current_body_ratio = current_body_size / current_range
-            if current_body_ratio < body_size_ratio:
-                continue
-            
-            # Check engulfing conditions
-            bullish_engulfing = (
-                # Previous candle is bearish (red)
-                (previous_candle['Close'] < previous_candle['Open']) &
-                # Current candle is bullish (green)
-                (current_candle['Close'] > current_candle['Open']) &
-                # Current candle's body completely engulfs previous candle's body
-                (current_candle['Open'] < previous_candle['Close']) &  # Current opens below previous close
-                (current_candle['Close'] > previous_candle['Open'])     # Current closes above previous open
-            )
-            
-            bearish_engulfing = (
-                # Previous candle is bullish (green)
-                (previous_candle['Close'] > previous_candle['Open']) &
-                # Current candle is bearish (red)
-                (current_candle['Close'] < current_candle['Open']) &
-                # Current candle's body completely engulfs previous candle's body
-                (current_candle['Open'] > previous_candle['Close']) &  # Current opens above previous close
-                (current_candle['Close'] < previous_candle['Open'])     # Current closes below previous open
-            )
-            
-            # Apply engulfing type filter
+        # Check if current candle has significant body
+        current_body_size = (df['Close'] - df['Open']).abs()
+        current_range = df['High'] - df['Low']
+        significant_body = (current_range != 0) & (current_body_size / current_range >= body_size_ratio)
+        
+        # Check engulfing conditions
+        bullish_engulfing = (
+            # Previous candle is bearish (red)
+            (previous_candle['Close'] < previous_candle['Open']) &
+            # Current candle is bullish (green)
+            (df['Close'] > df['Open']) &
+            # Current candle's body completely engulfs previous candle's body
+            (df['Open'] < previous_candle['Close']) &  # Current opens below previous close
+            (df['Close'] > previous_candle['Open'])     # Current closes above previous open
+        )
+        
+        bearish_engulfing = (
+            # Previous candle is bullish (green)
+            (previous_candle['Close'] > previous_candle['Open']) &
+            # Current candle is bearish (red)
+            (df['Close'] < df['Open']) &
+            # Current candle's body completely engulfs previous candle's body
+            (df['Open'] > previous_candle['Close']) &  # Current opens above previous close
+            (df['Close'] < previous_candle['Open'])     # Current closes below previous open
+        )
+        
+        # Apply engulfing type filter
+        if engulfing_type == 'bullish':
+            engulfing_condition = bullish_engulfing
+        elif engulfing_type == 'bearish':
+            engulfing_condition = bearish_engulfing
+        else:  # 'both'
+            engulfing_condition = bullish_engulfing | bearish_engulfing
+        
+        # Add trend context if required
+        if require_trend and 'ma_20' in df.columns:
+            # For bullish engulfing, we want to be in a downtrend (price below MA)
+            # For bearish engulfing, we want to be in an uptrend (price above MA)
             if engulfing_type == 'bullish':
-                engulfing_condition = bullish_engulfing
+                trend_condition = df['Close'] < df['ma_20']
             elif engulfing_type == 'bearish':
-                engulfing_condition = bearish_engulfing
+                trend_condition = df['Close'] > df['ma_20']
             else:  # 'both'
-                engulfing_condition = bullish_engulfing | bearish_engulfing
-            
-            # Add trend context if required
-            if require_trend and 'ma_20' in df.columns:
-                # For bullish engulfing, we want to be in a downtrend (price below MA)
-                # For bearish engulfing, we want to be in an uptrend (price above MA)
-                if engulfing_type == 'bullish':
-                    trend_condition = current_candle['Close'] < current_candle['ma_20']
-                elif engulfing_type == 'bearish':
-                    trend_condition = current_candle['Close'] > current_candle['ma_20']
-                else:  # 'both'
-                    trend_condition = (
-                        (bullish_engulfing & (current_candle['Close'] < current_candle['ma_20'])) |
-                        (bearish_engulfing & (current_candle['Close'] > current_candle['ma_20']))
-                    )
-                engulfing_condition = engulfing_condition & trend_condition
-            
-            # Set the pattern flag
-            df.iloc[i, df.columns.get_loc('is_engulfing')] = engulfing_condition
+                trend_condition = (
+                    (bullish_engulfing & (df['Close'] < df['ma_20'])) |
+                    (bearish_engulfing & (df['Close'] > df['ma_20']))
+                )
+            engulfing_condition = engulfing_condition & trend_condition
+        
+        # Set the pattern flag
+        df['is_engulfing'] = significant_body & engulfing_condition
         
         return df
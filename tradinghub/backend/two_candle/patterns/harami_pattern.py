@@ -55,77 +55,70 @@ class HaramiPattern:
         harami_type = params.get('harami_type', 'both')  # 'bullish', 'bearish', or 'both'
         require_trend = params.get('require_trend', True)
         
-        # Initialize pattern column
-        df['is_harami'] = False
+        # Align each candle with the candle before it (first row has no predecessor)
+        previous_candle = df[['Open', 'Close', 'body_size', 'total_range']].shift(1)
+        current_is_green = df['is_green'].astype(bool)
+        previous_is_green = current_is_green.shift(1, fill_value=False)
         
-        # Check for Harami patterns (need at least 2 candles)
-        for i in range(1, len(df)):
-            current_candle = df.iloc[i]
-            previous_candle = df.iloc[i-1]
-            
-            # Skip if any required data is missing
-            if pd.isna(current_candle['body_size']) or pd.isna(previous_candle['body_size']):
-                continue
-            
-            # Check if previous candle has significant body size
-            if previous_candle['body_size'] < body_size_ratio * previous_candle['total_range']:
-                continue
-            
-            # Check if current candle's body is completely contained within previous candle's body
-            if not self._is_body_contained(current_candle, previous_candle):
-                continue
-            
-            # Check color conditions based on harami type
-            if not self._check_color_conditions(current_candle, previous_candle, harami_type):
-                continue
-            
-            # Check trend condition if required
-            if require_trend and 'trend' in df.columns:
-                if pd.isna(current_candle['trend']):
-                    continue
-                # For bullish harami, we want downtrend before reversal
-                # For bearish harami, we want uptrend before reversal
-                if harami_type in ['bullish', 'both'] and current_candle['trend'] != 'downtrend':
-                    continue
-                if harami_type in ['bearish', 'both'] and current_candle['trend'] != 'uptrend':
-                    continue
-            
-            # Mark as Harami pattern (use .loc with the actual index)
-            df.loc[df.index[i], 'is_harami'] = True
-            
-            # Add pattern type classification
-            if current_candle['is_green'] and not previous_candle['is_green']:
-                df.loc[df.index[i], 'harami_type'] = 'bullish_harami'
-            elif not current_candle['is_green'] and previous_candle['is_green']:
-                df.loc[df.index[i], 'harami_type'] = 'bearish_harami'
-            else:
-                df.loc[df.index[i], 'harami_type'] = 'neutral_harami'
+        # Skip if any required data is missing
+        harami_condition = df['body_size'].notna() & previous_candle['body_size'].notna()
+        
+        # Check if previous candle has significant body size
+        harami_condition &= previous_candle['body_size'] >= body_size_ratio * previous_candle['total_range']
+        
+        # Check if current candle's body is completely contained within previous candle's body
+        harami_condition &= self._is_body_contained(df, previous_candle)
+        
+        # Check color conditions based on harami type
+        harami_condition &= self._check_color_conditions(current_is_green, previous_is_green, harami_type)
+        
+        # Check trend condition if required
+        if require_trend and 'trend' in df.columns:
+            harami_condition &= df['trend'].notna()
+            # For bullish harami, we want downtrend before reversal
+            # For bearish harami, we want uptrend before reversal
+            if harami_type in ['bullish', 'both']:
+                harami_condition &= df['trend'] == 'downtrend'
+            if harami_type in ['bearish', 'both']:
+                harami_condition &= df['trend'] == 'uptrend'
+        
+        # Mark as Harami pattern
+        df['is_harami'] = harami_condition
+        
+        # Add pattern type classification
+        if harami_condition.any():
+            harami_labels = np.select(
+                [current_is_green & ~previous_is_green, ~current_is_green & previous_is_green],
+                ['bullish_harami', 'bearish_harami'],
+                default='neutral_harami'
+            )
+            df.loc[harami_condition, 'harami_type'] = harami_labels[harami_condition.to_numpy()]
         
         return df
     
-    def _is_body_contained(self, current_candle: pd.Series, previous_candle: pd.Series) -> bool:
-        """Check if current candle's body is completely contained within previous candle's body"""
+    def _is_body_contained(self, current_candle: pd.DataFrame, previous_candle: pd.DataFrame) -> pd.Series:
+        """Check if each candle's body is completely contained within the previous candle's body"""
         
         # Get body ranges
-        current_body_top = max(current_candle['Open'], current_candle['Close'])
-        current_body_bottom = min(current_candle['Open'], current_candle['Close'])
-        previous_body_top = max(previous_candle['Open'], previous_candle['Close'])
-        previous_body_bottom = min(previous_candle['Open'], previous_candle['Close'])
+        current_body_top = current_candle[['Open', 'Close']].max(axis=1)
+        current_body_bottom = current_candle[['Open', 'Close']].min(axis=1)
+        previous_body_top = previous_candle[['Open', 'Close']].max(axis=1)
+        previous_body_bottom = previous_candle[['Open', 'Close']].min(axis=1)
         
         # Check if current body is completely within previous body
-        return (current_body_top <= previous_body_top and 
-                current_body_bottom >= previous_body_bottom)
+        return ((current_body_top <= previous_body_top) & 
+                (current_body_bottom >= previous_body_bottom))
     
-    def _check_color_conditions(self, current_candle: pd.Series, previous_candle: pd.Series, harami_type: str) -> bool:
+    def _check_color_conditions(self, current_is_green: pd.Series, previous_is_green: pd.Series, harami_type: str) -> pd.Series:
         """Check if color conditions are met for the specified harami type"""
         
         if harami_type == 'bullish':
             # Bullish harami: first candle red, second candle green
-            return not previous_candle['is_green'] and current_candle['is_green']
+            return ~previous_is_green & current_is_green
         elif harami_type == 'bearish':
             # Bearish harami: first candle green, second candle red
-            return previous_candle['is_green'] and not current_candle['is_green']
+            return previous_is_green & ~current_is_green
         else:  # 'both'
             # Either bullish or bearish harami
-            return (not previous_candle['is_green'] and current_candle['is_green']) or \
-                   (previous_candle['is_green'] and not current_candle['is_green'])
+            return (~previous_is_green & current_is_green) | \
+                   (previous_is_green & ~current_is_green)
@@ -64,84 +64,59 @@ class KickerPattern(BasePattern):
         require_trend = params.get('require_trend', True)
         kicker_type = params.get('kicker_type', 'both')  # 'bullish', 'bearish', or 'both'
         
-        # Initialize pattern column
-        df['is_kicker'] = False
-        
-        # Check for Kicker patterns (need at least 2 candles)
-        for i in range(1, len(df)):
-            current_candle = df.iloc[i]
-            previous_candle = df.iloc[i-1]
-            
-            # Calculate body sizes for both candles
-            first_body_size = abs(previous_candle['Close'] - previous_candle['Open'])
-            second_body_size = abs(current_candle['Close'] - current_candle['Open'])
-            
-            # Calculate total ranges
-            first_range = previous_candle['High'] - previous_candle['Low']
-            second_range = current_candle['High'] - current_candle['Low']
-            
-            if first_range == 0 or second_range == 0:  # Avoid division by zero
-                continue
-            
-            # Check body size ratios
-            first_body_ratio = first_body_size / first_range
-            second_body_ratio = second_body_size / second_range
-            
-            if first_body_ratio < body_size_ratio or second_body_ratio < body_size_ratio:
-                continue
-            
-            # Check for gap and no overlap
-            gap_size = 0
-            is_bullish_kicker = False
-            is_bearish_kicker = False
-            
-            # Check for Bullish Kicker (gap up)
-            if (current_candle['Open'] > previous_candle['Open'] and 
-                current_candle['Open'] > previous_candle['Close'] and
-                current_candle['Close'] > current_candle['Open']):
-                
-                # Calculate gap size
-                gap_size = current_candle['Open'] - previous_candle['Close']
-                gap_percentage = (gap_size / previous_candle['Close']) * 100
-                
-                if gap_percentage >= gap_size_ratio:
-                    is_bullish_kicker = True
-            
-            # Check for Bearish Kicker (gap down)
-            elif (current_candle['Open'] < previous_candle['Open'] and 
-                  current_candle['Open'] < previous_candle['Close'] and
-                  current_candle['Close'] < current_candle['Open']):
-                
-                # Calculate gap size
-                gap_size = previous_candle['Close'] - current_candle['Open']
-                gap_percentage = (gap_size / previous_candle['Close']) * 100
-                
-                if gap_percentage >= gap_size_ratio:
-                    is_bearish_kicker = True
-            
-            # Check if pattern matches the requested type
-            if kicker_type == 'bullish' and not is_bullish_kicker:
-                continue
-            elif kicker_type == 'bearish' and not is_bearish_kicker:
-                continue
-            elif kicker_type == 'both' and not (is_bullish_kicker or is_bearish_kicker):
-                continue
-            
-            # Add trend context if required
-            if require_trend and 'ma_20' in df.columns:
-                if is_bullish_kicker:
-                    # For bullish kicker, we want to be in a downtrend (price below MA)
-                    trend_condition = previous_candle['Close'] < previous_candle['ma_20']
-                elif is_bearish_kicker:
-                    # For bearish kicker, we want to be in an uptrend (price above MA)
-                    trend_condition = previous_candle['Close'] > previous_candle['ma_20']
-                else:
-                    continue
-                
-                if not trend_condition:
-                    continue
-            
-            # Set the pattern flag
-            df.iloc[i, df.columns.get_loc('is_kicker')] = True
+        # Align each candle with the candle before it (first row has no predecessor)
+        previous_candle = df[['Open', 'High', 'Low', 'Close']].shift(1)
+        
+        # Calculate body sizes for both candles
+        first_body_size = (previous_candle['Close'] - previous_candle['Open']).abs()
+        second_body_size = (df['Close'] - df['Open']).abs()
+        
+        # Calculate total ranges
+        first_range = previous_candle['High'] - previous_candle['Low']
+        second_range = df['High'] - df['Low']
+        
+        # Avoid division by zero and check body size ratios
+        body_condition = (
+            (first_range != 0) & (second_range != 0) &
+            (first_body_size / first_range >= body_size_ratio) &
+            (second_body_size / second_range >= body_size_ratio)
+        )
+        
+        # Check for Bullish Kicker (gap up)
+        bullish_gap_percentage = ((df['Open'] - previous_candle['Close']) / previous_candle['Close']) * 100
+        is_bullish_kicker = (
+            (df['Open'] > previous_candle['Open']) &
+            (df['Open'] > previous_candle['Close']) &
+            (df['Close'] > df['Open']) &
+            (bullish_gap_percentage >= gap_size_ratio)
+        )
+        
+        # Check for Bearish Kicker (gap down)
+        bearish_gap_percentage = ((previous_candle['Close'] - df['Open']) / previous_candle['Close']) * 100
+        is_bearish_kicker = (
+            (df['Open'] < previous_candle['Open']) &
+            (df['Open'] < previous_candle['Close']) &
+            (df['Close'] < df['Open']) &
+            (bearish_gap_percentage >= gap_size_ratio)
+        )
+        
+        # Add trend context if required
+        if require_trend and 'ma_20' in df.columns:
+            previous_ma = df['ma_20'].shift(1)
+            # For bullish kicker, we want to be in a downtrend (price below MA)
+            is_bullish_kicker = is_bullish_kicker & (previous_candle['Close'] < previous_ma)
+            # For bearish kicker, we want to be in an uptrend (price above MA)
+            is_bearish_kicker = is_bearish_kicker & (previous_candle['Close'] > previous_ma)
+        
+        # Check if pattern matches the requested type
+        if kicker_type == 'bullish':
+            kicker_condition = is_bullish_kicker
+        elif kicker_type == 'bearish':
+            kicker_condition = is_bearish_kicker
+        else:  # 'both'
+            kicker_condition = is_bullish_kicker | is_bearish_kicker
+        
+        # Set the pattern flag
+        df['is_kicker'] = body_condition & kicker_condition
         
         return df
@@ -62,60 +62,49 @@ class PiercingLinePattern(BasePattern):
         piercing_ratio = params.get('piercing_ratio', 0.5)
         require_trend = params.get('require_trend', True)
         
-        # Initialize pattern column
-        df['is_piercing_line'] = False
-        
-        # Check for piercing line patterns (need at least 2 candles)
-        for i in range(1, len(df)):
-            current_candle = df.iloc[i]
-            previous_candle = df.iloc[i-1]
-            
-            # Calculate body sizes
-            current_body_size = abs(current_candle['Close'] - current_candle['Open'])
-            previous_body_size = abs(previous_candle['Close'] - previous_candle['Open'])
-            
-            # Check if both candles have significant bodies
-            current_range = current_candle['High'] - current_candle['Low']
-            previous_range = previous_candle['High'] - previous_candle['Low']
-            
-            if current_range == 0 or previous_range == 0:  # Avoid division by zero
-                continue
-                
-            current_body_ratio = current_body_size / current_range
-            previous_body_ratio = previous_body_size / previous_range
-            
-            if current_body_ratio < body_size_ratio or previous_body_ratio < body_size_ratio:
-                continue
-            
-            # Check piercing line conditions (bullish only)
-            piercing_line_condition = (
-                # First candle is bearish (red)
-                (previous_candle['Close'] < previous_candle['Open']) &
-                # Second candle is bullish (green)
-                (current_candle['Close'] > current_candle['Open']) &
-                # Second candle opens below the first candle's low
-                (current_candle['Open'] < previous_candle['Low']) &
-                # Second candle closes above the midpoint of the first candle's body
-                (current_candle['Close'] > (previous_candle['Open'] + previous_candle['Close']) / 2)
-            )
-            
-            # Check piercing ratio (how much of the first candle's body is pierced)
-            if piercing_line_condition:
-                first_candle_body_midpoint = (previous_candle['Open'] + previous_candle['Close']) / 2
-                piercing_amount = current_candle['Close'] - first_candle_body_midpoint
-                first_candle_body_size = previous_candle['Open'] - previous_candle['Close']  # Bearish body size
-                
-                if first_candle_body_size > 0:  # Avoid division by zero
-                    actual_piercing_ratio = piercing_amount / first_candle_body_size
-                    piercing_line_condition = piercing_line_condition & (actual_piercing_ratio >= piercing_ratio)
-            
-            # Add trend context if required
-            if require_trend and 'ma_20' in df.columns:
-                # For piercing line, we want to be in a downtrend (price below MA)
-                trend_condition = current_candle['Close'] < current_candle['ma_20']
-                piercing_line_condition = piercing_line_condition & trend_condition
-            
-            # Set the pattern flag
-            df.iloc[i, df.columns.get_loc('is_piercing_line')] = piercing_line_condition
+        # Align each candle with the candle before it (first row has no predecessor)
+        previous_candle = df[['Open', 'High', 'Low', 'Close']].shift(1)
+        
+        # Calculate body sizes
+        current_body_size = (df['Close'] - df['Open']).abs()
+        previous_body_size = (previous_candle['Close'] - previous_candle['Open']).abs()
+        
+        # Check if both candles have significant bodies
+        current_range = df['High'] - df['Low']
+        previous_range = previous_candle['High'] - previous_candle['Low']
+        
+        body_condition = (
+            (current_range != 0) & (previous_range != 0) &
+            (current_body_size / current_range >= body_size_ratio) &
+            (previous_body_size / previous_range >= body_size_ratio)
+        )
+        
+        # Check piercing line conditions (bullish only)
+        first_candle_body_midpoint = (previous_candle['Open'] + previous_candle['Close']) / 2
+        piercing_line_condition = (
+            # First candle is bearish (red)
+            (previous_candle['Close'] < previous_candle['Open']) &
+            # Second candle is bullish (green)
+            (df['Close'] > df['Open']) &
+            # Second candle opens below the first candle's low
+            (df['Open'] < previous_candle['Low']) &
+            # Second candle closes above the midpoint of the first candle's body
+            (df['Close'] > first_candle_body_midpoint)
+        )
+        
+        # Check piercing ratio (how much of the first candle's body is pierced)
+        piercing_amount = df['Close'] - first_candle_body_midpoint
+        first_candle_body_size = previous_candle['Open'] - previous_candle['Close']  # Bearish body size
+        actual_piercing_ratio = piercing_amount / first_candle_body_size
+        piercing_line_condition = piercing_line_condition & (actual_piercing_ratio >= piercing_ratio)
+        
+        # Add trend context if required
+        if require_trend and 'ma_20' in df.columns:
+            # For piercing line, we want to be in a downtrend (price below MA)
+            trend_condition = df['Close'] < df['ma_20']
+            piercing_line_condition = piercing_line_condition & trend_condition
+        
+        # Set the pattern flag
+        df['is_piercing_line'] = body_condition & piercing_line_condition
         
         return df
@@ -63,59 +63,46 @@ class TweezerBottomPattern(BasePattern):
         low_tolerance = params.get('low_tolerance', 0.2)  # 0.2% tolerance by default
         require_trend = params.get('require_trend', True)
         
-        # Initialize pattern column
-        df['is_tweezer_bottom'] = False
-        
-        # Check for Tweezer Bottom patterns (need at least 2 candles)
-        for i in range(1, len(df)):
-            current_candle = df.iloc[i]
-            previous_candle = df.iloc[i-1]
-            
-            # First candle must be bearish (red)
-            if previous_candle['Close'] >= previous_candle['Open']:
-                continue
-            
-            # Second candle must be bullish (green)
-            if current_candle['Close'] <= current_candle['Open']:
-                continue
-            
-            # Calculate body sizes for both candles
-            first_body_size = abs(previous_candle['Open'] - previous_candle['Close'])
-            second_body_size = abs(current_candle['Close'] - current_candle['Open'])
-            
-            # Calculate total ranges
-            first_range = previous_candle['High'] - previous_candle['Low']
-            second_range = current_candle['High'] - current_candle['Low']
-            
-            if first_range == 0 or second_range == 0:  # Avoid division by zero
-                continue
-            
-            # Check body size ratios
-            first_body_ratio = first_body_size / first_range
-            second_body_ratio = second_body_size / second_range
-            
-            if first_body_ratio < body_size_ratio or second_body_ratio < body_size_ratio:
-                continue
-            
-            # Check if lows are nearly identical (within tolerance)
-            low_difference = abs(previous_candle['Low'] - current_candle['Low'])
-            average_low = (previous_candle['Low'] + current_candle['Low']) / 2
-            low_tolerance_pct = low_tolerance / 100  # Convert percentage to decimal
-            
-            # Calculate tolerance in price terms
-            price_tolerance = average_low * low_tolerance_pct
-            
-            if low_difference > price_tolerance:
-                continue
-            
-            # Add trend context if required
-            if require_trend and 'ma_20' in df.columns:
-                # For Tweezer Bottom, we want to be in a downtrend (price below MA)
-                trend_condition = current_candle['Close'] < current_candle['ma_20']
-                if not trend_condition:
-                    continue
-            
-            # Set the pattern flag
-            df.iloc[i, df.columns.get_loc('is_tweezer_bottom')] = True
+        # Align each candle with the candle before it (first row has no predecessor)
+        previous_candle = df[['Open', 'High', 'Low', 'Close']].shift(1)
+        
+        # First candle must be bearish (red), second candle must be bullish (green)
+        color_condition = (
+            (previous_candle['Close'] < previous_candle['Open']) &
+            (df['Close'] > df['Open'])
+        )
+        
+        # Calculate body sizes for both candles
+        first_body_size = (previous_candle['Open'] - previous_candle['Close']).abs()
+        second_body_size = (df['Close'] - df['Open']).abs()
+        
+        # Calculate total ranges
+        first_range = previous_candle['High'] - previous_candle['Low']
+        second_range = df['High'] - df['Low']
+        
+        # Avoid division by zero and check body size ratios
+        body_condition = (
+            (first_range != 0) & (second_range != 0) &
+            (first_body_size / first_range >= body_size_ratio) &
+            (second_body_size / second_range >= body_size_ratio)
+        )
+        
+        # Check if lows are nearly identical (within tolerance)
+        low_difference = (previous_candle['Low'] - df['Low']).abs()
+        average_low = (previous_candle['Low'] + df['Low']) / 2
+        low_tolerance_pct = low_tolerance / 100  # Convert percentage to decimal
+        
+        # Calculate tolerance in price terms
+        price_tolerance = average_low * low_tolerance_pct
+        
+        tweezer_condition = color_condition & body_condition & (low_difference <= price_tolerance)
+        
+        # Add trend context if required
+        if require_trend and 'ma_20' in df.columns:
+            # For Tweezer Bottom, we want to be in a downtrend (price below MA)
+            tweezer_condition = tweezer_condition & (df['Close'] < df['ma_20'])
+        
+        # Set the pattern flag
+        df['is_tweezer_bottom'] = tweezer_condition
         
         return df
@@ -63,59 +63,46 @@ class TweezerTopPattern(BasePattern):
         high_tolerance = params.get('high_tolerance', 0.2)  # 0.2% tolerance by default
         require_trend = params.get('require_trend', True)
         
-        # Initialize pattern column
-        df['is_tweezer_top'] = False
-        
-        # Check for Tweezer Top patterns (need at least 2 candles)
-        for i in range(1, len(df)):
-            current_candle = df.iloc[i]
-            previous_candle = df.iloc[i-1]
-            
-            # First candle must be bullish (green)
-            if previous_candle['Close'] <= previous_candle['Open']:
-                continue
-            
-            # Second candle must be bearish (red)
-            if current_candle['Close'] >= current_candle['Open']:
-                continue
-            
-            # Calculate body sizes for both candles
-            first_body_size = abs(previous_candle['Close'] - previous_candle['Open'])
-            second_body_size = abs(current_candle['Open'] - current_candle['Close'])
-            
-            # Calculate total ranges
-            first_range = previous_candle['High'] - previous_candle['Low']
-            second_range = current_candle['High'] - current_candle['Low']
-            
-            if first_range == 0 or second_range == 0:  # Avoid division by zero
-                continue
-            
-            # Check body size ratios
-            first_body_ratio = first_body_size / first_range
-            second_body_ratio = second_body_size / second_range
-            
-            if first_body_ratio < body_size_ratio or second_body_ratio < body_size_ratio:
-                continue
-            
-            # Check if highs are nearly identical (within tolerance)
-            high_difference = abs(previous_candle['High'] - current_candle['High'])
-            average_high = (previous_candle['High'] + current_candle['High']) / 2
-            high_tolerance_pct = high_tolerance / 100  # Convert percentage to decimal
-            
-            # Calculate tolerance in price terms
-            price_tolerance = average_high * high_tolerance_pct
-            
-            if high_difference > price_tolerance:
-                continue
-            
-            # Add trend context if required
-            if require_trend and 'ma_20' in df.columns:
-                # For Tweezer Top, we want to be in an uptrend (price above MA)
-                trend_condition = current_candle['Close'] > current_candle['ma_20']
-                if not trend_condition:
-                    continue
-            
-            # Set the pattern flag
-            df.iloc[i, df.columns.get_loc('is_tweezer_top')] = True
+        # Align each candle with the candle before it (first row has no predecessor)
+        previous_candle = df[['Open', 'High', 'Low', 'Close']].shift(1)
+        
+        # First candle must be bullish (green), second candle must be bearish (red)
+        color_condition = (
+            (previous_candle['Close'] > previous_candle['Open']) &
+            (df['Close'] < df['Open'])
+        )
+        
+        # Calculate body sizes for both candles
+        first_body_size = (previous_candle['Close'] - previous_candle['Open']).abs()
+        second_body_size = (df['Open'] - df['Close']).abs()
+        
+        # Calculate total ranges
+        first_range = previous_candle['High'] - previous_candle['Low']
+        second_range = df['High'] - df['Low']
+        
+        # Avoid division by zero and check body size ratios
+        body_condition = (
+            (first_range != 0) & (second_range != 0) &
+            (first_body_size / first_range >= body_size_ratio) &
+            (second_body_size / second_range >= body_size_ratio)
+        )
+        
+        # Check if highs are nearly identical (within tolerance)
+        high_difference = (previous_candle['High'] - df['High']).abs()
+        average_high = (previous_candle['High'] + df['High']) / 2
+        high_tolerance_pct = high_tolerance / 100  # Convert percentage to decimal
+        
+        # Calculate tolerance in price terms
+        price_tolerance = average_high * high_tolerance_pct
+        
+        tweezer_condition = color_condition & body_condition & (high_difference <= price_tolerance)
+        
+        # Add trend context if required
+        if require_trend and 'ma_20' in df.columns:
+            # For Tweezer Top, we want to be in an uptrend (price above MA)
+            tweezer_condition = tweezer_condition & (df['Close'] > df['ma_20'])
+        
+        # Set the pattern flag
+        df['is_tweezer_top'] = tweezer_condition
         
         return df
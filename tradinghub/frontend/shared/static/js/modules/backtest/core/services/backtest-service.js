@@ -4,6 +4,7 @@
  */
 
 import { API_ENDPOINTS, API_BASE_URL, HTTP_CONFIG } from '../../config/index.js';
+import { COLUMNAR_QUERY, decodeColumnar } from '/shared/js/modules/shared/columnar.js';
 
 /**
  * Send backtest request to the server (Returns Promise)
@@ -13,7 +14,8 @@ export async function sendBacktestRequest(formData, positionType = 'long') {
         ? API_ENDPOINTS.BACKTEST_SHORT 
         : API_ENDPOINTS.BACKTEST_LONG;
     
-    const url = API_BASE_URL + endpoint;
+    // Columnar responses keep large stock_data payloads compact; decoded back to rows below
+    const url = API_BASE_URL + endpoint + COLUMNAR_QUERY;
     
     console.log(`📋 ${positionType.toUpperCase()} Backtest form data:`, formData);
     
@@ -23,7 +25,7 @@ export async function sendBacktestRequest(formData, positionType = 'long') {
         body: JSON.stringify(formData)
     });
     
-    const data = await response.json();
+    const data = decodeColumnar(await response.json());
     
     if (data.error) {
         throw new Error(data.error);
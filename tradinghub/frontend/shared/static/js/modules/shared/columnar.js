@@ -0,0 +1,78 @@
+/**
+ * Columnar Response Decoder
+ * Turns columnar (parallel array) API responses back into the row objects the UI uses
+ */
+
+/**
+ * Query string that asks /analyze and /backtest for columnar responses
+ */
+export const COLUMNAR_QUERY = '?format=columnar';
+
+/**
+ * Check whether a value is a columnar table ({length, columns, time_columns})
+ * @param {*} value - Value to check
+ * @returns {boolean}
+ */
+function isColumnarTable(value) {
+    return value !== null
+        && typeof value === 'object'
+        && !Array.isArray(value)
+        && typeof value.length === 'number'
+        && value.columns !== null
+        && typeof value.columns === 'object';
+}
+
+/**
+ * Format wall-clock epoch seconds as a date string like the row format sends
+ * @param {number} seconds - Local time of the bar, read as UTC
+ * @param {string} pattern - Target layout, e.g. 'YYYY-MM-DD HH:MM:SS'
+ * @returns {string}
+ */
+function formatWallClock(seconds, pattern) {
+    // toISOString() is 'YYYY-MM-DDTHH:MM:SS.sssZ'; keep the prefix the pattern asks for
+    return new Date(seconds * 1000).toISOString().replace('T', ' ').slice(0, pattern.length);
+}
+
+/**
+ * Convert one columnar table into an array of row objects
+ * @param {Object} table - Columnar table
+ * @returns {Array<Object>}
+ */
+export function tableToRows(table) {
+    const names = Object.keys(table.columns);
+    const timeColumns = table.time_columns || {};
+    const columns = names.map(name => {
+        const values = table.columns[name];
+        const pattern = timeColumns[name];
+        return pattern ? values.map(value => formatWallClock(value, pattern)) : values;
+    });
+
+    const rows = new Array(table.length);
+    for (let i = 0; i < table.length; i++) {
+        const row = {};
+        for (let j = 0; j < names.length; j++) {
+            row[names[j]] = columns[j][i];
+        }
+        rows[i] = row;
+    }
+    return rows;
+}
+
+/**
+ * Decode a response that may be columnar; row-format responses are returned unchanged
+ * @param {Object} data - Parsed JSON response
+ * @returns {Object} Response with every columnar table replaced by rows
+ */
+export function decodeColumnar(data) {
+    if (!data || data.format !== 'columnar') {
+        return data;
+    }
+    const decoded = { ...data };
+    Object.keys(decoded).forEach(key => {
+        if (isColumnarTable(decoded[key])) {
+            decoded[key] = tableToRows(decoded[key]);
+        }
+    });
+    delete decoded.format;
+    return decoded;
+}
@@ -2,6 +2,8 @@
  * Universal FormHandler - Works for ANY pattern (hammer, doji, shooting star, etc.)
  * Handles form submission and API interactions
  */
+import { COLUMNAR_QUERY, decodeColumnar } from './columnar.js';
+
 export class FormHandler {
     /**
      * @param {PatternDataManager} patternDataManager - Instance of PatternDataManager
@@ -213,7 +215,7 @@ export class FormHandler {
     async sendAnalysisRequest(formData) {
         console.log('Sending analysis request to /analyze');
         
-        const response = await fetch('/analyze', {
+        const response = await fetch('/analyze' + COLUMNAR_QUERY, {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json'
@@ -231,7 +233,7 @@ export class FormHandler {
             throw new Error(`HTTP ${response.status} - ${response.statusText}`);
         }
 
-        const data = await response.json();
+        const data = decodeColumnar(await response.json());
         console.log('Response data:', data);
 
         if (data.error) {
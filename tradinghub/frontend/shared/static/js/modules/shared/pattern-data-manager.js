@@ -57,9 +57,11 @@ export class PatternDataManager {
         // Get the pattern column name based on the pattern type
         const patternColumn = this.getPatternColumnName();
         
-        // Define CSV headers
+        // Define CSV headers (date column labelled with the server's display timezone)
+        const resultsTable = document.querySelector('.results-table');
+        const timezoneLabel = (resultsTable && resultsTable.dataset.timezoneLabel) || 'Israel';
         const headers = [
-            'Date & Time (Israel)',
+            `Date & Time (${timezoneLabel})`,
             'Trend',
             'Open',
             'High',